@@ -0,0 +1,130 @@
+import random
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from compilador import afd_de, compilar
+
+def _requerir_numpy():
+    if np is None:
+        raise ImportError("afd_denso necesita NumPy: pip install numpy")
+
+class AFDDenso:
+    """
+    Exporta un AFD a una tabla densa int32 indexada por [estado, clase de símbolo]
+    y un vector de aceptación. La clase k es el k-ésimo símbolo del alfabeto del
+    AFD (un caracter o una clase de su partición) y la última clase agrupa a
+    todos los demás caracteres. El estado n es el estado muerto explícito.
+    """
+    def __init__(self, afd):
+        _requerir_numpy()
+        afd = afd_de(afd)
+        self.simbolos = list(afd.alfabeto)
+        self.clase_otro = len(self.simbolos)
+        self.muerto = afd.num_estados
+        self.estado_inicial = afd.estado_inicial
+        
+        clase = {simbolo: k for k, simbolo in enumerate(self.simbolos)}
+        # Intervalos de caracteres ordenados y la clase de cada uno (para searchsorted)
+        intervalos = afd.intervalos()
+        self.inicios = np.array([ord(desde) for desde, _, _ in intervalos], dtype=np.uint32)
+        self.fines = np.array([ord(hasta) for _, hasta, _ in intervalos], dtype=np.uint32)
+        self.clase_intervalo = np.array([clase[simbolo] for _, _, simbolo in intervalos], dtype=np.int32)
+        self.tabla = np.full((afd.num_estados + 1, len(self.simbolos) + 1), self.muerto, dtype=np.int32)
+        for estado, por_simbolo in enumerate(afd.transiciones):
+            for simbolo, destino in por_simbolo.items():
+                self.tabla[estado, clase[simbolo]] = destino
+        self.aceptacion = np.zeros(afd.num_estados + 1, dtype=bool)
+        self.aceptacion[list(afd.estados_finales)] = True
+        
+        self.tabla_latin1 = np.full(256, self.clase_otro, dtype=np.int32)
+        for desde, hasta, simbolo in intervalos:
+            if ord(desde) < 256:
+                self.tabla_latin1[ord(desde):min(ord(hasta), 255) + 1] = clase[simbolo]
+        # Vista plana para el gather: tabla_plana[estado * clases + clase]
+        self.tabla_plana = self.tabla.ravel()
+        self.num_clases = self.tabla.shape[1]
+    
+    def clases(self, texto):
+        """Convierte un texto en el arreglo de clases de símbolo de cada caracter"""
+        try:
+            # Camino rápido: texto latin-1, un byte por caracter y tabla de 256 entradas
+            return self.tabla_latin1[np.frombuffer(texto.encode('latin-1'), dtype=np.uint8)]
+        except UnicodeEncodeError:
+            pass
+        puntos = np.frombuffer(texto.encode('utf-32-le'), dtype=np.uint32)
+        if not len(self.inicios):
+            return np.full(len(puntos), self.clase_otro, dtype=np.int32)
+        indices = np.searchsorted(self.inicios, puntos, side='right') - 1
+        acotados = np.maximum(indices, 0)
+        dentro = (indices >= 0) & (puntos <= self.fines[acotados])
+        return np.where(dentro, self.clase_intervalo[acotados], self.clase_otro).astype(np.int32)
+    
+    def acepta(self, cadena):
+        estado = self.estado_inicial
+        for clase in self.clases(cadena):
+            estado = self.tabla[estado, clase]
+        return bool(self.aceptacion[estado])
+    
+    def clasificar_lote(self, cadenas):
+        """
+        Avanza todas las cadenas a la vez: en el paso t se hace un gather vectorizado
+        tabla[estados, clases] para las cadenas de longitud > t. Las cadenas se
+        ordenan por longitud descendente para que las activas sean un prefijo.
+        Devuelve un arreglo booleano en el orden de entrada.
+        """
+        cantidad = len(cadenas)
+        if cantidad == 0:
+            return np.zeros(0, dtype=bool)
+        longitudes = np.fromiter(map(len, cadenas), dtype=np.int64, count=cantidad)
+        clases = self.clases("".join(cadenas))
+        inicios = np.zeros(cantidad, dtype=np.int64)
+        np.cumsum(longitudes[:-1], out=inicios[1:])
+        
+        orden = np.argsort(-longitudes, kind='stable')
+        longitudes = longitudes[orden]
+        inicios = inicios[orden]
+        negativas = -longitudes
+        
+        estados = np.full(cantidad, self.estado_inicial, dtype=np.int32)
+        for paso in range(int(longitudes[0])):
+            activas = int(np.searchsorted(negativas, -paso, side='left'))
+            actuales = estados[:activas]
+            estados[:activas] = self.tabla_plana[actuales * self.num_clases + clases[inicios[:activas] + paso]]
+        
+        resultado = np.empty(cantidad, dtype=bool)
+        resultado[orden] = self.aceptacion[estados]
+        return resultado
+
+def main(cantidad=1000000):
+    patron = "[ae03]+@[ae03]+.(com|net|org)(.(gt|cr|co))?"
+    print(f"=== Clasificación por lotes con la expresión h: {patron} ===")
+    compilado = compilar(patron)
+    denso = AFDDenso(compilado)
+    print(f"Tabla densa: {denso.tabla.shape[0]} estados x {denso.tabla.shape[1]} clases (int32)")
+    
+    generador = random.Random(0)
+    cadenas = []
+    for i in range(cantidad):
+        usuario = "".join(generador.choices("ae03", k=generador.randint(1, 10)))
+        dominio = "".join(generador.choices("ae03", k=generador.randint(1, 6)))
+        cadenas.append(f"{usuario}@{dominio}.{'org' if i % 7 else 'gov'}{generador.choice(['', '.cr'])}")
+    
+    inicio = time.perf_counter()
+    resultado = denso.clasificar_lote(cadenas)
+    vectorizado = time.perf_counter() - inicio
+    print(f"Lote de {cantidad} cadenas: {int(resultado.sum())} válidas en {vectorizado:.2f} s")
+    
+    muestra = cadenas[:100000]
+    inicio = time.perf_counter()
+    esperado = [compilado.acepta(cadena) for cadena in muestra]
+    por_cadena = (time.perf_counter() - inicio) * cantidad / len(muestra)
+    if esperado != resultado[:len(muestra)].tolist():
+        raise AssertionError("El lote no coincide con el AFD")
+    print(f"Ciclo Python cadena por cadena (estimado): {por_cadena:.2f} s")
+
+if __name__ == "__main__":
+    main()
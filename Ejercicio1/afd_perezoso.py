@@ -0,0 +1,148 @@
+import random
+from collections import OrderedDict
+
+from main import ConstructorThompson, ConversorAFD, _bits
+
+class AFDPerezoso:
+    """
+    AFD construido bajo demanda a partir del AFN de Thompson. Cada estado del AFD
+    (una máscara de bits de estados del AFN) se crea solo cuando la entrada llega
+    a él y se guarda en una caché LRU de tamaño acotado. Si la caché se desaloja
+    demasiado durante una cadena, se sigue con simulación directa del AFN.
+    """
+    def __init__(self, afn, max_estados=1024, ventana=256, umbral_desalojos=0.5):
+        conversor = ConversorAFD(afn)
+        nodos, inicial, saltos, con_simbolo, finales = conversor._tablas_bitsets()
+        # Con transiciones por rango, las tablas van por clase de caracteres
+        self.particion = conversor.particion
+        self.nodos = nodos
+        self.inicial = inicial
+        self.saltos = saltos
+        self.con_simbolo = con_simbolo
+        self.finales = finales
+        self.max_estados = max_estados
+        self.ventana = ventana
+        self.umbral_desalojos = umbral_desalojos
+        
+        # mascara -> {símbolo: mascara destino}; las filas van por símbolo de
+        # las tablas (clase o caracter del alfabeto), no por caracter leído,
+        # así que cada una tiene a lo sumo tantas entradas como símbolos
+        self.cache = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self.respaldos_afn = 0
+        # Pasos y desalojos de la ventana actual (se acumulan entre cadenas)
+        self._pasos_ventana = 0
+        self._desalojos_marca = 0
+    
+    def _simbolo(self, c):
+        """Símbolo de las tablas para el caracter c (su clase si hay partición), o -1 si no tiene transiciones"""
+        if self.particion is not None:
+            return self.particion.clase(c)
+        return c if c in self.con_simbolo else -1
+    
+    def _mover(self, mascara, simbolo):
+        """move + epsilon clausura con las tablas precalculadas"""
+        candidatos = mascara & self.con_simbolo.get(simbolo, 0)
+        if not candidatos:
+            return 0
+        salto = self.saltos[simbolo]
+        destino = 0
+        for i in _bits(candidatos):
+            destino |= salto[i]
+        return destino
+    
+    def _fila(self, mascara):
+        """Fila de transiciones del estado; la crea (y desaloja la menos usada) si no está"""
+        fila = self.cache.get(mascara)
+        if fila is not None:
+            self.cache.move_to_end(mascara)
+            return fila
+        fila = {}
+        self.cache[mascara] = fila
+        if len(self.cache) > self.max_estados:
+            self.cache.popitem(last=False)
+            self.desalojos += 1
+        return fila
+    
+    def acepta(self, cadena):
+        """Indica si la cadena completa pertenece al lenguaje"""
+        mascara = self.inicial
+        fila = self._fila(mascara)
+        pasos = self._pasos_ventana
+        simbolo_de = self._simbolo
+        for i, c in enumerate(cadena):
+            simbolo = simbolo_de(c)
+            if simbolo == -1:
+                self._pasos_ventana = pasos
+                return False
+            destino = fila.get(simbolo)
+            if destino is None:
+                self.fallos += 1
+                destino = self._mover(mascara, simbolo)
+                fila[simbolo] = destino
+            else:
+                self.aciertos += 1
+            if not destino:
+                self._pasos_ventana = pasos
+                return False
+            mascara = destino
+            fila = self._fila(mascara)
+            
+            # Cada `ventana` pasos se revisa si la caché está desalojando demasiado
+            pasos += 1
+            if pasos >= self.ventana:
+                desalojos_ventana = self.desalojos - self._desalojos_marca
+                self._desalojos_marca = self.desalojos
+                pasos = 0
+                if desalojos_ventana > self.umbral_desalojos * self.ventana:
+                    self._pasos_ventana = 0
+                    self.respaldos_afn += 1
+                    return self._simular_afn(mascara, cadena, i + 1)
+        
+        self._pasos_ventana = pasos
+        return bool(mascara & self.finales)
+    
+    def _simular_afn(self, mascara, cadena, desde):
+        """Simulación directa del AFN (sin caché) desde la posición indicada"""
+        for i in range(desde, len(cadena)):
+            mascara = self._mover(mascara, self._simbolo(cadena[i]))
+            if not mascara:
+                return False
+        return bool(mascara & self.finales)
+    
+    def estadisticas(self):
+        return {
+            "estados_en_cache": len(self.cache),
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "desalojos": self.desalojos,
+            "respaldos_afn": self.respaldos_afn,
+        }
+    
+    def mostrar_estadisticas(self):
+        print("Estadísticas de la caché del AFD perezoso:")
+        for nombre, valor in self.estadisticas().items():
+            print(f"  {nombre}: {valor}")
+
+def main():
+    # benchmarks importa el compilador; solo hace falta para esta demostración
+    from benchmarks import construir_a_b_n
+    # (a|b)*a(a|b){n}: el AFD completo tiene 2^(n+1) estados, pero una cadena solo visita algunos
+    n = 20
+    afn = construir_a_b_n(ConstructorThompson(incremental=True), n)
+    
+    print(f"=== AFD perezoso para (a|b)*a(a|b){{{n}}} ===")
+    perezoso = AFDPerezoso(afn, max_estados=512)
+    generador = random.Random(0)
+    aceptadas = 0
+    for _ in range(200):
+        cadena = "".join(generador.choice("ab") for _ in range(200))
+        if perezoso.acepta(cadena):
+            aceptadas += 1
+    print(f"Cadenas aceptadas: {aceptadas} de 200")
+    perezoso.mostrar_estadisticas()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,504 @@
+import gc
+import os
+import pickle
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from busqueda import Buscador
+from compilador import compilar, construir_afn, ejercicio3, parsear
+from derivadas import ConversorDerivadas
+from directo import afd_directo
+from main import AFD, ConstructorThompson, ConversorAFD, Rango
+from minimizacion import equivalentes, minimizar
+from serializacion import cargar_afd, guardar_afd
+from sin_epsilon import EliminadorEpsilon
+
+def construir_a_b_n(constructor, n):
+    """Construye el AFN de (a|b)*a(a|b)(a|b)...(a|b) con n copias finales de (a|b)"""
+    prefijo = constructor.estrella(constructor.union(constructor.caracter('a'), constructor.caracter('b')))
+    afn = constructor.concatenacion(prefijo, constructor.caracter('a'))
+    for _ in range(n):
+        afn = constructor.concatenacion(afn, constructor.union(constructor.caracter('a'), constructor.caracter('b')))
+    return constructor.finalizar(afn)
+
+def construir_cadena_epsilon(constructor, k):
+    """
+    Construye ((a|b)*)?a((a|b)*)?b... con k bloques: muchas transiciones epsilon
+    encadenadas, por lo que las clausuras son grandes
+    """
+    afn = None
+    for i in range(k):
+        bloque = constructor.opcional(constructor.estrella(
+            constructor.union(constructor.caracter('a'), constructor.caracter('b'))))
+        bloque = constructor.concatenacion(bloque, constructor.caracter('ab'[i % 2]))
+        afn = bloque if afn is None else constructor.concatenacion(afn, bloque)
+    return constructor.finalizar(afn)
+
+def medir(funcion, repeticiones=3):
+    """Devuelve el mejor tiempo (en segundos) de varias ejecuciones"""
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        transcurrido = time.perf_counter() - inicio
+        if mejor is None or transcurrido < mejor:
+            mejor = transcurrido
+    return mejor
+
+# Archivos de expresiones de los benchmarks, relativos a esta carpeta
+ARCHIVOS_EXPRESIONES = ("expresiones.txt", os.path.join("..", "Ejercicio3", "expresiones.txt"))
+
+def leer_expresiones(archivos=ARCHIVOS_EXPRESIONES):
+    """Expresiones de los archivos (rutas relativas a esta carpeta), una por línea no vacía"""
+    carpeta = os.path.dirname(os.path.abspath(__file__))
+    patrones = []
+    for archivo in archivos:
+        with open(os.path.join(carpeta, archivo), 'r', encoding='utf-8') as entrada:
+            patrones += [linea.rstrip('\n') for linea in entrada if linea.strip()]
+    return patrones
+
+def abreviar(texto, ancho=30):
+    """El texto tal cual si cabe en la columna; si no, recortado con '...'"""
+    return texto if len(texto) <= ancho else texto[:ancho - 3] + "..."
+
+def benchmark_cierres(tamanos=(4, 6, 8, 10), bloques=(10, 20, 40, 80)):
+    """Compara convertir() con conjuntos contra la versión con clausuras precalculadas en bits"""
+    print("=== Construcción de subconjuntos: conjuntos vs máscaras de bits ===")
+    casos = [(f"(a|b)*a(a|b){{{n}}}", construir_a_b_n, n) for n in tamanos]
+    casos += [(f"((a|b)*)?a... x{k}", construir_cadena_epsilon, k) for k in bloques]
+    print("Patrón\t\t\tEstados AFD\tConjuntos (s)\tBits (s)\tAceleración")
+    for nombre, construir, n in casos:
+        afn = construir(ConstructorThompson(incremental=True), n)
+        
+        normal = ConversorAFD(afn)
+        bits = ConversorAFD(afn, bitsets=True)
+        tiempo_normal = medir(lambda: ConversorAFD(afn).convertir())
+        tiempo_bits = medir(lambda: ConversorAFD(afn, bitsets=True).convertir())
+        
+        normal.convertir()
+        bits.convertir()
+        if (normal.estados_afd != bits.estados_afd
+                or normal.transiciones_afd != bits.transiciones_afd
+                or normal.estados_finales_afd != bits.estados_finales_afd):
+            raise AssertionError(f"Los AFD difieren para {nombre}")
+        
+        print(f"{nombre:<24}{len(normal.estados_afd)}\t\t{tiempo_normal:.4f}\t\t{tiempo_bits:.4f}\t\t"
+              f"{tiempo_normal / tiempo_bits:.1f}x")
+
+def benchmark_glushkov(cadenas_por_patron=2000):
+    """Compara el motor bit-paralelo de Glushkov con el camino Thompson + AFD (compilación y reconocimiento)"""
+    print("=== Motor Glushkov bit-paralelo vs Thompson + AFD ===")
+    patrones = [
+        "(a|b)*abb(a|b)*",
+        "if\\([ae]+\\)\\{[ei]+\\}(\\n(else\\{[jl]+\\}))?",
+        "[ae03]+@[ae03]+.(com|net|org)(.(gt|cr|co))?",
+    ] + ["(a|b)*a" + "(a|b)" * n for n in (4, 8, 12)]
+    generador = random.Random(0)
+    print("Patrón\t\t\t\tMotor\t\tCompilar (s)\tReconocer (s)")
+    for patron in patrones:
+        alfabeto = sorted(set(patron) - set("()|*+?[]\\"))
+        cadenas = ["".join(generador.choice(alfabeto) for _ in range(generador.randint(0, 40)))
+                   for _ in range(cadenas_por_patron)]
+        resultados = {}
+        for motor in ('thompson', 'glushkov'):
+            # Se llama a la función sin la caché LRU para medir la compilación real
+            tiempo_compilar = medir(lambda: compilar.__wrapped__(patron, motor), 1)
+            compilado = compilar.__wrapped__(patron, motor)
+            tiempo_reconocer = medir(lambda: [compilado.acepta(cadena) for cadena in cadenas], 1)
+            resultados[motor] = [compilado.acepta(cadena) for cadena in cadenas]
+            nombre = abreviar(patron)
+            print(f"{nombre:<32}{motor:<16}{tiempo_compilar:.4f}\t\t{tiempo_reconocer:.4f}")
+        if resultados['thompson'] != resultados['glushkov']:
+            raise AssertionError(f"Los motores difieren para {patron}")
+
+def generar_patron(tamano, semilla=0):
+    """Patrón sintético de aproximadamente tamano caracteres (como los generados por máquina)"""
+    generador = random.Random(semilla)
+    piezas = ["(a|b)*", "[ae03]+", "c\\.", "d?", "(e|f|g)", "\\(h\\)", "[0-9a-f]", "x+"]
+    partes = []
+    largo = 0
+    while largo < tamano:
+        pieza = generador.choice(piezas)
+        partes.append(pieza)
+        largo += len(pieza)
+    return "".join(partes)
+
+def benchmark_parser(tamanos=(1 << 10, 1 << 14, 1 << 17, 1 << 20)):
+    """Mide el paso a postfix de Ejercicio3 (con cadenas y pasos vs tokens) para patrones de 1 KB a 1 MB"""
+    print("=== Tokenizador y shunting yard de Ejercicio3 ===")
+    print("Tamaño		Cadena+pasos (s)	Cadena (s)	Tokens (s)	μs/caracter")
+    for tamano in tamanos:
+        patron = generar_patron(tamano)
+        con_pasos = medir(lambda: ejercicio3.shunting_yard(ejercicio3.insert_concatenation(patron), trazar=True), 1)
+        sin_pasos = medir(lambda: ejercicio3.shunting_yard(ejercicio3.insert_concatenation(patron)), 1)
+        tokens = medir(lambda: ejercicio3.shunting_yard_tokens(
+            ejercicio3.insert_concatenation_tokens(ejercicio3.iter_tokens(patron))), 1)
+        print(f"{len(patron):<16}{con_pasos:.4f}\t\t\t{sin_pasos:.4f}\t\t{tokens:.4f}\t\t"
+              f"{tokens / len(patron) * 1e6:.2f}")
+
+def medir_memoria(funcion):
+    """Devuelve (resultado, segundos, pico de memoria en KB) de una ejecución"""
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    resultado = funcion()
+    segundos = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resultado, segundos, pico / 1024
+
+def benchmark_repeticion(tamanos=(10, 100, 1000, 5000), limite_thompson=300):
+    """
+    Compila repeticiones {n} con n creciente: Thompson expande las copias (los
+    estados crecen con n) y el motor con contadores no. (a|b)*a(a|b){n} tiene
+    un AFD de 2^(n+1) estados, por eso con Thompson solo se mide hasta n = 12;
+    con contadores mantiene hasta n configuraciones activas, así que reconocer
+    cuesta O(n) por caracter y se mide solo hasta n = 1000.
+    """
+    import contadores  # que la importación no cuente en la memoria del primer caso
+    print("=== Repeticiones acotadas: Thompson expandido vs contadores ===")
+    print("Patrón\t\t\tMotor\t\tEstados\t\tCompilar (s)\tMemoria (KB)\tReconocer (s)")
+    generador = random.Random(0)
+    familias = (("(a|b){{1,{n}}}c", limite_thompson, max(tamanos)), ("(a|b)*a(a|b){{{n}}}", 12, 1000))
+    for plantilla, limite, tope in familias:
+        for n in sorted({n for n in tamanos if n <= tope} | {limite}):
+            patron = plantilla.format(n=n)
+            cadenas = ["".join(generador.choice("ab") for _ in range(n + 2)) + "c" for _ in range(5)]
+            for motor in ('thompson', 'contadores'):
+                if motor == 'thompson' and n > limite:
+                    continue
+                compilado, segundos, pico = medir_memoria(lambda: compilar.__wrapped__(patron, motor))
+                if motor == 'thompson':
+                    estados = f"{len(compilado.afn.estados)}/{compilado.afd.num_estados}"
+                else:
+                    estados = f"{compilado.simulador.posiciones.num_posiciones} pos."
+                reconocer = medir(lambda: [compilado.acepta(cadena) for cadena in cadenas], 1)
+                print(f"{patron:<24}{motor:<16}{estados:<16}{segundos:.4f}\t\t{pico:.0f}\t\t{reconocer:.4f}")
+
+def afd_aleatorio(num_estados, simbolos="abcdefgh", semilla=0):
+    """AFD sintético con transiciones al azar (para medir formatos de gran tamaño)"""
+    generador = random.Random(semilla)
+    transiciones = [{s: generador.randrange(num_estados) for s in simbolos if generador.random() < 0.9}
+                    for _ in range(num_estados)]
+    finales = {e for e in range(num_estados) if generador.random() < 0.1}
+    return AFD(list(simbolos), transiciones, 0, finales)
+
+def benchmark_serializacion(tamanos=(1000, 10000, 100000)):
+    """Carga de un AFD: formato binario con mmap vs pickle de los objetos"""
+    print("=== Carga de AFD serializado: mmap vs pickle ===")
+    print("Estados		Binario (KB)	mmap (ms)	Pickle (KB)	pickle (ms)")
+    with tempfile.TemporaryDirectory() as carpeta:
+        for n in tamanos:
+            afd = afd_aleatorio(n)
+            ruta_binaria = os.path.join(carpeta, f"{n}.afd")
+            ruta_pickle = os.path.join(carpeta, f"{n}.pickle")
+            guardar_afd(afd, ruta_binaria)
+            with open(ruta_pickle, 'wb') as archivo:
+                pickle.dump(afd, archivo)
+            
+            def cargar_binario():
+                cargado = cargar_afd(ruta_binaria)
+                cargado.acepta("abcabc")
+                cargado.cerrar()
+            
+            def cargar_pickle():
+                with open(ruta_pickle, 'rb') as archivo:
+                    pickle.load(archivo).acepta("abcabc")
+            
+            cargado = cargar_afd(ruta_binaria)
+            cadenas = ["".join(random.choices("abcdefgh", k=20)) for _ in range(200)]
+            if [cargado.acepta(c) for c in cadenas] != [afd.acepta(c) for c in cadenas]:
+                raise AssertionError(f"El AFD cargado difiere ({n} estados)")
+            cargado.cerrar()
+            print(f"{n:<16}{os.path.getsize(ruta_binaria) / 1024:<16.0f}{medir(cargar_binario) * 1000:<16.3f}"
+                  f"{os.path.getsize(ruta_pickle) / 1024:<16.0f}{medir(cargar_pickle) * 1000:.3f}")
+
+def expandir_rangos(afn):
+    """Reemplaza cada transición con Rango por una transición por caracter (como antes de las clases)"""
+    for estado in afn.estados:
+        for etiqueta in [e for e in estado.transiciones if isinstance(e, Rango)]:
+            destinos = estado.transiciones.pop(etiqueta)
+            afn.alfabeto.discard(etiqueta)
+            for codigo in range(ord(etiqueta.desde), ord(etiqueta.hasta) + 1):
+                for destino in destinos:
+                    estado.agregar_transicion(chr(codigo), destino)
+                afn.alfabeto.add(chr(codigo))
+    return afn
+
+def benchmark_clases(repeticiones=3):
+    """Construcción de subconjuntos por caracter vs por clase de equivalencia"""
+    print("=== Subconjuntos por caracter vs por clases de caracteres ===")
+    patrones = [
+        "[a-zA-Z0-9]+@[a-zA-Z0-9]+.(com|net|org)",
+        "[a-zA-Z_][a-zA-Z0-9_]*",
+        "([0-9a-f][0-9a-f]:){5}[0-9a-f][0-9a-f]",
+        "[\\u00c0-\\u024f]+[a-z]*",
+    ]
+    print("Patrón\t\t\t\t\tSímbolos\tClases\tPor caracter (s)\tPor clase (s)")
+    for patron in patrones:
+        ast = parsear(patron.encode().decode('unicode_escape'))
+        por_caracter = expandir_rangos(construir_afn(ast, ConstructorThompson()))
+        por_rango = construir_afn(ast, ConstructorThompson())
+        tiempo_caracter = medir(lambda: ConversorAFD(por_caracter, bitsets=True).convertir(), repeticiones)
+        tiempo_clase = medir(lambda: ConversorAFD(por_rango, bitsets=True, clases=True).convertir(), repeticiones)
+        clases = ConversorAFD(por_rango, clases=True).particion.num_clases
+        print(f"{patron:<40}{len(por_caracter.alfabeto)}\t\t{clases}\t{tiempo_caracter:.4f}\t\t\t{tiempo_clase:.4f}")
+
+def afd_por_subconjuntos(ast):
+    conversor = ConversorAFD(construir_afn(ast, ConstructorThompson(incremental=True)), bitsets=True, clases=True)
+    conversor.convertir()
+    return conversor.a_afd()
+
+def benchmark_directo(archivos=ARCHIVOS_EXPRESIONES, tamanos=(8, 12, 14)):
+    """AFD directo desde el árbol (followpos) vs AFN de Thompson + subconjuntos"""
+    print("=== AFD directo (followpos) vs Thompson + subconjuntos ===")
+    patrones = leer_expresiones(archivos)
+    patrones += ["(a|b)*a" + "(a|b)" * n for n in tamanos]
+    print("Patrón\t\t\t\tAFD Thompson\tAFD directo\tMínimo\tThompson (s)\tDirecto (s)")
+    for patron in patrones:
+        try:
+            ast = parsear(patron)
+        except ValueError as error:
+            print(f"{patron}: {error}")
+            continue
+        tiempo_thompson = medir(lambda: afd_por_subconjuntos(ast))
+        tiempo_directo = medir(lambda: afd_directo(ast))
+        por_subconjuntos = afd_por_subconjuntos(ast)
+        directo = afd_directo(ast)
+        minimo = minimizar(directo)
+        if not equivalentes(minimizar(por_subconjuntos), minimo):
+            raise AssertionError(f"Los AFD difieren para {patron}")
+        nombre = abreviar(patron)
+        print(f"{nombre:<32}{por_subconjuntos.num_estados:<16}{directo.num_estados:<16}{minimo.num_estados}\t"
+              f"{tiempo_thompson:.4f}\t\t{tiempo_directo:.4f}")
+
+def afd_por_derivadas(ast):
+    conversor = ConversorDerivadas(ast)
+    conversor.convertir()
+    return conversor
+
+def benchmark_derivadas(archivos=ARCHIVOS_EXPRESIONES, tamanos=(8, 12), repeticiones=(10, 100, 1000)):
+    """AFD por derivadas de Brzozowski vs AFN de Thompson + subconjuntos"""
+    print("=== AFD por derivadas de Brzozowski vs Thompson + subconjuntos ===")
+    patrones = leer_expresiones(archivos)
+    patrones += ["(a|b)*a" + "(a|b)" * n for n in tamanos]
+    patrones += [f"[0-9]{{{n}}}-[a-z]{{1,{n}}}" for n in repeticiones]
+    print("Patrón\t\t\t\tAFD Thompson\tAFD derivadas\tMínimo\tTérminos\tThompson (s)\tDerivadas (s)")
+    for patron in patrones:
+        try:
+            ast = parsear(patron)
+        except ValueError as error:
+            print(f"{patron}: {error}")
+            continue
+        tiempo_thompson = medir(lambda: afd_por_subconjuntos(ast))
+        tiempo_derivadas = medir(lambda: afd_por_derivadas(ast))
+        por_subconjuntos = afd_por_subconjuntos(ast)
+        conversor = afd_por_derivadas(ast)
+        derivadas = conversor.a_afd()
+        minimo = minimizar(derivadas)
+        if not equivalentes(minimizar(por_subconjuntos), minimo):
+            raise AssertionError(f"Los AFD difieren para {patron}")
+        nombre = abreviar(patron)
+        print(f"{nombre:<32}{por_subconjuntos.num_estados:<16}{derivadas.num_estados:<16}{minimo.num_estados}\t"
+              f"{len(conversor.terminos.nodos)}\t\t{tiempo_thompson:.4f}\t\t{tiempo_derivadas:.4f}")
+
+def benchmark_epsilon(bloques=(10, 40, 80), cadenas_por_caso=300):
+    """Subconjuntos y AFD perezoso sobre el AFN de Thompson vs el AFN sin epsilon"""
+    from afd_perezoso import AFDPerezoso
+    print("=== AFN de Thompson vs AFN sin transiciones epsilon ===")
+    casos = [(patron, construir_afn(parsear(patron), ConstructorThompson(incremental=True)))
+             for patron in ("(a|b)*abb(a|b)*", "[ae03]+@[ae03]+.(com|net|org)(.(gt|cr|co))?")]
+    casos += [(f"((a|b)*)?a... x{k}", construir_cadena_epsilon(ConstructorThompson(incremental=True), k))
+              for k in bloques]
+    generador = random.Random(0)
+    print("Patrón\t\t\t\tEstados\t\tAristas\t\tQuitar ε (s)\tSubconjuntos (s)\tPerezoso (s)")
+    for nombre, afn in casos:
+        eliminador = EliminadorEpsilon(afn)
+        tiempo_eliminar = medir(lambda: EliminadorEpsilon(afn).eliminar())
+        sin_epsilon = eliminador.eliminar()
+        alfabeto = sorted(simbolo for simbolo in afn.alfabeto if not isinstance(simbolo, Rango))
+        cadenas = ["".join(generador.choice(alfabeto) for _ in range(generador.randint(0, 60)))
+                   for _ in range(cadenas_por_caso)]
+        tiempos = []
+        for version in (afn, sin_epsilon):
+            subconjuntos = medir(lambda: ConversorAFD(version, bitsets=True).convertir(), 1)
+            perezoso = medir(lambda: [AFDPerezoso(version, max_estados=64).acepta(c) for c in cadenas], 1)
+            tiempos.append((subconjuntos, perezoso))
+        if ([AFDPerezoso(afn).acepta(c) for c in cadenas]
+                != [AFDPerezoso(sin_epsilon).acepta(c) for c in cadenas]):
+            raise AssertionError(f"Los AFN difieren para {nombre}")
+        nombre = abreviar(nombre)
+        print(f"{nombre:<32}{eliminador.estados_antes}->{eliminador.estados_despues:<10}"
+              f"{eliminador.aristas_antes}->{eliminador.aristas_despues:<10}{tiempo_eliminar:.4f}\t\t"
+              f"{tiempos[0][0]:.4f}->{tiempos[1][0]:.4f}\t{tiempos[0][1]:.4f}->{tiempos[1][1]:.4f}")
+
+def texto_con_correos(tamano, semilla=0):
+    """Texto sintético con correos de la expresión h mezclados con palabras"""
+    generador = random.Random(semilla)
+    piezas = ["hola ", "ae@03.com ", "a0@e3.org.gt ", "x@y.com ", "eee ", "0330 ", "@@ "]
+    partes = []
+    largo = 0
+    while largo < tamano:
+        pieza = generador.choice(piezas)
+        partes.append(pieza)
+        largo += len(pieza)
+    return "".join(partes)
+
+def buscar_reintentando(compilado, texto):
+    """Búsqueda ingenua: desde cada posición se corre el AFD y se guarda el fin más largo"""
+    afd = compilado.afd
+    coincidencias = []
+    posicion = 0
+    while posicion <= len(texto):
+        estado = afd.estado_inicial
+        fin = posicion if afd.es_final(estado) else -1
+        for j in range(posicion, len(texto)):
+            estado = afd.siguiente(estado, texto[j])
+            if estado < 0:
+                break
+            if afd.es_final(estado):
+                fin = j + 1
+        if fin < 0:
+            posicion += 1
+        else:
+            coincidencias.append((posicion, fin))
+            posicion = fin if fin > posicion else fin + 1
+    return coincidencias
+
+def benchmark_busqueda(tamanos=(2_000, 10_000, 100_000, 1_000_000)):
+    """buscar_todas (adelante + AFD invertido) vs reintentar el AFD desde cada posición"""
+    print("=== Búsqueda sin anclar: dos pasadas vs reintentar desde cada posición ===")
+    # (patrón, generador del texto, tamaño máximo para la búsqueda ingenua); en el
+    # último caso ninguna posición coincide y cada reintento recorre el resto del texto
+    casos = [
+        ("[ae03]+@[ae03]+.(com|net|org)(.(gt|cr|co))?", texto_con_correos, 100_000),
+        ("(a|e|0|3)*@", texto_con_correos, 100_000),
+        ("(a|b)*c", lambda tamano: "ab" * (tamano // 2), 2_000),
+    ]
+    print("Patrón\t\t\t\tTamaño\t\tCoincidencias\tDos pasadas (s)\tμs/caracter\tIngenua (s)")
+    for patron, generar, limite_ingenuo in casos:
+        compilado = compilar.__wrapped__(patron)
+        for tamano in tamanos:
+            texto = generar(tamano)
+            tiempo = medir(lambda: list(compilado.buscar_todas(texto)), 1)
+            encontradas = [(m.inicio, m.fin) for m in compilado.buscar_todas(texto)]
+            ingenua = "-"
+            if tamano <= limite_ingenuo:
+                ingenua = f"{medir(lambda: buscar_reintentando(compilado, texto), 1):.4f}"
+                if buscar_reintentando(compilado, texto) != encontradas:
+                    raise AssertionError(f"Las búsquedas difieren para {patron}")
+            nombre = abreviar(patron)
+            print(f"{nombre:<32}{tamano:<16}{len(encontradas):<16}{tiempo:.4f}\t\t"
+                  f"{tiempo / tamano * 1e6:.2f}\t\t{ingenua}")
+
+def texto_en_prosa(tamano, inserciones, semilla=0):
+    """Prosa sintética con algunas cadenas de los patrones insertadas"""
+    generador = random.Random(semilla)
+    palabras = ["el", "regex", "compila", "un", "autómata", "para", "cada", "texto", "y", "luego",
+                "busca", "los", "tokens", "en", "orden", "de", "aparición", "con", "sus", "estados"]
+    partes = []
+    largo = 0
+    while largo < tamano:
+        pieza = generador.choice(inserciones) if generador.random() < 0.002 else generador.choice(palabras)
+        partes.append(pieza + " ")
+        largo += len(pieza) + 1
+    return "".join(partes)
+
+def benchmark_prefiltro(tamano=1_000_000):
+    """Búsqueda con y sin el prefiltro de literales obligatorios"""
+    print("=== Prefiltro de literales (str.find) antes del autómata ===")
+    casos = [
+        ("(a|b)*abb(a|b)*", ["abb", "babba", "ab"]),
+        ("[ae03]+@[ae03]+.(com|net|org)(.(gt|cr|co))?", ["ae@03.com", "a0@e3.org.gt", "x@y.com"]),
+        ("if\\([ae]+\\)\\{[ei]+\\}(\\n(else\\{[jl]+\\}))?", ["if(a){e}", "if(ae){ie}\nelse{jl}"]),
+        ("[0-9]{3}-[0-9]{2,4}", ["502-1234", "50-12"]),
+    ]
+    print("Patrón\t\t\t\tLiteral\tCandidatos\tSaltado\t\tSin prefiltro (s)\tCon prefiltro (s)")
+    for patron, inserciones in casos:
+        texto = texto_en_prosa(tamano, inserciones)
+        compilado = compilar.__wrapped__(patron)
+        sin_prefiltro = Buscador(compilado.ast)
+        tiempo_sin = medir(lambda: list(sin_prefiltro.buscar_todas(texto)), 1)
+        tiempo_con = medir(lambda: list(compilado.buscar_todas(texto)), 1)
+        if list(sin_prefiltro.buscar_todas(texto)) != list(compilado.buscar_todas(texto)):
+            raise AssertionError(f"Las búsquedas difieren para {patron}")
+        compilado.prefiltro.reiniciar_estadisticas()
+        list(compilado.buscar_todas(texto))
+        estadisticas = compilado.prefiltro.estadisticas()
+        saltado = estadisticas['saltados'] / len(texto)
+        nombre = abreviar(patron)
+        print(f"{nombre:<32}{estadisticas['literal']!r:<8}{estadisticas['candidatos']:<16}{saltado:<16.1%}"
+              f"{tiempo_sin:.4f}\t\t\t{tiempo_con:.4f}")
+
+def memoria_retenida(construir):
+    """Devuelve (objeto, KB que siguen ocupados mientras el objeto vive, pico en KB)"""
+    gc.collect()
+    tracemalloc.start()
+    objeto = construir()
+    gc.collect()
+    actual, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return objeto, actual / 1024, pico / 1024
+
+def benchmark_memoria(tamanos=(8, 10, 12, 14)):
+    """Memoria del conversor con conjuntos de Estado como claves vs estados internados"""
+    print("=== Memoria de ConversorAFD: frozensets de Estado vs IDs internados ===")
+    print("Patrón\t\t\tEstados AFD\tModo\t\tRetenida (KB)\tPico (KB)\tTiempo (s)")
+    for n in tamanos:
+        def convertir(**opciones):
+            conversor = ConversorAFD(construir_a_b_n(ConstructorThompson(incremental=True), n), **opciones)
+            conversor.convertir()
+            return conversor
+        
+        for modo, opciones in (("conjuntos", {'bitsets': True}), ("internado", {'internar': True})):
+            inicio = time.perf_counter()
+            conversor, retenida, pico = memoria_retenida(lambda: convertir(**opciones))
+            segundos = time.perf_counter() - inicio
+            estados = conversor.num_estados_afd or len(conversor.estados_afd)
+            print(f"{f'(a|b)*a(a|b){{{n}}}':<24}{estados:<16}{modo:<16}{retenida:<16.0f}{pico:<16.0f}{segundos:.3f}")
+            del conversor
+
+def benchmark_limites(tamanos=(8, 12, 14, 16), max_estados=4096, max_segundos=0.2, cadenas_por_caso=200):
+    """Compilación con y sin límites para (a|b)*a(a|b){n}: el tiempo queda acotado con AFD perezoso"""
+    print("=== Límites de la construcción de subconjuntos ===")
+    print(f"Límites: {max_estados} estados, {max_segundos} s")
+    print("Patrón\t\t\tSin límite (s)\tCon límite (s)\tLímite\t\tAceptar (s)")
+    generador = random.Random(0)
+    for n in tamanos:
+        patron = "(a|b)*a" + "(a|b)" * n
+        cadenas = ["".join(generador.choice("ab") for _ in range(generador.randint(0, 200)))
+                   for _ in range(cadenas_por_caso)]
+        compilar.cache_clear()
+        inicio = time.perf_counter()
+        completo = compilar(patron)
+        sin_limite = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        limitado = compilar(patron, max_estados=max_estados, max_segundos=max_segundos)
+        con_limite = time.perf_counter() - inicio
+        if any(completo.acepta(cadena) != limitado.acepta(cadena) for cadena in cadenas):
+            raise AssertionError(f"El AFD perezoso difiere para {patron}")
+        aceptar = medir(lambda: [limitado.acepta(cadena) for cadena in cadenas])
+        limite = limitado.limite.limite if limitado.limite is not None else "-"
+        print(f"{f'(a|b)*a(a|b){{{n}}}':<24}{sin_limite:<16.4f}{con_limite:<16.4f}{limite:<16}{aceptar:.4f}")
+
+BENCHMARKS = {
+    'cierres': benchmark_cierres,
+    'glushkov': benchmark_glushkov,
+    'parser': benchmark_parser,
+    'repeticion': benchmark_repeticion,
+    'serializacion': benchmark_serializacion,
+    'clases': benchmark_clases,
+    'directo': benchmark_directo,
+    'epsilon': benchmark_epsilon,
+    'busqueda': benchmark_busqueda,
+    'prefiltro': benchmark_prefiltro,
+    'memoria': benchmark_memoria,
+    'derivadas': benchmark_derivadas,
+    'limites': benchmark_limites,
+}
+
+if __name__ == "__main__":
+    for nombre in sys.argv[1:] or BENCHMARKS:
+        BENCHMARKS[nombre]()
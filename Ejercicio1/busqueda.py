@@ -0,0 +1,273 @@
+from array import array
+from collections import namedtuple
+
+from compilador import compilar, construir_afn, plegar
+from main import ConstructorThompson, ConversorAFD, _bits
+
+# inicio y fin son posiciones en el texto (fin excluido); lexema es texto[inicio:fin]
+Coincidencia = namedtuple('Coincidencia', 'inicio fin lexema')
+
+MAX_ESTADOS = 4096
+
+def invertir(ast):
+    """AST del lenguaje invertido: basta con invertir el orden de cada concatenación"""
+    def combinar(nodo, sub):
+        if not sub:
+            return nodo
+        if nodo[0] == 'cat':
+            return ('cat', sub[1], sub[0])
+        return (nodo[0], *sub, *nodo[1 + len(sub):])
+    
+    return plegar(ast, combinar)
+
+class _Tablas:
+    """move + epsilon clausura del AFN de un AST, por clase de caracteres y con máscaras de bits"""
+    def __init__(self, ast):
+        conversor = ConversorAFD(construir_afn(ast, ConstructorThompson(incremental=True)), clases=True)
+        _, self.inicial, self.saltos, self.con_simbolo, self.finales = conversor._tablas_bitsets()
+        self.particion = conversor.particion
+    
+    def mover(self, mascara, c):
+        clase = self.particion.clase(c)
+        candidatos = mascara & self.con_simbolo.get(clase, 0)
+        destino = 0
+        if candidatos:
+            salto = self.saltos[clase]
+            for i in _bits(candidatos):
+                destino |= salto[i]
+        return destino
+
+class _AdelanteNoAnclado:
+    """
+    AFD perezoso de .*R: cada estado (máscara de estados del AFN) vuelve a incluir
+    el inicial, así que una coincidencia puede empezar en cualquier posición. Las
+    transiciones se guardan por caracter; si hay demasiados estados se vacía la caché.
+    """
+    def __init__(self, tablas, max_estados):
+        self.tablas = tablas
+        self.max_estados = max_estados
+        self.ids = {}
+        self.mascaras = []
+        self.filas = []
+        self.finales = []
+        self.reiniciar()
+    
+    def reiniciar(self):
+        # Se vacía sin crear listas nuevas: quien recorre el texto guarda referencias a ellas
+        self.ids.clear()
+        del self.mascaras[:], self.filas[:], self.finales[:]
+        self.inicial = self._id(self.tablas.inicial)
+    
+    def _id(self, mascara):
+        estado = self.ids.get(mascara)
+        if estado is None:
+            estado = self.ids[mascara] = len(self.mascaras)
+            self.mascaras.append(mascara)
+            self.filas.append({})
+            self.finales.append(bool(mascara & self.tablas.finales))
+        return estado
+    
+    def siguiente(self, estado, c):
+        mascara = self.tablas.mover(self.mascaras[estado], c) | self.tablas.inicial
+        if mascara not in self.ids and len(self.mascaras) >= self.max_estados:
+            self.reiniciar()
+            return self._id(mascara)
+        destino = self._id(mascara)
+        self.filas[estado][c] = destino
+        return destino
+
+class _AtrasConFines:
+    """
+    AFD perezoso del AST invertido que se recorre de derecha a izquierda. Un
+    estado es una tupla de grupos (máscaras) ordenados por la posición donde
+    termina la coincidencia, de la más lejana a la más cercana; un estado del
+    AFN que ya está en un grupo anterior se quita de los siguientes, porque
+    desde ahí lo que falta leer es lo mismo y el fin anterior es más largo.
+    Cada transición devuelve además de qué grupo viene cada grupo nuevo (None
+    si no cambia ninguno) para mover las posiciones de fin.
+    """
+    def __init__(self, tablas, max_estados):
+        self.tablas = tablas
+        self.max_estados = max_estados
+        self.ids = {}
+        self.grupos = []
+        self.filas = []
+        self.semillas = []
+        self.primero = []
+        self.reiniciar()
+    
+    def reiniciar(self):
+        self.ids.clear()
+        del self.grupos[:], self.filas[:], self.semillas[:], self.primero[:]
+        self.vacio = self._id(())
+    
+    def _id(self, grupos):
+        estado = self.ids.get(grupos)
+        if estado is None:
+            estado = self.ids[grupos] = len(self.grupos)
+            self.grupos.append(grupos)
+            self.filas.append({})
+            self.semillas.append(None)
+            # Primer grupo (el fin más lejano) que acepta, o -1
+            finales = self.tablas.finales
+            self.primero.append(next((k for k, mascara in enumerate(grupos) if mascara & finales), -1))
+        return estado
+    
+    def _armar(self, origen, mascaras):
+        """Quita de cada máscara lo que ya está en los grupos anteriores y descarta las vacías"""
+        vistos = 0
+        grupos = []
+        mapeo = []
+        for k, mascara in zip(origen, mascaras):
+            mascara &= ~vistos
+            if mascara:
+                vistos |= mascara
+                grupos.append(mascara)
+                mapeo.append(k)
+        mapeo = tuple(mapeo)
+        return tuple(grupos), (None if mapeo == tuple(range(len(origen))) else mapeo)
+    
+    def _guardar(self, grupos, mapeo):
+        if grupos not in self.ids and len(self.grupos) >= self.max_estados:
+            self.reiniciar()
+            return self._id(grupos), mapeo, False
+        return self._id(grupos), mapeo, True
+    
+    def siguiente(self, estado, c):
+        actuales = self.grupos[estado]
+        grupos, mapeo = self._armar(range(len(actuales)),
+                                    [self.tablas.mover(mascara, c) for mascara in actuales])
+        destino, mapeo, valido = self._guardar(grupos, mapeo)
+        if valido:
+            self.filas[estado][c] = (destino, mapeo)
+        return destino, mapeo
+    
+    def sembrar(self, estado):
+        """Agrega un grupo con el estado inicial para una coincidencia que termina aquí"""
+        if self.semillas[estado] is None:
+            actuales = self.grupos[estado]
+            grupos, mapeo = self._armar(list(range(len(actuales))) + [-1],
+                                        list(actuales) + [self.tablas.inicial])
+            if mapeo is None:
+                mapeo = tuple(range(len(grupos)))
+            destino, mapeo, valido = self._guardar(grupos, mapeo)
+            if not valido:
+                return destino, mapeo
+            self.semillas[estado] = (destino, mapeo)
+        return self.semillas[estado]
+
+class Buscador:
+    """
+    Búsqueda sin anclar con la regla de la coincidencia más a la izquierda y más
+    larga, en tiempo lineal en el texto:
+      1. hacia adelante, el AFD de .*R marca las posiciones donde termina alguna
+         coincidencia;
+      2. hacia atrás, desde el último fin, el AFD del AST invertido (sembrado solo
+         en esos fines) da para cada inicio el fin más lejano;
+      3. se recorren los inicios de izquierda a derecha sin solapar coincidencias.
+    Los dos AFD se construyen bajo demanda y guardan sus transiciones. Con un
+    prefiltro (Prefiltro) solo se recorren los tramos alrededor de sus literales.
+    """
+    def __init__(self, ast, max_estados=MAX_ESTADOS, prefiltro=None):
+        self.adelante = _AdelanteNoAnclado(_Tablas(ast), max_estados)
+        self.atras = _AtrasConFines(_Tablas(invertir(ast)), max_estados)
+        self.prefiltro = prefiltro
+    
+    def _vivo(self, c):
+        """Indica si c puede estar dentro de una coincidencia (tiene clase en el alfabeto)"""
+        return self.adelante.tablas.particion.clase(c) >= 0
+    
+    def _fines(self, texto, inicio, fin):
+        """fines[j - inicio] = 1 si alguna coincidencia dentro de texto[inicio:fin] termina en j"""
+        afd = self.adelante
+        filas = afd.filas
+        finales = afd.finales
+        fines = bytearray(fin - inicio + 1)
+        estado = afd.inicial
+        fines[0] = finales[estado]
+        for j in range(inicio, fin):
+            c = texto[j]
+            destino = filas[estado].get(c)
+            if destino is None:
+                destino = afd.siguiente(estado, c)
+            estado = destino
+            if finales[estado]:
+                fines[j - inicio + 1] = 1
+        return fines
+    
+    def _mas_largas(self, texto, inicio, fines):
+        """largo[i - inicio] = fin de la coincidencia más larga que empieza en i, o -1"""
+        afd = self.atras
+        filas = afd.filas
+        primero = afd.primero
+        largo = array('i', [-1]) * len(fines)
+        ultimo = fines.rfind(1)
+        if ultimo < 0:
+            return largo
+        estado = afd.vacio
+        posiciones = []
+        for i in range(inicio + ultimo, inicio - 1, -1):
+            if i < inicio + ultimo:
+                c = texto[i]
+                par = filas[estado].get(c)
+                if par is None:
+                    par = afd.siguiente(estado, c)
+                estado, mapeo = par
+                if mapeo is not None:
+                    posiciones = [posiciones[k] for k in mapeo]
+            if fines[i - inicio]:
+                estado, mapeo = afd.sembrar(estado)
+                posiciones = [posiciones[k] if k >= 0 else i for k in mapeo]
+            k = primero[estado]
+            if k >= 0:
+                largo[i - inicio] = posiciones[k]
+        return largo
+    
+    def _coincidencias(self, texto, inicio, fin):
+        """Coincidencias (más a la izquierda y más largas) dentro de texto[inicio:fin], sin solaparse"""
+        fines = self._fines(texto, inicio, fin)
+        largo = self._mas_largas(texto, inicio, fines)
+        posicion = inicio
+        while posicion <= fin:
+            hasta = largo[posicion - inicio]
+            if hasta < 0:
+                posicion += 1
+                continue
+            yield Coincidencia(posicion, hasta, texto[posicion:hasta])
+            # Después de una coincidencia vacía se avanza un caracter
+            posicion = hasta if hasta > posicion else hasta + 1
+    
+    def buscar_todas(self, texto, inicio=0):
+        """Itera las coincidencias (más a la izquierda y más largas) sin solaparse"""
+        if self.prefiltro is None:
+            yield from self._coincidencias(texto, inicio, len(texto))
+            return
+        # Toda coincidencia queda dentro de un tramo candidato y los tramos no se tocan
+        for desde, hasta in self.prefiltro.tramos_candidatos(texto, inicio, len(texto), self._vivo):
+            yield from self._coincidencias(texto, desde, hasta)
+    
+    def buscar(self, texto, inicio=0):
+        """Primera coincidencia en el texto o None"""
+        return next(self.buscar_todas(texto, inicio), None)
+
+def buscar(patron, texto, inicio=0):
+    return compilar(patron).buscar(texto, inicio)
+
+def buscar_todas(patron, texto, inicio=0):
+    return compilar(patron).buscar_todas(texto, inicio)
+
+# Nombres habituales de las bibliotecas de regex
+search = buscar
+finditer = buscar_todas
+
+def main():
+    texto = ("Escribir a ae@03.com o a 0a@e3.org.gt; no a x@y.com. "
+             "if(a){e} else if(ae){ie}\nelse{jl} fin")
+    for nombre, patron in [("h", "[ae03]+@[ae03]+.(com|net|org)(.(gt|cr|co))?"),
+                           ("g", "if\\([ae]+\\)\\{[ei]+\\}(\\n(else\\{[jl]+\\}))?")]:
+        print(f"=== Búsqueda de la expresión {nombre}: {patron} ===")
+        for coincidencia in buscar_todas(patron, texto):
+            print(f"  [{coincidencia.inicio}, {coincidencia.fin}) {coincidencia.lexema!r}")
+
+if __name__ == "__main__":
+    main()
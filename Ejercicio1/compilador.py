@@ -0,0 +1,502 @@
+import importlib.util
+import os
+import sys
+from functools import lru_cache
+
+from main import ConstructorThompson, ConversorAFD, LimiteExcedido
+from minimizacion import minimizar
+from prefiltro import Prefiltro
+
+def _cargar_ejercicio3():
+    """Carga Ejercicio3/main.py (tokenizador y shunting yard) como módulo 'ejercicio3'"""
+    if 'ejercicio3' in sys.modules:
+        return sys.modules['ejercicio3']
+    ruta = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'Ejercicio3', 'main.py')
+    spec = importlib.util.spec_from_file_location('ejercicio3', ruta)
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules['ejercicio3'] = modulo
+    spec.loader.exec_module(modulo)
+    return modulo
+
+ejercicio3 = _cargar_ejercicio3()
+
+TAMANO_CACHE = 128
+
+# Escapes con significado especial; cualquier otro \c es el caracter c literal
+ESCAPES = {'n': '\n', 't': '\t', 'r': '\r'}
+
+OPERADORES_UNARIOS = {'*': 'estrella', '+': 'mas', '?': 'opcional'}
+OPERADORES_BINARIOS = {'.': 'cat', '|': 'union'}
+
+# El AST se representa con tuplas:
+#   ('eps',)  ('lit', c)  ('clase', ((desde, hasta), ...))
+#   ('cat', a, b)  ('union', a, b)  ('estrella', a)  ('mas', a)  ('opcional', a)
+#   ('rep', a, m, n): a{m,n}, con n = None si no tiene tope ({m,})
+
+def hijos(nodo):
+    tipo = nodo[0]
+    if tipo in ('cat', 'union'):
+        return nodo[1:3]
+    if tipo in ('estrella', 'mas', 'opcional', 'rep'):
+        return nodo[1:2]
+    return ()
+
+def plegar(ast, combinar):
+    """
+    Recorre el AST en postorden sin recursión (los patrones largos generan árboles
+    muy profundos). combinar(nodo, resultados_de_los_hijos) da el valor del nodo.
+    """
+    pila = [(ast, False)]
+    resultados = []
+    while pila:
+        nodo, visitado = pila.pop()
+        sub = hijos(nodo)
+        if visitado or not sub:
+            if sub:
+                argumentos = resultados[-len(sub):]
+                del resultados[-len(sub):]
+            else:
+                argumentos = []
+            resultados.append(combinar(nodo, argumentos))
+        else:
+            pila.append((nodo, True))
+            for hijo in reversed(sub):
+                pila.append((hijo, False))
+    return resultados[0]
+
+def parsear_clase(texto):
+    """Convierte el contenido de [..] en una tupla ordenada de rangos (desde, hasta)"""
+    caracteres = []
+    i = 0
+    while i < len(texto):
+        c = texto[i]
+        if c == '\\' and i + 1 < len(texto):
+            i += 1
+            c = ESCAPES.get(texto[i], texto[i])
+        caracteres.append(c)
+        i += 1
+    
+    rangos = []
+    i = 0
+    while i < len(caracteres):
+        if i + 2 < len(caracteres) and caracteres[i + 1] == '-':
+            desde, hasta = caracteres[i], caracteres[i + 2]
+            if desde > hasta:
+                raise ValueError(f"Rango inválido en clase: {desde}-{hasta}")
+            rangos.append((desde, hasta))
+            i += 3
+        else:
+            rangos.append((caracteres[i], caracteres[i]))
+            i += 1
+    if not rangos:
+        raise ValueError("Clase de caracteres vacía: []")
+    
+    # Unir rangos que se solapan o son contiguos
+    rangos.sort()
+    unidos = [rangos[0]]
+    for desde, hasta in rangos[1:]:
+        ultimo_desde, ultimo_hasta = unidos[-1]
+        if ord(desde) <= ord(ultimo_hasta) + 1:
+            unidos[-1] = (ultimo_desde, max(ultimo_hasta, hasta))
+        else:
+            unidos.append((desde, hasta))
+    return tuple(unidos)
+
+def parsear_repeticion(texto):
+    """Convierte '{m}', '{m,}' o '{m,n}' en (m, n), con n = None si no hay tope"""
+    encontrada = ejercicio3.REPETICION.fullmatch(texto)
+    minimo = int(encontrada.group(1))
+    if encontrada.group(2) is None:
+        return minimo, minimo
+    if not encontrada.group(3):
+        return minimo, None
+    maximo = int(encontrada.group(3))
+    if minimo > maximo:
+        raise ValueError(f"Repetición inválida: {texto} (mínimo mayor que máximo)")
+    return minimo, maximo
+
+def repeticion(nodo, minimo, maximo):
+    """Nodo de a{m,n}; los casos que ya tienen operador propio se simplifican"""
+    if maximo == 0:
+        return ('eps',)
+    if (minimo, maximo) == (1, 1):
+        return nodo
+    if (minimo, maximo) == (0, 1):
+        return ('opcional', nodo)
+    if (minimo, maximo) == (0, None):
+        return ('estrella', nodo)
+    if (minimo, maximo) == (1, None):
+        return ('mas', nodo)
+    return ('rep', nodo, minimo, maximo)
+
+def expandir_repeticiones(ast):
+    """
+    Reescribe cada a{m,n} sin contadores: a...a (m copias) seguido de
+    (a(a(a)?)?)? con n - m niveles, o de a+ si no hay tope. Las copias
+    comparten el mismo subárbol; quien construya el autómata crea una copia
+    de estados por cada aparición.
+    """
+    def combinar(nodo, sub):
+        tipo = nodo[0]
+        if not sub:
+            return nodo
+        if tipo != 'rep':
+            return (tipo, *sub)
+        cuerpo = sub[0]
+        _, _, minimo, maximo = nodo
+        if maximo is None:
+            partes = [cuerpo] * (minimo - 1) + [('mas', cuerpo)]
+        else:
+            partes = [cuerpo] * minimo
+            if maximo > minimo:
+                opcionales = ('opcional', cuerpo)
+                for _ in range(maximo - minimo - 1):
+                    opcionales = ('opcional', ('cat', cuerpo, opcionales))
+                partes.append(opcionales)
+        resultado = partes[0]
+        for parte in partes[1:]:
+            resultado = ('cat', resultado, parte)
+        return resultado
+    
+    return plegar(ast, combinar)
+
+LARGO_MAXIMO_LITERAL = 64
+
+def _maximales(literales):
+    """Quita los vacíos y los que están contenidos en otro literal del conjunto"""
+    literales = {literal[:LARGO_MAXIMO_LITERAL] for literal in literales if literal}
+    return frozenset(literal for literal in literales
+                     if not any(literal != otro and literal in otro for otro in literales))
+
+def _prefijo_comun(a, b):
+    i = 0
+    while i < min(len(a), len(b)) and a[i] == b[i]:
+        i += 1
+    return a[:i]
+
+def literales_requeridos(ast):
+    """
+    Literales que aparecen en toda cadena que coincide con el AST (ordenados del
+    más largo al más corto). Para cada nodo se calcula (exacto, prefijo, sufijo,
+    requeridos): la única cadena que acepta (o None), el prefijo y el sufijo
+    que comparten todas sus cadenas y los factores que todas contienen. En una
+    concatenación, el sufijo de la izquierda seguido del prefijo de la derecha
+    también es un factor obligatorio.
+    """
+    def combinar(nodo, sub):
+        tipo = nodo[0]
+        if tipo == 'eps':
+            return ('', '', '', frozenset())
+        if tipo in ('lit', 'clase'):
+            if tipo == 'clase' and nodo[1] != ((nodo[1][0][0], nodo[1][0][0]),):
+                return (None, '', '', frozenset())
+            c = nodo[1] if tipo == 'lit' else nodo[1][0][0]
+            return (c, c, c, frozenset([c]))
+        if tipo == 'cat':
+            (exacto_a, prefijo_a, sufijo_a, requeridos_a), (exacto_b, prefijo_b, sufijo_b, requeridos_b) = sub
+            exacto = exacto_a + exacto_b if exacto_a is not None and exacto_b is not None else None
+            if exacto is not None and len(exacto) > LARGO_MAXIMO_LITERAL:
+                exacto = None
+            prefijo = exacto_a + prefijo_b if exacto_a is not None else prefijo_a
+            sufijo = sufijo_a + exacto_b if exacto_b is not None else sufijo_b
+            requeridos = requeridos_a | requeridos_b | {sufijo_a + prefijo_b, exacto or ''}
+            return (exacto, prefijo[:LARGO_MAXIMO_LITERAL], sufijo[-LARGO_MAXIMO_LITERAL:], _maximales(requeridos))
+        if tipo == 'union':
+            (exacto_a, prefijo_a, sufijo_a, requeridos_a), (exacto_b, prefijo_b, sufijo_b, requeridos_b) = sub
+            prefijo = _prefijo_comun(prefijo_a, prefijo_b)
+            sufijo = _prefijo_comun(sufijo_a[::-1], sufijo_b[::-1])[::-1]
+            # Un factor obligatorio en un lado lo es en la unión si está dentro de uno del otro lado
+            requeridos = {x for x in requeridos_a if any(x in y for y in requeridos_b)}
+            requeridos |= {x for x in requeridos_b if any(x in y for y in requeridos_a)}
+            return (exacto_a if exacto_a == exacto_b else None, prefijo, sufijo,
+                    _maximales(requeridos | {prefijo, sufijo}))
+        if tipo in ('estrella', 'opcional'):
+            return (None, '', '', frozenset())
+        if tipo == 'mas':
+            _, prefijo, sufijo, requeridos = sub[0]
+            return (None, prefijo, sufijo, requeridos)
+        if tipo == 'rep':
+            exacto, prefijo, sufijo, requeridos = sub[0]
+            _, _, minimo, maximo = nodo
+            if minimo == 0:
+                return (None, '', '', frozenset())
+            if minimo > 1:
+                requeridos = _maximales(requeridos | {sufijo + prefijo})
+            if exacto is not None and minimo == maximo and len(exacto) * minimo <= LARGO_MAXIMO_LITERAL:
+                return (exacto * minimo, exacto * minimo, exacto * minimo, _maximales(requeridos | {exacto * minimo}))
+            return (None, prefijo, sufijo, requeridos)
+        raise ValueError(f"Nodo desconocido: {tipo}")
+    
+    _, _, _, requeridos = plegar(ast, combinar)
+    return sorted(requeridos, key=lambda literal: (-len(literal), literal))
+
+def longitud_maxima(ast):
+    """Largo máximo de una cadena que coincide con el AST, o None si no tiene tope"""
+    def combinar(nodo, sub):
+        tipo = nodo[0]
+        if tipo == 'eps':
+            return 0
+        if tipo in ('lit', 'clase'):
+            return 1
+        if None in sub or tipo in ('estrella', 'mas'):
+            return None
+        if tipo == 'cat':
+            return sub[0] + sub[1]
+        if tipo == 'union':
+            return max(sub)
+        if tipo == 'opcional':
+            return sub[0]
+        if tipo == 'rep':
+            return None if nodo[3] is None else sub[0] * nodo[3]
+        raise ValueError(f"Nodo desconocido: {tipo}")
+    
+    return plegar(ast, combinar)
+
+def _verificar_parentesis(tokens):
+    profundidad = 0
+    for token in tokens:
+        if token == ('grupo', '('):
+            profundidad += 1
+        elif token == ('grupo', ')'):
+            profundidad -= 1
+            if profundidad < 0:
+                raise ValueError("Paréntesis de cierre sin apertura")
+    if profundidad:
+        raise ValueError("Paréntesis sin cerrar")
+
+def a_postfix(patron):
+    """Tokeniza el patrón, inserta concatenaciones y lo pasa a postfix (Ejercicio3)"""
+    tokens = ejercicio3.tokenize(patron)
+    _verificar_parentesis(tokens)
+    return ejercicio3.shunting_yard_tokens(ejercicio3.insert_concatenation_tokens(tokens))
+
+def postfix_a_ast(postfix):
+    """Arma el AST a partir de la lista de tokens en postfix"""
+    pila = []
+    for tipo, valor in postfix:
+        if tipo == 'operador' and valor in OPERADORES_UNARIOS:
+            if not pila:
+                raise ValueError(f"Operador '{valor}' sin operando")
+            pila.append((OPERADORES_UNARIOS[valor], pila.pop()))
+        elif tipo == 'repeticion':
+            if not pila:
+                raise ValueError(f"Repetición '{valor}' sin operando")
+            pila.append(repeticion(pila.pop(), *parsear_repeticion(valor)))
+        elif tipo == 'operador':
+            if len(pila) < 2:
+                raise ValueError(f"Operador '{valor}' sin suficientes operandos")
+            derecho = pila.pop()
+            izquierdo = pila.pop()
+            pila.append((OPERADORES_BINARIOS[valor], izquierdo, derecho))
+        elif tipo == 'clase':
+            pila.append(('clase', parsear_clase(valor)))
+        elif tipo == 'escapado':
+            pila.append(('lit', ESCAPES.get(valor, valor)))
+        elif tipo == 'literal':
+            pila.append(('eps',) if valor == 'ε' else ('lit', valor))
+        else:
+            raise ValueError(f"Token inesperado en postfix: {valor}")
+    if len(pila) != 1:
+        raise ValueError("Expresión mal formada")
+    return pila[0]
+
+def parsear(patron):
+    """Devuelve el AST del patrón"""
+    if not patron:
+        return ('eps',)
+    return postfix_a_ast(a_postfix(patron))
+
+def caracteres_de_clase(rangos):
+    return [chr(codigo) for desde, hasta in rangos for codigo in range(ord(desde), ord(hasta) + 1)]
+
+def construir_afn(ast, constructor):
+    """Construye con Thompson el AFN del AST (las repeticiones se expanden antes)"""
+    def combinar(nodo, sub):
+        tipo = nodo[0]
+        if tipo == 'eps':
+            return constructor.epsilon()
+        if tipo == 'lit':
+            return constructor.caracter(nodo[1])
+        if tipo == 'clase':
+            return constructor.rango_caracteres(nodo[1])
+        if tipo == 'cat':
+            return constructor.concatenacion(sub[0], sub[1])
+        if tipo == 'union':
+            return constructor.union(sub[0], sub[1])
+        if tipo == 'estrella':
+            return constructor.estrella(sub[0])
+        if tipo == 'mas':
+            return constructor.mas(sub[0])
+        if tipo == 'opcional':
+            return constructor.opcional(sub[0])
+        raise ValueError(f"Nodo desconocido: {tipo}")
+    
+    return constructor.finalizar(plegar(expandir_repeticiones(ast), combinar))
+
+MOTORES = ('thompson', 'glushkov', 'contadores', 'directo', 'derivadas')
+
+class PatronCompilado:
+    """
+    Resultado de compilar un patrón. Con el motor 'thompson' guarda el AFN de
+    Thompson y el AFD mínimo; con 'directo' y 'derivadas', solo el AFD mínimo (no
+    hay AFN); con los demás motores, el simulador del motor. Si la construcción
+    del AFD pasó un límite, limite es el LimiteExcedido y en lugar del AFD hay
+    un simulador (AFD perezoso sobre el AFN).
+    """
+    def __init__(self, patron, postfix, ast, afn=None, afd=None, motor='thompson', simulador=None,
+                 limite=None):
+        self.patron = patron
+        self.postfix = postfix
+        self.ast = ast
+        self.afn = afn
+        self.afd = afd
+        self.motor = motor
+        self.simulador = simulador
+        self.limite = limite
+        self._buscador = None
+        # Literales que toda coincidencia contiene; sin ellos no hay prefiltro
+        literales = literales_requeridos(ast)
+        self.prefiltro = Prefiltro(literales, longitud_maxima(ast)) if literales else None
+    
+    def acepta(self, cadena):
+        """Indica si la cadena completa coincide con el patrón"""
+        if self.prefiltro is not None and not self.prefiltro.puede_coincidir(cadena):
+            return False
+        if self.afd is not None:
+            return self.afd.acepta(cadena)
+        return self.simulador.acepta(cadena)
+    
+    def buscador(self):
+        """Buscador sin anclar del patrón (se crea la primera vez que se busca)"""
+        if self._buscador is None:
+            from busqueda import Buscador
+            self._buscador = Buscador(self.ast, prefiltro=self.prefiltro)
+        return self._buscador
+    
+    def buscar(self, texto, inicio=0):
+        """Primera coincidencia (la más a la izquierda y más larga) dentro del texto, o None"""
+        return self.buscador().buscar(texto, inicio)
+    
+    def buscar_todas(self, texto, inicio=0):
+        """Itera las coincidencias dentro del texto, sin solaparse"""
+        return self.buscador().buscar_todas(texto, inicio)
+    
+    def mostrar(self):
+        print(f"Patrón: {self.patron!r}  (motor: {self.motor})")
+        print("Postfix:", " ".join(valor for _, valor in self.postfix))
+        if self.afn is not None and self.afd is not None:
+            print(f"Estados AFN: {len(self.afn.estados)}  Estados AFD mínimo: {self.afd.num_estados}")
+        elif self.afn is not None:
+            print(f"Estados AFN: {len(self.afn.estados)}")
+        elif self.afd is not None:
+            print(f"Estados AFD mínimo: {self.afd.num_estados}")
+        if self.limite is not None:
+            print(f"{self.limite}: se usa el AFD perezoso")
+        if self.prefiltro is not None:
+            print(f"Literales obligatorios: {self.prefiltro.literales}")
+
+def afd_de(objeto):
+    """
+    AFD de un PatronCompilado (un AFD se devuelve tal cual). Lanza ValueError si
+    el patrón no tiene AFD: pasó un límite o su motor no construye uno.
+    """
+    if not hasattr(objeto, 'afd'):
+        return objeto
+    if objeto.afd is None:
+        limite = getattr(objeto, 'limite', None)
+        motivo = f"{limite}" if limite is not None else f"el motor {getattr(objeto, 'motor', None)!r} no construye AFD"
+        raise ValueError(f"El patrón {getattr(objeto, 'patron', '')!r} no tiene AFD ({motivo}); use su método acepta()")
+    return objeto.afd
+
+def _compilar_perezoso(patron, postfix, ast, motor, error, afn=None, max_estados=None):
+    """
+    El AFD completo es demasiado grande: se construye solo lo que visita cada
+    cadena (AFD perezoso sobre el AFN de Thompson), con la caché acotada al
+    mismo número de estados
+    """
+    from afd_perezoso import AFDPerezoso
+    if afn is None:
+        afn = construir_afn(ast, ConstructorThompson(incremental=True))
+    simulador = AFDPerezoso(afn) if max_estados is None else AFDPerezoso(afn, max_estados=max_estados)
+    return PatronCompilado(patron, postfix, ast, afn, motor=motor, simulador=simulador, limite=error)
+
+def _compilar_thompson(patron, postfix, ast, limites):
+    afn = construir_afn(ast, ConstructorThompson(incremental=True))
+    conversor = ConversorAFD(afn, bitsets=True, clases=True, internar=True, **limites)
+    try:
+        conversor.convertir()
+    except LimiteExcedido as error:
+        return _compilar_perezoso(patron, postfix, ast, 'thompson', error, afn, limites['max_estados'])
+    return PatronCompilado(patron, postfix, ast, afn, minimizar(conversor))
+
+@lru_cache(maxsize=TAMANO_CACHE)
+def compilar(patron, motor='thompson', max_estados=None, max_transiciones=None, max_segundos=None):
+    """
+    Compila el patrón con el motor indicado: 'thompson' (AFN de Thompson y AFD
+    por subconjuntos sobre clases de caracteres + Hopcroft), 'glushkov' (simulación bit-paralela del
+    autómata de posiciones), 'contadores' (posiciones con contadores, sin
+    expandir las repeticiones {m,n}; conviene cuando m o n son grandes) o
+    'directo' (AFD construido desde el árbol con followpos + Hopcroft) o
+    'derivadas' (AFD con derivadas de Brzozowski memoizadas + Hopcroft). Los
+    resultados quedan en una caché LRU por (patrón, motor, límites), así que no
+    deben modificarse.
+    
+    Con 'thompson', 'directo' y 'derivadas' se puede limitar la construcción
+    del AFD (estados, transiciones o segundos); si se pasa un límite, el patrón
+    queda con un AFD perezoso sobre el AFN de Thompson (que a su vez pasa a
+    simular el AFN si su caché no alcanza) y limite indica cuál se pasó.
+    'glushkov' y 'contadores' no construyen un AFD (simulan el autómata de
+    posiciones, de tamaño lineal en el patrón), así que no tienen qué limitar.
+    """
+    if motor not in MOTORES:
+        raise ValueError(f"Motor desconocido: {motor}. Opciones: {', '.join(MOTORES)}")
+    postfix = a_postfix(patron) if patron else []
+    ast = postfix_a_ast(postfix) if patron else ('eps',)
+    if motor == 'glushkov':
+        from glushkov import MotorGlushkov
+        return PatronCompilado(patron, postfix, ast, motor=motor,
+                               simulador=MotorGlushkov(expandir_repeticiones(ast)))
+    if motor == 'contadores':
+        from contadores import MotorContadores
+        return PatronCompilado(patron, postfix, ast, motor=motor, simulador=MotorContadores(ast))
+    limites = {'max_estados': max_estados, 'max_transiciones': max_transiciones, 'max_segundos': max_segundos}
+    if motor == 'directo':
+        from directo import afd_directo
+        try:
+            afd = afd_directo(ast, **limites)
+        except LimiteExcedido as error:
+            return _compilar_perezoso(patron, postfix, ast, motor, error, max_estados=max_estados)
+        return PatronCompilado(patron, postfix, ast, afd=minimizar(afd), motor=motor)
+    if motor == 'derivadas':
+        from derivadas import ConversorDerivadas
+        conversor = ConversorDerivadas(ast, **limites)
+        try:
+            conversor.convertir()
+        except LimiteExcedido as error:
+            return _compilar_perezoso(patron, postfix, ast, motor, error, max_estados=max_estados)
+        return PatronCompilado(patron, postfix, ast, afd=minimizar(conversor), motor=motor)
+    return _compilar_thompson(patron, postfix, ast, limites)
+
+# Punto de entrada con el nombre habitual de las bibliotecas de regex
+compile = compilar
+
+def main():
+    print("=== COMPILADOR DE EXPRESIONES REGULARES ===")
+    pruebas = {
+        "(a|t)c": ["ac", "tc", "c"],
+        "(a|b)*abb(a|b)*": ["abb", "babba", "ab"],
+        "0?(1?)?0*": ["", "01000", "110"],
+        "if\\([ae]+\\)\\{[ei]+\\}(\\n(else\\{[jl]+\\}))?": ["if(a){e}", "if(ae){ie}\nelse{jl}", "if(){e}"],
+        "[ae03]+@[ae03]+.(com|net|org)(.(gt|cr|co))?": ["a0@e3.com", "ae@03.org.gt", "a@b.com"],
+        "[0-9]{3}-[0-9]{2,4}(x[0-9]{1,})?": ["502-1234", "502-12x9", "50-1234"],
+    }
+    for patron, cadenas in pruebas.items():
+        compilado = compilar(patron)
+        print()
+        compilado.mostrar()
+        for cadena in cadenas:
+            print(f"  {cadena!r}: {'acepta' if compilado.acepta(cadena) else 'rechaza'}")
+    print(f"\nCaché: {compilar.cache_info()}")
+
+if __name__ == "__main__":
+    main()
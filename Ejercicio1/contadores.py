@@ -0,0 +1,167 @@
+from compilador import plegar
+
+class PosicionesContadas:
+    """
+    Posiciones de Glushkov sin expandir las repeticiones a{m,n}: el cuerpo de cada
+    repetición aparece una sola vez y un contador indica en qué vuelta se está.
+    La posición i usa el número i + 1; la 0 es el estado inicial. Cada posición
+    guarda la pila de repeticiones que la contienen (de afuera hacia adentro) y
+    sus aristas siguientes, cada una con las acciones sobre los contadores.
+    """
+    def __init__(self, ast):
+        self.hojas = []
+        self.repeticiones = []
+        # Durante el recorrido las pilas se llenan de adentro hacia afuera
+        pilas = [[]]
+        aristas = [[]]
+
+        def enlazar(origenes, destinos, repeticion=None):
+            # Se anota cuántas repeticiones de cada extremo hay por debajo del nodo
+            # que crea la arista: son las que se cierran (origen) y se abren (destino)
+            for p in origenes:
+                for q in destinos:
+                    aristas[p].append((q, len(pilas[p]), len(pilas[q]), repeticion))
+
+        def combinar(nodo, sub):
+            tipo = nodo[0]
+            if tipo == 'eps':
+                return (True, [], [], len(self.hojas) + 1)
+            if tipo in ('lit', 'clase'):
+                self.hojas.append(nodo)
+                pilas.append([])
+                aristas.append([])
+                posicion = len(self.hojas)
+                return (False, [posicion], [posicion], posicion)
+            if tipo == 'cat':
+                (anulable_a, primeros_a, ultimos_a, desde), (anulable_b, primeros_b, ultimos_b, _) = sub
+                enlazar(ultimos_a, primeros_b)
+                primeros = primeros_a + primeros_b if anulable_a else primeros_a
+                ultimos = ultimos_a + ultimos_b if anulable_b else ultimos_b
+                return (anulable_a and anulable_b, primeros, ultimos, desde)
+            if tipo == 'union':
+                (anulable_a, primeros_a, ultimos_a, desde), (anulable_b, primeros_b, ultimos_b, _) = sub
+                return (anulable_a or anulable_b, primeros_a + primeros_b, ultimos_a + ultimos_b, desde)
+            if tipo in ('estrella', 'mas'):
+                anulable, primeros, ultimos, desde = sub[0]
+                enlazar(ultimos, primeros)
+                return (anulable or tipo == 'estrella', primeros, ultimos, desde)
+            if tipo == 'opcional':
+                _, primeros, ultimos, desde = sub[0]
+                return (True, primeros, ultimos, desde)
+            if tipo == 'rep':
+                anulable, primeros, ultimos, desde = sub[0]
+                _, _, minimo, maximo = nodo
+                indice = len(self.repeticiones)
+                # Si el cuerpo es anulable, las vueltas que faltan pueden ser vacías
+                self.repeticiones.append((0 if anulable else minimo, maximo))
+                if maximo is None or maximo > 1:
+                    enlazar(ultimos, primeros, indice)
+                for posicion in range(desde, len(self.hojas) + 1):
+                    pilas[posicion].append(indice)
+                return (anulable or minimo == 0, primeros, ultimos, desde)
+            raise ValueError(f"Nodo no soportado por el análisis de posiciones: {tipo}")
+
+        self.anulable, primeros, self.ultimos, _ = plegar(ast, combinar)
+        enlazar([0], primeros)
+        self.pilas = [tuple(reversed(pila)) for pila in pilas]
+        self.aristas = [self._compilar_aristas(p, lista) for p, lista in enumerate(aristas)]
+        self.salidas_finales = [self._salidas(p, 0) for p in range(len(pilas))]
+
+    @property
+    def num_posiciones(self):
+        return len(self.hojas)
+
+    def _salidas(self, p, desde):
+        """Contadores de p (desde ese nivel) que deben llegar a su mínimo para salir"""
+        return tuple((nivel, self.repeticiones[r][0]) for nivel, r in enumerate(self.pilas[p])
+                     if nivel >= desde and self.repeticiones[r][0] > 1)
+
+    def _compilar_aristas(self, p, lista):
+        """
+        Pasa cada arista a (q, nivel, incremento, salidas, relleno): se conservan los
+        contadores anteriores a nivel, se incrementa el del nivel si corresponde, se
+        revisan las salidas y se agregan unos por cada repetición que se abre
+        """
+        compiladas = []
+        for q, cerradas, abiertas, repeticion in lista:
+            nivel = len(self.pilas[p]) - cerradas
+            incremento = None
+            if repeticion is not None:
+                # El contador de la repetición que da la vuelta es el último de los que quedan
+                nivel -= 1
+                incremento = self.repeticiones[repeticion]
+            conservados = nivel + (incremento is not None)
+            salidas = self._salidas(p, conservados)
+            relleno = (1,) * (len(self.pilas[q]) - conservados)
+            compiladas.append((q, nivel, incremento, salidas, relleno))
+        return compiladas
+
+    def coincide(self, posicion, c):
+        """Indica si el caracter c coincide con la hoja de la posición (base 1)"""
+        hoja = self.hojas[posicion - 1]
+        if hoja[0] == 'lit':
+            return hoja[1] == c
+        return any(desde <= c <= hasta for desde, hasta in hoja[1])
+
+class MotorContadores:
+    """
+    Simula el autómata de posiciones con contadores. Una configuración es
+    (posición, contadores); el número de posiciones no crece con m ni con n,
+    así que compilar a{1000} cuesta lo mismo que compilar a. Los contadores de
+    las repeticiones sin tope se saturan en el mínimo.
+    """
+    def __init__(self, ast):
+        self.posiciones = PosicionesContadas(ast)
+        self.mascaras = {}
+
+    def mascara(self, c):
+        mascara = self.mascaras.get(c)
+        if mascara is None:
+            mascara = 0
+            for posicion in range(1, self.posiciones.num_posiciones + 1):
+                if self.posiciones.coincide(posicion, c):
+                    mascara |= 1 << posicion
+            self.mascaras[c] = mascara
+        return mascara
+
+    def _es_final(self, posicion, contadores):
+        if posicion == 0:
+            return self.posiciones.anulable
+        if posicion not in self.posiciones.ultimos:
+            return False
+        return all(contadores[nivel] >= minimo for nivel, minimo in self.posiciones.salidas_finales[posicion])
+
+    def paso(self, configuraciones, c):
+        """Configuraciones alcanzables después de leer c"""
+        aristas = self.posiciones.aristas
+        mascara = self.mascaras.get(c)
+        if mascara is None:
+            mascara = self.mascara(c)
+        siguientes = set()
+        for p, contadores in configuraciones:
+            for q, nivel, incremento, salidas, relleno in aristas[p]:
+                if not (mascara >> q) & 1:
+                    continue
+                if salidas and any(contadores[n] < minimo for n, minimo in salidas):
+                    continue
+                if incremento is None:
+                    siguientes.add((q, contadores[:nivel] + relleno))
+                    continue
+                minimo, maximo = incremento
+                vuelta = contadores[nivel]
+                if maximo is None:
+                    vuelta = min(vuelta + 1, max(minimo, 1))
+                elif vuelta < maximo:
+                    vuelta += 1
+                else:
+                    continue
+                siguientes.add((q, contadores[:nivel] + (vuelta,) + relleno))
+        return siguientes
+
+    def acepta(self, cadena):
+        configuraciones = {(0, ())}
+        for c in cadena:
+            configuraciones = self.paso(configuraciones, c)
+            if not configuraciones:
+                return False
+        return any(self._es_final(p, contadores) for p, contadores in configuraciones)
@@ -0,0 +1,381 @@
+import time
+from collections import deque
+
+from compilador import parsear, plegar
+from main import AFD, Limites, ParticionAlfabeto, Rango
+
+VACIO = 0
+EPSILON = 1
+
+def _unir_rangos(rangos):
+    """Ordena los rangos (desde, hasta) y une los que se solapan o son contiguos"""
+    rangos = sorted(rangos)
+    unidos = [rangos[0]]
+    for desde, hasta in rangos[1:]:
+        ultimo_desde, ultimo_hasta = unidos[-1]
+        if ord(desde) <= ord(ultimo_hasta) + 1:
+            unidos[-1] = (ultimo_desde, max(ultimo_hasta, hasta))
+        else:
+            unidos.append((desde, hasta))
+    return tuple(unidos)
+
+class Terminos:
+    """
+    Expresiones regulares normalizadas y con identidad única (hash-consing): cada
+    término es un entero y nodos[t] es su tupla, con los hijos también como
+    enteros. Los constructores simplifican al crear, de modo que dos términos
+    iguales salvo por asociatividad, conmutatividad e idempotencia de la unión
+    (y las identidades de ∅ y ε) reciben el mismo número; con eso el número de
+    derivadas distintas es finito.
+        ('vacio',)  ('eps',)  ('conjunto', rangos)  ('cat', a, b)
+        ('union', (t1, t2, ...))  ('estrella', a)  ('rep', a, m, n)
+    """
+    def __init__(self):
+        self.nodos = []
+        self.anulables = []
+        self.ids = {}
+        self._nuevo(('vacio',))
+        self._nuevo(('eps',))
+    
+    def _nuevo(self, nodo):
+        termino = self.ids.get(nodo)
+        if termino is None:
+            termino = self.ids[nodo] = len(self.nodos)
+            self.nodos.append(nodo)
+            self.anulables.append(self._anulable(nodo))
+        return termino
+    
+    def _anulable(self, nodo):
+        tipo = nodo[0]
+        if tipo in ('eps', 'estrella'):
+            return True
+        if tipo in ('vacio', 'conjunto'):
+            return False
+        if tipo == 'cat':
+            return self.anulables[nodo[1]] and self.anulables[nodo[2]]
+        if tipo == 'union':
+            return any(self.anulables[t] for t in nodo[1])
+        return nodo[2] == 0
+    
+    def conjunto(self, rangos):
+        return self._nuevo(('conjunto', _unir_rangos(rangos)))
+    
+    def factores(self, t):
+        """Factores de la concatenación t, de izquierda a derecha (solo t si no es una)"""
+        factores = []
+        nodo = self.nodos[t]
+        while nodo[0] == 'cat':
+            factores.append(nodo[1])
+            t = nodo[2]
+            nodo = self.nodos[t]
+        factores.append(t)
+        return factores
+    
+    def cat(self, a, b):
+        if a == VACIO or b == VACIO:
+            return VACIO
+        if a == EPSILON:
+            return b
+        if b == EPSILON:
+            return a
+        if self.nodos[a][0] != 'cat':
+            return self._nuevo(('cat', a, b))
+        # (r·s)·t = r·(s·t): las concatenaciones quedan asociadas a la derecha. Los
+        # factores de a ya están normalizados (no son ∅, ε ni concatenaciones)
+        resultado = b
+        for factor in reversed(self.factores(a)):
+            resultado = self._nuevo(('cat', factor, resultado))
+        return resultado
+    
+    def concatenar(self, terminos):
+        """Concatenación de una lista de términos, armada de derecha a izquierda"""
+        resultado = EPSILON
+        for termino in reversed(terminos):
+            resultado = self.cat(termino, resultado)
+        return resultado
+    
+    def union(self, *terminos):
+        miembros = set()
+        rangos = []
+        pendientes = list(terminos)
+        while pendientes:
+            t = pendientes.pop()
+            nodo = self.nodos[t]
+            if nodo[0] == 'union':
+                pendientes.extend(nodo[1])
+            elif nodo[0] == 'conjunto':
+                rangos.extend(nodo[1])
+            elif t != VACIO:
+                miembros.add(t)
+        # Los conjuntos de caracteres de una unión se juntan en uno solo
+        if rangos:
+            miembros.add(self.conjunto(rangos))
+        if not miembros:
+            return VACIO
+        if len(miembros) == 1:
+            return miembros.pop()
+        return self._nuevo(('union', tuple(sorted(miembros))))
+    
+    def estrella(self, a):
+        if a in (VACIO, EPSILON):
+            return EPSILON
+        if self.nodos[a][0] == 'estrella':
+            return a
+        return self._nuevo(('estrella', a))
+    
+    def rep(self, a, minimo, maximo):
+        # Si a acepta la cadena vacía, las vueltas obligatorias pueden ser vacías
+        if self.anulables[a]:
+            minimo = 0
+        if maximo == 0 or a == EPSILON:
+            return EPSILON
+        if a == VACIO:
+            return VACIO if minimo > 0 else EPSILON
+        if (minimo, maximo) == (1, 1):
+            return a
+        if (minimo, maximo) == (0, None):
+            return self.estrella(a)
+        return self._nuevo(('rep', a, minimo, maximo))
+    
+    def desde_ast(self, ast):
+        # Las cadenas de concatenaciones del AST (anidadas a la izquierda) se juntan
+        # primero en una lista de factores y se arman una sola vez al usarlas, para
+        # no reasociar la cadena entera en cada concatenación
+        def termino(valor):
+            return self.concatenar(valor) if isinstance(valor, list) else valor
+        
+        def combinar(nodo, sub):
+            tipo = nodo[0]
+            if tipo == 'cat':
+                izquierda = sub[0] if isinstance(sub[0], list) else [sub[0]]
+                izquierda.extend(sub[1] if isinstance(sub[1], list) else [sub[1]])
+                return izquierda
+            sub = [termino(valor) for valor in sub]
+            if tipo == 'eps':
+                return EPSILON
+            if tipo == 'lit':
+                return self.conjunto([(nodo[1], nodo[1])])
+            if tipo == 'clase':
+                return self.conjunto(nodo[1])
+            if tipo == 'union':
+                return self.union(sub[0], sub[1])
+            if tipo == 'estrella':
+                return self.estrella(sub[0])
+            if tipo == 'mas':
+                return self.cat(sub[0], self.estrella(sub[0]))
+            if tipo == 'opcional':
+                return self.union(EPSILON, sub[0])
+            if tipo == 'rep':
+                return self.rep(sub[0], nodo[2], nodo[3])
+            raise ValueError(f"Nodo desconocido: {tipo}")
+        
+        return termino(plegar(ast, combinar))
+    
+    def _plegar(self, t, hijos, combinar, hechos):
+        """
+        Evalúa combinar(t, hechos) en postorden sin recursión: antes de cada
+        término se evalúan los hijos(término) que no estén ya en hechos
+        """
+        pila = [t]
+        while pila:
+            actual = pila[-1]
+            if actual in hechos:
+                pila.pop()
+                continue
+            pendientes = [hijo for hijo in hijos(actual) if hijo not in hechos]
+            if pendientes:
+                pila.extend(pendientes)
+                continue
+            pila.pop()
+            hechos[actual] = combinar(actual, hechos)
+        return hechos[t]
+    
+    def derivada(self, t, c, hechas=None):
+        """
+        Derivada de Brzozowski del término t respecto del caracter c. hechas
+        (término -> derivada respecto de c) sirve de memo entre llamadas.
+        """
+        nodos = self.nodos
+        anulables = self.anulables
+        
+        def hijos(termino):
+            nodo = nodos[termino]
+            tipo = nodo[0]
+            if tipo == 'cat':
+                # La derivada de b solo hace falta si a acepta la cadena vacía
+                return (nodo[1], nodo[2]) if anulables[nodo[1]] else (nodo[1],)
+            if tipo == 'union':
+                return nodo[1]
+            if tipo in ('estrella', 'rep'):
+                return (nodo[1],)
+            return ()
+        
+        def combinar(termino, d):
+            nodo = nodos[termino]
+            tipo = nodo[0]
+            if tipo in ('vacio', 'eps'):
+                return VACIO
+            if tipo == 'conjunto':
+                return EPSILON if any(desde <= c <= hasta for desde, hasta in nodo[1]) else VACIO
+            if tipo == 'cat':
+                _, a, b = nodo
+                primera = self.cat(d[a], b)
+                return self.union(primera, d[b]) if anulables[a] else primera
+            if tipo == 'union':
+                return self.union(*(d[miembro] for miembro in nodo[1]))
+            if tipo == 'estrella':
+                return self.cat(d[nodo[1]], termino)
+            _, a, minimo, maximo = nodo
+            resto = self.rep(a, max(minimo - 1, 0), None if maximo is None else maximo - 1)
+            return self.cat(d[a], resto)
+        
+        return self._plegar(t, hijos, combinar, {} if hechas is None else hechas)
+    
+    def texto(self, t):
+        """Expresión del término en la sintaxis de los patrones"""
+        nodos = self.nodos
+        
+        def hijos(termino):
+            nodo = nodos[termino]
+            if nodo[0] == 'union':
+                return nodo[1]
+            if nodo[0] in ('cat', 'estrella', 'rep'):
+                return nodo[1:3] if nodo[0] == 'cat' else (nodo[1],)
+            return ()
+        
+        def agrupado(termino, textos, *tipos):
+            return f"({textos[termino]})" if nodos[termino][0] in tipos else textos[termino]
+        
+        def combinar(termino, textos):
+            nodo = nodos[termino]
+            tipo = nodo[0]
+            if tipo == 'vacio':
+                return '∅'
+            if tipo == 'eps':
+                return 'ε'
+            if tipo == 'conjunto':
+                if len(nodo[1]) == 1 and nodo[1][0][0] == nodo[1][0][1]:
+                    return nodo[1][0][0]
+                return '[' + ''.join(d if d == h else f"{d}-{h}" for d, h in nodo[1]) + ']'
+            if tipo == 'cat':
+                return agrupado(nodo[1], textos, 'union') + agrupado(nodo[2], textos, 'union')
+            if tipo == 'union':
+                return '|'.join(textos[miembro] for miembro in nodo[1])
+            sufijo = '*' if tipo == 'estrella' else (
+                f"{{{nodo[2]}}}" if nodo[2] == nodo[3] else f"{{{nodo[2]},{'' if nodo[3] is None else nodo[3]}}}")
+            return agrupado(nodo[1], textos, 'union', 'cat') + sufijo
+        
+        return self._plegar(t, hijos, combinar, {})
+
+class ConversorDerivadas:
+    """
+    Construye el AFD con derivadas de Brzozowski: cada estado es un término
+    normalizado y su transición con la clase k es la derivada respecto de un
+    caracter de k (todos los de la clase dan la misma). Un estado es final si su
+    término acepta la cadena vacía. Las derivadas se guardan en una tabla por
+    clase (memo[clase]: término -> derivada, también la de los subtérminos),
+    que también usa acepta() para reconocer bajo demanda
+    sin construir el AFD completo. Tiene la misma interfaz de resultados que
+    ConversorAFD (estados_afd, transiciones_afd, a_afd, mostrar_afd...), y los
+    mismos límites (max_estados, max_transiciones, max_segundos).
+    """
+    def __init__(self, ast, max_estados=None, max_transiciones=None, max_segundos=None):
+        self.terminos = Terminos()
+        self.inicial = self.terminos.desde_ast(ast)
+        etiquetas = set()
+        for nodo in self.terminos.nodos:
+            if nodo[0] == 'conjunto':
+                etiquetas.update(d if d == h else Rango(d, h) for d, h in nodo[1])
+        self.particion = ParticionAlfabeto(etiquetas)
+        # Un caracter representante por clase
+        self.representantes = [None] * self.particion.num_clases
+        for desde, _, clase in self.particion.intervalos():
+            if self.representantes[clase] is None:
+                self.representantes[clase] = desde
+        self.memo = [{} for _ in range(self.particion.num_clases)]
+        self.estados_afd = {}
+        self.transiciones_afd = {}
+        self.estado_inicial_afd = None
+        self.estados_finales_afd = set()
+        self.limites = Limites(max_estados, max_transiciones, max_segundos)
+    
+    def derivada(self, t, clase):
+        memo = self.memo[clase]
+        derivada = memo.get(t)
+        if derivada is None:
+            derivada = self.terminos.derivada(t, self.representantes[clase], memo)
+        return derivada
+    
+    def acepta(self, cadena):
+        """Reconoce derivando bajo demanda (solo se calculan las derivadas que se usan)"""
+        t = self.inicial
+        clase = self.particion.clase
+        for c in cadena:
+            k = clase(c)
+            if k < 0:
+                return False
+            t = self.derivada(t, k)
+            if t == VACIO:
+                return False
+        return self.terminos.anulables[t]
+    
+    def convertir(self):
+        """Construye el AFD completo en orden BFS a partir del término inicial"""
+        self.estado_inicial_afd = self.inicial
+        if self.inicial == VACIO:
+            # Lenguaje vacío: un solo estado sin transiciones
+            self.estados_afd[VACIO] = "q0"
+            return
+        self.estados_afd[self.inicial] = "q0"
+        estados_por_procesar = deque([self.inicial])
+        limitado = self.limites.activos
+        inicio = time.perf_counter()
+        num_transiciones = 0
+        while estados_por_procesar:
+            actual = estados_por_procesar.popleft()
+            if self.terminos.anulables[actual]:
+                self.estados_finales_afd.add(actual)
+            transiciones = {}
+            for clase in range(self.particion.num_clases):
+                siguiente = self.derivada(actual, clase)
+                if siguiente == VACIO:
+                    continue
+                if siguiente not in self.estados_afd:
+                    self.estados_afd[siguiente] = f"q{len(self.estados_afd)}"
+                    estados_por_procesar.append(siguiente)
+                transiciones[clase] = siguiente
+            self.transiciones_afd[actual] = transiciones
+            if limitado:
+                num_transiciones += len(transiciones)
+                self.limites.revisar(len(self.estados_afd), num_transiciones, inicio)
+    
+    def a_afd(self):
+        """Devuelve el resultado de convertir() como AFD de estados enteros (q0 -> 0, q1 -> 1, ...)"""
+        ids = {termino: int(nombre[1:]) for termino, nombre in self.estados_afd.items()}
+        transiciones = [None] * len(ids)
+        for termino, estado in ids.items():
+            transiciones[estado] = {clase: ids[destino]
+                                    for clase, destino in self.transiciones_afd.get(termino, {}).items()}
+        finales = {ids[termino] for termino in self.estados_finales_afd}
+        return AFD(list(range(self.particion.num_clases)), transiciones, ids[self.estado_inicial_afd],
+                   finales, self.particion)
+    
+    def mostrar_afd(self):
+        print("\n=== AFD RESULTANTE (DERIVADAS) ===")
+        for termino, nombre in sorted(self.estados_afd.items(), key=lambda x: int(x[1][1:])):
+            final = " (final)" if termino in self.estados_finales_afd else ""
+            print(f"{nombre} = {self.terminos.texto(termino)}{final}")
+        self.a_afd().mostrar()
+
+def main():
+    print("=== AFD POR DERIVADAS DE BRZOZOWSKI ===")
+    from minimizacion import minimizar
+    for expresion in ["(a|t)c", "(a|b)*abb(a|b)*", "0?(1?)?0*", "[0-9]{3}-[0-9]{2,4}"]:
+        print(f"\n=== {expresion} ===")
+        conversor = ConversorDerivadas(parsear(expresion))
+        conversor.convertir()
+        conversor.mostrar_afd()
+        print(f"Estados: {len(conversor.estados_afd)}  Mínimo: {minimizar(conversor).num_estados}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import time
+from collections import deque
+
+from compilador import compilar, expandir_repeticiones, parsear
+from glushkov import Posiciones
+from main import AFD, Limites, ParticionAlfabeto, Rango, _bits
+from minimizacion import equivalentes, minimizar
+
+def etiquetas_de_hoja(hoja):
+    """Etiquetas de transición de una hoja del AST, como las que pone Thompson"""
+    if hoja[0] == 'lit':
+        return [hoja[1]]
+    return [desde if desde == hasta else Rango(desde, hasta) for desde, hasta in hoja[1]]
+
+class ConstructorDirecto:
+    """
+    Construye el AFD directamente desde el AST con anulable, primeros, últimos y
+    siguientes (followpos), sin AFN ni transiciones epsilon. Cada estado del AFD
+    es el conjunto de posiciones que pueden leerse a continuación, como máscara
+    de bits; una posición de fin (el '#' que se agrega al final de la expresión)
+    marca los estados de aceptación. Las transiciones son por clase de caracteres.
+    Con max_estados, max_transiciones o max_segundos, convertir() lanza
+    LimiteExcedido como ConversorAFD.
+    """
+    def __init__(self, ast, max_estados=None, max_transiciones=None, max_segundos=None):
+        self.posiciones = Posiciones(expandir_repeticiones(ast))
+        hojas = self.posiciones.hojas
+        self.fin = 1 << (len(hojas) + 1)
+        self.particion = ParticionAlfabeto(
+            etiqueta for hoja in hojas for etiqueta in etiquetas_de_hoja(hoja))
+        
+        # siguientes[i + 1] de cada posición, con el fin si la posición es de las últimas
+        ultimos = self.posiciones.ultimos
+        self.siguientes = [siguientes | (self.fin if (ultimos >> p) & 1 else 0)
+                           for p, siguientes in enumerate(self.posiciones.siguientes)]
+        self.inicial = self.posiciones.siguientes[0] | (self.fin if self.posiciones.anulable else 0)
+        self.clases_de_posicion = [None] + [
+            sorted({clase for etiqueta in etiquetas_de_hoja(hoja)
+                    for clase in self.particion.clases_de[etiqueta]})
+            for hoja in hojas]
+        self.estados = {}
+        self.limites = Limites(max_estados, max_transiciones, max_segundos)
+    
+    def convertir(self):
+        """Devuelve el AFD (sin minimizar) con los estados numerados en orden BFS"""
+        siguientes = self.siguientes
+        clases_de_posicion = self.clases_de_posicion
+        self.estados = {self.inicial: 0}
+        pendientes = deque([self.inicial])
+        transiciones = []
+        finales = set()
+        limitado = self.limites.activos
+        inicio = time.perf_counter()
+        num_transiciones = 0
+        while pendientes:
+            actual = pendientes.popleft()
+            if actual & self.fin:
+                finales.add(len(transiciones))
+            destinos = {}
+            for p in _bits(actual & ~self.fin):
+                for clase in clases_de_posicion[p]:
+                    destinos[clase] = destinos.get(clase, 0) | siguientes[p]
+            por_clase = {}
+            for clase in sorted(destinos):
+                destino = destinos[clase]
+                if destino not in self.estados:
+                    self.estados[destino] = len(self.estados)
+                    pendientes.append(destino)
+                por_clase[clase] = self.estados[destino]
+            transiciones.append(por_clase)
+            if limitado:
+                num_transiciones += len(por_clase)
+                self.limites.revisar(len(self.estados), num_transiciones, inicio)
+        return AFD(list(range(self.particion.num_clases)), transiciones, 0, finales, self.particion)
+
+def afd_directo(ast, **limites):
+    return ConstructorDirecto(ast, **limites).convertir()
+
+def main():
+    print("=== AFD DIRECTO DESDE EL ÁRBOL (FOLLOWPOS) ===")
+    with open("expresiones.txt", "r", encoding="utf-8") as archivo:
+        patrones = [linea.rstrip("\n") for linea in archivo if linea.strip()]
+    print("AFD directo\tMínimo\tThompson mínimo\tEquivalentes\tExpresión")
+    for patron in patrones:
+        directo = afd_directo(parsear(patron))
+        minimo = minimizar(directo)
+        thompson = compilar(patron).afd
+        print(f"{directo.num_estados}\t\t{minimo.num_estados}\t{thompson.num_estados}\t\t"
+              f"{'sí' if equivalentes(minimo, thompson) else 'NO'}\t\t{patron}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+from compilador import plegar
+from main import _bits
+
+class Posiciones:
+    """
+    Análisis de posiciones (Glushkov) de un AST: cada hoja (literal o clase) es una
+    posición. La posición i usa el bit i + 1; el bit 0 representa el estado inicial.
+    siguientes[0] es first(ast) y siguientes[i + 1] es followpos de la posición i.
+    """
+    def __init__(self, ast):
+        self.hojas = []
+        self.siguientes = [0]
+        
+        def combinar(nodo, sub):
+            tipo = nodo[0]
+            if tipo == 'eps':
+                return (True, 0, 0)
+            if tipo in ('lit', 'clase'):
+                self.hojas.append(nodo)
+                self.siguientes.append(0)
+                bit = 1 << len(self.hojas)
+                return (False, bit, bit)
+            if tipo == 'cat':
+                (anulable_a, primeros_a, ultimos_a), (anulable_b, primeros_b, ultimos_b) = sub
+                for p in _bits(ultimos_a):
+                    self.siguientes[p] |= primeros_b
+                primeros = primeros_a | primeros_b if anulable_a else primeros_a
+                ultimos = ultimos_a | ultimos_b if anulable_b else ultimos_b
+                return (anulable_a and anulable_b, primeros, ultimos)
+            if tipo == 'union':
+                (anulable_a, primeros_a, ultimos_a), (anulable_b, primeros_b, ultimos_b) = sub
+                return (anulable_a or anulable_b, primeros_a | primeros_b, ultimos_a | ultimos_b)
+            if tipo in ('estrella', 'mas'):
+                anulable, primeros, ultimos = sub[0]
+                for p in _bits(ultimos):
+                    self.siguientes[p] |= primeros
+                return (anulable or tipo == 'estrella', primeros, ultimos)
+            if tipo == 'opcional':
+                _, primeros, ultimos = sub[0]
+                return (True, primeros, ultimos)
+            raise ValueError(f"Nodo no soportado por el análisis de posiciones: {tipo}")
+        
+        self.anulable, primeros, self.ultimos = plegar(ast, combinar)
+        self.siguientes[0] = primeros
+    
+    @property
+    def num_posiciones(self):
+        return len(self.hojas)
+    
+    def coincide(self, posicion, c):
+        """Indica si el caracter c coincide con la hoja de la posición (base 0)"""
+        hoja = self.hojas[posicion]
+        if hoja[0] == 'lit':
+            return hoja[1] == c
+        return any(desde <= c <= hasta for desde, hasta in hoja[1])
+
+class MotorGlushkov:
+    """
+    Simulación bit-paralela del autómata de posiciones (Glushkov). El conjunto de
+    posiciones activas es un entero D; por cada caracter se calcula
+    D' = Follow(D) & B[c], donde Follow se obtiene con tablas precalculadas de
+    256 entradas por cada byte de D, así que cada caracter cuesta un número fijo
+    de operaciones para patrones de hasta 64 posiciones.
+    """
+    def __init__(self, ast):
+        self.posiciones = Posiciones(ast)
+        siguientes = self.posiciones.siguientes
+        bits = len(siguientes)
+        self.finales = self.posiciones.ultimos | (1 if self.posiciones.anulable else 0)
+        
+        # tablas[k][b] = OR de siguientes[8k + j] para cada bit j encendido en b
+        self.tablas = []
+        for inicio in range(0, bits, 8):
+            tabla = [0] * 256
+            for b in range(1, 256):
+                bajo = b & -b
+                j = inicio + bajo.bit_length() - 1
+                tabla[b] = tabla[b ^ bajo] | (siguientes[j] if j < bits else 0)
+            self.tablas.append(tabla)
+        
+        # B[c]: máscara de las posiciones que aceptan c (se calcula la primera vez que aparece c)
+        self.mascaras = {}
+    
+    def mascara(self, c):
+        mascara = self.mascaras.get(c)
+        if mascara is None:
+            mascara = 0
+            for i in range(self.posiciones.num_posiciones):
+                if self.posiciones.coincide(i, c):
+                    mascara |= 1 << (i + 1)
+            self.mascaras[c] = mascara
+        return mascara
+    
+    def acepta(self, cadena):
+        tablas = self.tablas
+        mascaras = self.mascaras
+        activos = 1
+        for c in cadena:
+            alcanzables = 0
+            corrimiento = 0
+            for tabla in tablas:
+                alcanzables |= tabla[(activos >> corrimiento) & 0xFF]
+                corrimiento += 8
+            b = mascaras.get(c)
+            if b is None:
+                b = self.mascara(c)
+            activos = alcanzables & b
+            if not activos:
+                return False
+        return bool(activos & self.finales)
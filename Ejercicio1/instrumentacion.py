@@ -0,0 +1,127 @@
+import time
+
+from compilador import construir_afn, parsear
+from main import ConstructorThompson, ConversorAFD
+
+class Estadisticas:
+    """
+    Contadores de la construcción de Thompson y de la conversión a AFD. Se pasan
+    con estadisticas=... a ConstructorThompson o ConversorAFD; sin ellas esas
+    clases no cuentan nada (a lo sumo comprueban una vez por estado del AFD que
+    no hay estadísticas). Si se da un callback, se llama como
+    callback(evento, valor) en cada evento:
+        'operacion'  (nombre, estados del AFN creados)
+        'clausura'   tamaño de la clausura (en estados del AFN)
+        'move'       número de movimientos
+        'estado_afd' (número del estado, conjuntos pendientes en la cola)
+        'conversion' segundos que tardó convertir()
+    """
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.reiniciar()
+    
+    def reiniciar(self):
+        self.operaciones = {}
+        self.estados_por_operacion = {}
+        self.estados_afn = 0
+        self.llamadas_clausura = 0
+        self.suma_clausuras = 0
+        self.clausura_maxima = 0
+        self.llamadas_move = 0
+        self.estados_afd = 0
+        self.pendientes_maximo = 0
+        self.segundos_conversion = 0.0
+        self._inicio = None
+    
+    def _avisar(self, evento, valor):
+        if self.callback is not None:
+            self.callback(evento, valor)
+    
+    def operacion(self, nombre, estados):
+        """Una operación de ConstructorThompson que creó esa cantidad de estados"""
+        self.operaciones[nombre] = self.operaciones.get(nombre, 0) + 1
+        self.estados_por_operacion[nombre] = self.estados_por_operacion.get(nombre, 0) + estados
+        self.estados_afn += estados
+        self._avisar('operacion', (nombre, estados))
+    
+    def clausura(self, tamano):
+        self.llamadas_clausura += 1
+        self.suma_clausuras += tamano
+        if tamano > self.clausura_maxima:
+            self.clausura_maxima = tamano
+        self._avisar('clausura', tamano)
+    
+    def move(self, cantidad=1):
+        self.llamadas_move += cantidad
+        self._avisar('move', cantidad)
+    
+    def estado_afd(self, pendientes):
+        """Se procesa un estado del AFD y quedan pendientes conjuntos en la cola"""
+        self.estados_afd += 1
+        if pendientes > self.pendientes_maximo:
+            self.pendientes_maximo = pendientes
+        self._avisar('estado_afd', (self.estados_afd - 1, pendientes))
+    
+    def iniciar_conversion(self):
+        self._inicio = time.perf_counter()
+    
+    def terminar_conversion(self):
+        segundos = time.perf_counter() - self._inicio
+        self.segundos_conversion += segundos
+        self._inicio = None
+        self._avisar('conversion', segundos)
+    
+    @property
+    def estados_por_segundo(self):
+        return self.estados_afd / self.segundos_conversion if self.segundos_conversion else 0.0
+    
+    @property
+    def clausura_promedio(self):
+        return self.suma_clausuras / self.llamadas_clausura if self.llamadas_clausura else 0.0
+    
+    def resumen(self):
+        return {
+            'estados_afn': self.estados_afn,
+            'operaciones': dict(self.operaciones),
+            'estados_por_operacion': dict(self.estados_por_operacion),
+            'llamadas_clausura': self.llamadas_clausura,
+            'clausura_promedio': self.clausura_promedio,
+            'clausura_maxima': self.clausura_maxima,
+            'llamadas_move': self.llamadas_move,
+            'estados_afd': self.estados_afd,
+            'pendientes_maximo': self.pendientes_maximo,
+            'segundos_conversion': self.segundos_conversion,
+            'estados_por_segundo': self.estados_por_segundo,
+        }
+    
+    def mostrar(self):
+        print(f"Estados del AFN: {self.estados_afn}")
+        for nombre, veces in sorted(self.operaciones.items()):
+            print(f"  {nombre}: {veces} operaciones, {self.estados_por_operacion[nombre]} estados")
+        print(f"Clausuras: {self.llamadas_clausura}  Tamaño promedio: {self.clausura_promedio:.1f}  "
+              f"Máximo: {self.clausura_maxima}")
+        print(f"Movimientos: {self.llamadas_move}  Estados AFD: {self.estados_afd}  "
+              f"Cola máxima: {self.pendientes_maximo}")
+        print(f"Conversión: {self.segundos_conversion:.4f} s  ({self.estados_por_segundo:.0f} estados/s)")
+
+def medir_compilacion(patron, callback=None, **opciones):
+    """
+    Construye el AFN de Thompson del patrón y lo convierte a AFD (con las
+    opciones de ConversorAFD dadas), y devuelve (conversor, estadísticas)
+    """
+    estadisticas = Estadisticas(callback)
+    afn = construir_afn(parsear(patron), ConstructorThompson(incremental=True, estadisticas=estadisticas))
+    conversor = ConversorAFD(afn, estadisticas=estadisticas, **opciones)
+    conversor.convertir()
+    return conversor, estadisticas
+
+def main():
+    print("=== INSTRUMENTACIÓN DE LA COMPILACIÓN ===")
+    for patron in ["(a|b)*abb(a|b)*", "[ae03]+@[ae03]+.(com|net|org)(.(gt|cr|co))?", "(a|b)*a(a|b){10}"]:
+        for modo, opciones in (("clásico", {}), ("internado", {'internar': True})):
+            print(f"\n=== {patron} ({modo}) ===")
+            _, estadisticas = medir_compilacion(patron, **opciones)
+            estadisticas.mostrar()
+
+if __name__ == "__main__":
+    main()
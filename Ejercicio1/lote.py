@@ -0,0 +1,101 @@
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from compilador import compilar
+
+class ResultadoCompilacion:
+    """
+    Resumen de compilar una expresión del lote. Solo guarda datos que se pueden
+    enviar entre procesos: el AFD mínimo (listas y diccionarios de enteros) y
+    los conteos; el AFN no, porque es un grafo de objetos Estado. Si la
+    compilación pasó un límite, no hay AFD y limite dice cuál fue ('estados',
+    'transiciones' o 'segundos'); acepta() recompila el patrón con los mismos
+    límites en este proceso y usa su AFD perezoso.
+    """
+    def __init__(self, indice, patron, afd=None, estados_afn=0, segundos=0.0, error=None,
+                 limite=None, limites=None):
+        self.indice = indice
+        self.patron = patron
+        self.afd = afd
+        self.estados_afn = estados_afn
+        self.segundos = segundos
+        self.error = error
+        self.limite = limite
+        self.limites = limites or {}
+    
+    @property
+    def ok(self):
+        return self.error is None
+    
+    @property
+    def estados_afd(self):
+        return self.afd.num_estados if self.afd is not None else 0
+    
+    def acepta(self, cadena):
+        if self.afd is None:
+            return compilar(self.patron, **self.limites).acepta(cadena)
+        return self.afd.acepta(cadena)
+
+def compilar_expresion(indice, patron, **limites):
+    """
+    Compila una expresión; cualquier error queda en el resultado en lugar de
+    detener el lote. Los límites (max_estados, max_transiciones, max_segundos)
+    se pasan a compilar
+    """
+    inicio = time.perf_counter()
+    try:
+        compilado = compilar(patron, **limites)
+    except Exception as error:
+        return ResultadoCompilacion(indice, patron, segundos=time.perf_counter() - inicio,
+                                    error=f"{type(error).__name__}: {error}")
+    limite = compilado.limite.limite if compilado.limite is not None else None
+    return ResultadoCompilacion(indice, patron, compilado.afd, len(compilado.afn.estados),
+                                time.perf_counter() - inicio, limite=limite, limites=limites)
+
+def compilar_lote(patrones, procesos=None, tam_lote=16, **limites):
+    """
+    Compila las expresiones en un pool de procesos (procesos=None usa todos los
+    núcleos, procesos=1 compila en este mismo proceso). Los resultados vuelven
+    en el orden de entrada.
+    """
+    patrones = list(patrones)
+    compilar_uno = partial(compilar_expresion, **limites)
+    if procesos == 1:
+        return [compilar_uno(i, patron) for i, patron in enumerate(patrones)]
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        return list(pool.map(compilar_uno, range(len(patrones)), patrones, chunksize=tam_lote))
+
+def leer_expresiones(ruta):
+    """Una expresión por línea; se ignoran las líneas vacías"""
+    with open(ruta, 'r', encoding='utf-8') as archivo:
+        return [linea.rstrip('\n') for linea in archivo if linea.strip()]
+
+def compilar_archivo(ruta, procesos=None, tam_lote=16, **limites):
+    return compilar_lote(leer_expresiones(ruta), procesos, tam_lote, **limites)
+
+def main():
+    ruta = sys.argv[1] if len(sys.argv) > 1 else "expresiones.txt"
+    procesos = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    limites = {'max_estados': int(sys.argv[3])} if len(sys.argv) > 3 else {}
+    inicio = time.perf_counter()
+    resultados = compilar_archivo(ruta, procesos, **limites)
+    total = time.perf_counter() - inicio
+    
+    print(f"=== COMPILACIÓN POR LOTES: {ruta} ===")
+    print("#\tAFN\tAFD\tTiempo (s)\tExpresión")
+    for resultado in resultados:
+        if resultado.ok and resultado.limite is not None:
+            print(f"{resultado.indice + 1}\t{resultado.estados_afn}\t-\t{resultado.segundos:.4f}\t\t"
+                  f"{resultado.patron}  LÍMITE DE {resultado.limite.upper()}: AFD perezoso")
+        elif resultado.ok:
+            print(f"{resultado.indice + 1}\t{resultado.estados_afn}\t{resultado.estados_afd}\t"
+                  f"{resultado.segundos:.4f}\t\t{resultado.patron}")
+        else:
+            print(f"{resultado.indice + 1}\t-\t-\t-\t\t{resultado.patron}  ERROR: {resultado.error}")
+    errores = sum(not resultado.ok for resultado in resultados)
+    print(f"\n{len(resultados)} expresiones, {errores} con error, {total:.2f} s en total")
+
+if __name__ == "__main__":
+    main()
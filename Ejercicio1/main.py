@@ -1,9 +1,13 @@
+import time
+from array import array
+from bisect import bisect_right
+from collections import deque, namedtuple
+
 class Estado:
-    contador = 0
-    
-    def __init__(self):
-        self.id = Estado.contador
-        Estado.contador += 1
+    # El id lo asigna el constructor que crea el estado (no hay contador global),
+    # así que varios constructores pueden trabajar a la vez
+    def __init__(self, id):
+        self.id = id
         self.es_final = False
         self.transiciones = {}
     
@@ -18,20 +22,113 @@ class Estado:
     def __repr__(self):
         return f"q{self.id}"
 
+class Rango(namedtuple('Rango', 'desde hasta')):
+    """Etiqueta de una transición que acepta cualquier caracter entre desde y hasta"""
+    __slots__ = ()
+    
+    def __str__(self):
+        return f"{self.desde}-{self.hasta}"
+
+def _limites(etiqueta):
+    """(desde, hasta) de una etiqueta: un caracter suelto o un Rango"""
+    if isinstance(etiqueta, Rango):
+        return etiqueta
+    return (etiqueta, etiqueta)
+
+class ParticionAlfabeto:
+    """
+    Divide los caracteres en clases de equivalencia según las etiquetas (caracteres
+    y rangos) del AFN: dos caracteres están en la misma clase si los aceptan
+    exactamente las mismas etiquetas, así que el AFD puede tener una transición
+    por clase en lugar de una por caracter. Los caracteres que ninguna etiqueta
+    acepta no tienen clase (-1).
+    """
+    def __init__(self, etiquetas):
+        etiquetas = sorted(set(etiquetas), key=_limites)
+        cortes = set()
+        for desde, hasta in map(_limites, etiquetas):
+            cortes.add(ord(desde))
+            cortes.add(ord(hasta) + 1)
+        cortes = sorted(cortes)
+        posicion = {corte: i for i, corte in enumerate(cortes)}
+        
+        # Firma de cada intervalo elemental [cortes[i], cortes[i + 1] - 1]: qué etiquetas lo cubren
+        firmas = [[] for _ in range(max(len(cortes) - 1, 0))]
+        for numero, (desde, hasta) in enumerate(map(_limites, etiquetas)):
+            for i in range(posicion[ord(desde)], posicion[ord(hasta) + 1]):
+                firmas[i].append(numero)
+        
+        clase_de_firma = {}
+        self.inicios = []
+        self.fines = []
+        self.clase_de_intervalo = []
+        for i, firma in enumerate(firmas):
+            if not firma:
+                continue
+            clase = clase_de_firma.setdefault(tuple(firma), len(clase_de_firma))
+            self.inicios.append(cortes[i])
+            self.fines.append(cortes[i + 1] - 1)
+            self.clase_de_intervalo.append(clase)
+        self.num_clases = len(clase_de_firma)
+        
+        self.clases_de = {}
+        for firma, clase in clase_de_firma.items():
+            for numero in firma:
+                self.clases_de.setdefault(etiquetas[numero], []).append(clase)
+        self._cache = {}
+    
+    @classmethod
+    def desde_intervalos(cls, intervalos):
+        """Reconstruye una partición a partir de su lista de (desde, hasta, clase)"""
+        particion = cls([])
+        particion.inicios = [ord(desde) for desde, _, _ in intervalos]
+        particion.fines = [ord(hasta) for _, hasta, _ in intervalos]
+        particion.clase_de_intervalo = [clase for _, _, clase in intervalos]
+        particion.num_clases = max(particion.clase_de_intervalo, default=-1) + 1
+        return particion
+    
+    def clase(self, c):
+        """Clase del caracter c, o -1 si ninguna etiqueta lo acepta"""
+        clase = self._cache.get(c)
+        if clase is None:
+            codigo = ord(c)
+            i = bisect_right(self.inicios, codigo) - 1
+            clase = self.clase_de_intervalo[i] if i >= 0 and codigo <= self.fines[i] else -1
+            self._cache[c] = clase
+        return clase
+    
+    def intervalos(self):
+        """Lista de (desde, hasta, clase) ordenada por caracter"""
+        return [(chr(desde), chr(hasta), clase)
+                for desde, hasta, clase in zip(self.inicios, self.fines, self.clase_de_intervalo)]
+    
+    def descripcion(self, clase):
+        """Texto de la clase: el caracter si es uno solo o [..] con sus rangos"""
+        partes = [desde if desde == hasta else f"{desde}-{hasta}"
+                  for desde, hasta, k in self.intervalos() if k == clase]
+        if len(partes) == 1 and len(partes[0]) == 1:
+            return partes[0]
+        return "[" + "".join(partes) + "]"
+
 class AFN:
-    def __init__(self, estado_inicial, estado_final):
+    def __init__(self, estado_inicial, estado_final, estados=None, alfabeto=None):
         self.estado_inicial = estado_inicial
         self.estado_final = estado_final
-        self.estados = set()
-        self.alfabeto = set()
-        self._recopilar_estados()
+        if estados is None:
+            self.estados = set()
+            self.alfabeto = set()
+            self._recopilar_estados()
+        else:
+            # Estados y alfabeto ya conocidos (modo incremental), no hace falta recorrer el grafo
+            self.estados = estados
+            self.alfabeto = alfabeto
     
     def _recopilar_estados(self):
         visitados = set()
-        cola = [self.estado_inicial]
+        cola = deque([self.estado_inicial])
         
         while cola:
-            estado = cola.pop(0)
+            estado = cola.popleft()
             if estado in visitados:
                 continue
             visitados.add(estado)
@@ -46,35 +143,241 @@ class AFN:
     
     def mostrar(self):
         print(f"Estado inicial: {self.estado_inicial}")
-        print(f"Estado final: {self.estado_final}")
+        if self.estado_final is not None:
+            print(f"Estado final: {self.estado_final}")
+        else:
+            # Sin estado final único (p. ej. después de quitar las epsilon) los finales se marcan con es_final
+            finales = sorted((estado for estado in self.estados if estado.es_final), key=lambda x: x.id)
+            print("Estados finales:", ", ".join(map(str, finales)))
         print("Transiciones:")
         for estado in sorted(self.estados, key=lambda x: x.id):
             for simbolo, destinos in estado.transiciones.items():
                 for destino in destinos:
                     print(f"  {estado} --{simbolo}--> {destino}")
 
+class AFNCompacto:
+    """
+    AFN con estados enteros y transiciones en arreglos planos (formato CSR).
+    Las transiciones del estado i están en destinos[desplazamientos[i]:desplazamientos[i + 1]]
+    con su símbolo en etiquetas (índice dentro de simbolos). Las transiciones
+    epsilon se guardan aparte en eps_desplazamientos/eps_destinos.
+    """
+    def __init__(self, estado_inicial, estado_final, finales, simbolos,
+                 desplazamientos, destinos, etiquetas, eps_desplazamientos, eps_destinos):
+        self.estado_inicial = estado_inicial
+        self.estado_final = estado_final
+        self.finales = finales
+        self.simbolos = simbolos
+        self.desplazamientos = desplazamientos
+        self.destinos = destinos
+        self.etiquetas = etiquetas
+        self.eps_desplazamientos = eps_desplazamientos
+        self.eps_destinos = eps_destinos
+        self.alfabeto = set(simbolos)
+        self.indice_simbolo = {simbolo: i for i, simbolo in enumerate(simbolos)}
+    
+    @classmethod
+    def desde_afn(cls, afn):
+        """Convierte un AFN de objetos Estado a la representación compacta"""
+        estados = sorted(afn.estados, key=lambda x: x.id)
+        indice = {estado: i for i, estado in enumerate(estados)}
+        simbolos = sorted(afn.alfabeto, key=_limites)
+        indice_simbolo = {simbolo: i for i, simbolo in enumerate(simbolos)}
+        
+        desplazamientos = array('i', [0])
+        destinos = array('i')
+        etiquetas = array('i')
+        eps_desplazamientos = array('i', [0])
+        eps_destinos = array('i')
+        finales = bytearray(len(estados))
+        
+        for i, estado in enumerate(estados):
+            if estado.es_final or estado == afn.estado_final:
+                finales[i] = 1
+            for simbolo, lista in estado.transiciones.items():
+                if simbolo == 'ε':
+                    eps_destinos.extend(indice[destino] for destino in lista)
+                else:
+                    for destino in lista:
+                        destinos.append(indice[destino])
+                        etiquetas.append(indice_simbolo[simbolo])
+            desplazamientos.append(len(destinos))
+            eps_desplazamientos.append(len(eps_destinos))
+        
+        # estado_final es -1 si el AFN no tiene un final único
+        return cls(indice[afn.estado_inicial], indice.get(afn.estado_final, -1), finales, simbolos,
+                   desplazamientos, destinos, etiquetas, eps_desplazamientos, eps_destinos)
+    
+    @property
+    def num_estados(self):
+        return len(self.finales)
+    
+    def es_final(self, estado):
+        return self.finales[estado] == 1
+    
+    def epsilon_closure(self, estados):
+        """Calcula la epsilon clausura de un conjunto de estados enteros"""
+        closure = set(estados)
+        pila = list(estados)
+        eps_desplazamientos = self.eps_desplazamientos
+        eps_destinos = self.eps_destinos
+        
+        while pila:
+            estado = pila.pop()
+            for k in range(eps_desplazamientos[estado], eps_desplazamientos[estado + 1]):
+                siguiente = eps_destinos[k]
+                if siguiente not in closure:
+                    closure.add(siguiente)
+                    pila.append(siguiente)
+        
+        return frozenset(closure)
+    
+    def move(self, estados, simbolo):
+        """Calcula el conjunto de estados alcanzables con un símbolo"""
+        resultado = set()
+        etiqueta = self.indice_simbolo.get(simbolo)
+        if etiqueta is None:
+            return resultado
+        for estado in estados:
+            for k in range(self.desplazamientos[estado], self.desplazamientos[estado + 1]):
+                if self.etiquetas[k] == etiqueta:
+                    resultado.add(self.destinos[k])
+        return resultado
+    
+    def mostrar(self):
+        print(f"Estado inicial: q{self.estado_inicial}")
+        print(f"Estado final: q{self.estado_final}")
+        print("Transiciones:")
+        for estado in range(self.num_estados):
+            for k in range(self.desplazamientos[estado], self.desplazamientos[estado + 1]):
+                simbolo = self.simbolos[self.etiquetas[k]]
+                print(f"  q{estado} --{simbolo}--> q{self.destinos[k]}")
+            for k in range(self.eps_desplazamientos[estado], self.eps_desplazamientos[estado + 1]):
+                print(f"  q{estado} --ε--> q{self.eps_destinos[k]}")
+
+class Fragmento:
+    """
+    Fragmento de AFN del modo incremental. Lleva la lista de sus estados y su
+    alfabeto, que se van fusionando al combinar fragmentos, para no recorrer
+    todo el grafo en cada operación.
+    """
+    def __init__(self, estado_inicial, estado_final, estados, alfabeto):
+        self.estado_inicial = estado_inicial
+        self.estado_final = estado_final
+        self.estados = estados
+        self.alfabeto = alfabeto
+
+# Operaciones de ConstructorThompson que se cuentan con estadisticas
+OPERACIONES_THOMPSON = ('caracter', 'clase_caracteres', 'rango_caracteres', 'cadena', 'epsilon',
+                        'concatenacion', 'union', 'estrella', 'mas', 'opcional')
+
 class ConstructorThompson:
-    def __init__(self):
-        Estado.contador = 0
+    def __init__(self, incremental=False, estadisticas=None):
+        self.contador = 0
+        self.incremental = incremental
+        self.estadisticas = estadisticas
+        if estadisticas is not None:
+            self._instrumentar()
+    
+    def _instrumentar(self):
+        """
+        Reemplaza en esta instancia las operaciones por versiones que informan
+        cuántos estados crean. Solo se cuenta la operación más externa (los
+        estados de la estrella dentro de a+ se cuentan en 'mas').
+        """
+        profundidad = [0]
+        
+        def medida(nombre, operacion):
+            def contar(*args):
+                if profundidad[0]:
+                    return operacion(*args)
+                profundidad[0] += 1
+                antes = self.contador
+                try:
+                    return operacion(*args)
+                finally:
+                    profundidad[0] -= 1
+                    self.estadisticas.operacion(nombre, self.contador - antes)
+            return contar
+        
+        for nombre in OPERACIONES_THOMPSON:
+            setattr(self, nombre, medida(nombre, getattr(self, nombre)))
+    
+    def nuevo_estado(self):
+        estado = Estado(self.contador)
+        self.contador += 1
+        return estado
+    
+    def _combinar(self, inicial, final, partes, nuevos, simbolos=()):
+        """
+        Arma el resultado de una operación. En modo normal crea un AFN (que recorre
+        el grafo); en modo incremental reutiliza la lista de estados de la parte más
+        grande y le agrega las demás, de modo que el costo es proporcional a lo nuevo.
+        """
+        if not self.incremental:
+            return AFN(inicial, final)
+        
+        if not partes:
+            return Fragmento(inicial, final, list(nuevos), set(simbolos))
+        
+        partes = [self._como_fragmento(parte) for parte in partes]
+        base = max(partes, key=lambda parte: len(parte.estados))
+        estados = base.estados
+        alfabeto = base.alfabeto
+        for parte in partes:
+            # En a+ el mismo fragmento aparece dos veces, no se debe duplicar
+            if parte.estados is not estados:
+                estados.extend(parte.estados)
+            if parte.alfabeto is not alfabeto:
+                alfabeto.update(parte.alfabeto)
+        estados.extend(nuevos)
+        alfabeto.update(simbolos)
+        return Fragmento(inicial, final, estados, alfabeto)
+    
+    def _como_fragmento(self, afn):
+        if isinstance(afn, Fragmento):
+            return afn
+        return Fragmento(afn.estado_inicial, afn.estado_final, list(afn.estados), set(afn.alfabeto))
+    
+    def finalizar(self, afn):
+        """Materializa el AFN completo a partir de un fragmento del modo incremental"""
+        if isinstance(afn, AFN):
+            return afn
+        return AFN(afn.estado_inicial, afn.estado_final,
+                   estados=set(afn.estados), alfabeto=set(afn.alfabeto))
     
     def caracter(self, c):
         """Construye AFN para un caracter individual"""
-        inicial = Estado()
-        final = Estado()
+        inicial = self.nuevo_estado()
+        final = self.nuevo_estado()
         final.es_final = True
         inicial.agregar_transicion(c, final)
-        return AFN(inicial, final)
+        return self._combinar(inicial, final, [], [inicial, final], [c])
     
     def clase_caracteres(self, caracteres):
-        """Construye AFN para una clase de caracteres [abc]"""
-        inicial = Estado()
-        final = Estado()
+        """
+        Construye AFN para una clase de caracteres [abc]. Los caracteres
+        consecutivos se unen en una sola transición con un Rango
+        """
+        rangos = []
+        for c in caracteres:
+            if rangos and ord(c) == ord(rangos[-1][1]) + 1:
+                rangos[-1] = (rangos[-1][0], c)
+            else:
+                rangos.append((c, c))
+        return self.rango_caracteres(rangos)
+    
+    def rango_caracteres(self, rangos):
+        """Construye AFN para una clase dada como rangos [(desde, hasta), ...]"""
+        inicial = self.nuevo_estado()
+        final = self.nuevo_estado()
         final.es_final = True
         
-        for c in caracteres:
-            inicial.agregar_transicion(c, final)
+        etiquetas = [desde if desde == hasta else Rango(desde, hasta) for desde, hasta in rangos]
+        for etiqueta in etiquetas:
+            inicial.agregar_transicion(etiqueta, final)
         
-        return AFN(inicial, final)
+        return self._combinar(inicial, final, [], [inicial, final], etiquetas)
     
     def cadena(self, texto):
         """Construye AFN para una cadena literal"""
@@ -90,11 +393,11 @@ class ConstructorThompson:
     
     def epsilon(self):
         """Construye AFN para epsilon"""
-        inicial = Estado()
-        final = Estado()
+        inicial = self.nuevo_estado()
+        final = self.nuevo_estado()
         final.es_final = True
         inicial.agregar_transicion('ε', final)
-        return AFN(inicial, final)
+        return self._combinar(inicial, final, [], [inicial, final])
     
     def concatenacion(self, afn1, afn2):
         """Concatena dos AFN"""
@@ -103,13 +406,13 @@ class ConstructorThompson:
         afn1.estado_final.agregar_transicion('ε', afn2.estado_inicial)
         
         # Crear nuevo AFN
-        nuevo_afn = AFN(afn1.estado_inicial, afn2.estado_final)
+        nuevo_afn = self._combinar(afn1.estado_inicial, afn2.estado_final, [afn1, afn2], [])
         return nuevo_afn
     
     def union(self, afn1, afn2):
         """Une dos AFN con operador |"""
-        inicial = Estado()
-        final = Estado()
+        inicial = self.nuevo_estado()
+        final = self.nuevo_estado()
         final.es_final = True
         
         # Conectar nuevo inicial con los iniciales de ambos AFN
@@ -122,12 +425,12 @@ class ConstructorThompson:
         afn1.estado_final.agregar_transicion('ε', final)
         afn2.estado_final.agregar_transicion('ε', final)
         
-        return AFN(inicial, final)
+        return self._combinar(inicial, final, [afn1, afn2], [inicial, final])
     
     def estrella(self, afn):
         """Aplica operador * (estrella de Kleene)"""
-        inicial = Estado()
-        final = Estado()
+        inicial = self.nuevo_estado()
+        final = self.nuevo_estado()
         final.es_final = True
         
         # Conectar nuevo inicial con el inicial del AFN y con el final
@@ -139,7 +442,7 @@ class ConstructorThompson:
         afn.estado_final.agregar_transicion('ε', afn.estado_inicial)
         afn.estado_final.agregar_transicion('ε', final)
         
-        return AFN(inicial, final)
+        return self._combinar(inicial, final, [afn], [inicial, final])
     
     def mas(self, afn):
         """Aplica operador + (una o más veces)"""
@@ -149,8 +452,8 @@ class ConstructorThompson:
     
     def opcional(self, afn):
         """Aplica operador ? (opcional)"""
-        inicial = Estado()
-        final = Estado()
+        inicial = self.nuevo_estado()
+        final = self.nuevo_estado()
         final.es_final = True
         
         # Camino directo (epsilon)
@@ -161,18 +464,218 @@ class ConstructorThompson:
         afn.estado_final.es_final = False
         afn.estado_final.agregar_transicion('ε', final)
         
-        return AFN(inicial, final)
+        return self._combinar(inicial, final, [afn], [inicial, final])
+    
+    def compactar(self, afn):
+        """Emite el AFN en la representación compacta de arreglos planos"""
+        return AFNCompacto.desde_afn(self.finalizar(afn))
+
+class AFD:
+    """
+    AFD con estados enteros 0..n-1. transiciones[e] es un dict símbolo -> destino;
+    un símbolo ausente significa que no hay transición (estado muerto implícito).
+    Con una particion (ParticionAlfabeto) los símbolos son los números de clase
+    y cada caracter se traduce a su clase antes de buscar la transición.
+    """
+    def __init__(self, alfabeto, transiciones, estado_inicial, estados_finales, particion=None):
+        self.alfabeto = alfabeto
+        self.transiciones = transiciones
+        self.estado_inicial = estado_inicial
+        self.estados_finales = estados_finales
+        self.particion = particion
+    
+    @property
+    def num_estados(self):
+        return len(self.transiciones)
+    
+    def simbolo(self, c):
+        """Símbolo de transición del caracter c (su clase si hay partición)"""
+        if self.particion is None:
+            return c
+        return self.particion.clase(c)
+    
+    def intervalos(self):
+        """Lista de (desde, hasta, símbolo) que cubre todos los caracteres con transición posible"""
+        if self.particion is None:
+            return [(s, s, s) for s in sorted(self.alfabeto, key=ord)]
+        return self.particion.intervalos()
+    
+    def descripcion(self, simbolo):
+        if self.particion is None:
+            return simbolo
+        return self.particion.descripcion(simbolo)
+    
+    def siguiente(self, estado, simbolo):
+        """Devuelve el destino de la transición con el caracter o -1 si no existe"""
+        return self.transiciones[estado].get(self.simbolo(simbolo), -1)
+    
+    def es_final(self, estado):
+        return estado in self.estados_finales
+    
+    def acepta(self, cadena):
+        """Indica si la cadena completa pertenece al lenguaje del AFD"""
+        transiciones = self.transiciones
+        estado = self.estado_inicial
+        if self.particion is not None:
+            clase = self.particion.clase
+            for c in cadena:
+                estado = transiciones[estado].get(clase(c), -1)
+                if estado < 0:
+                    return False
+            return estado in self.estados_finales
+        for c in cadena:
+            estado = transiciones[estado].get(c, -1)
+            if estado < 0:
+                return False
+        return estado in self.estados_finales
+    
+    def mostrar(self):
+        print(f"Estado inicial: q{self.estado_inicial}")
+        print("Estados finales:", ", ".join(f"q{e}" for e in sorted(self.estados_finales)))
+        print("\nTabla de transiciones:")
+        print("Estado\t" + "".join(f"{self.descripcion(simbolo)}\t" for simbolo in self.alfabeto))
+        for estado, por_simbolo in enumerate(self.transiciones):
+            fila = "".join(f"q{por_simbolo[s]}\t" if s in por_simbolo else "-\t" for s in self.alfabeto)
+            print(f"q{estado}\t{fila}")
+
+def _bits(mascara):
+    """Itera los índices de los bits encendidos de una máscara"""
+    # Buscar los '1' en la representación binaria es mucho más rápido que aislar bit por bit
+    binario = bin(mascara)[:1:-1]
+    i = binario.find('1')
+    while i >= 0:
+        yield i
+        i = binario.find('1', i + 1)
+
+class LimiteExcedido(Exception):
+    """
+    La construcción de un AFD pasó uno de sus límites (Limites): limite es
+    'estados', 'transiciones' o 'segundos'
+    """
+    def __init__(self, limite, maximo, valor):
+        super().__init__(f"Se superó el límite de {limite}: {valor} > {maximo}")
+        self.limite = limite
+        self.maximo = maximo
+        self.valor = valor
+
+class Limites:
+    """
+    Límites de estados, transiciones y segundos de la construcción de un AFD
+    (None = sin límite). Los constructores de AFD llaman a revisar() una vez
+    por estado procesado, solo si hay alguno activo.
+    """
+    def __init__(self, max_estados=None, max_transiciones=None, max_segundos=None):
+        self.max_estados = max_estados
+        self.max_transiciones = max_transiciones
+        self.max_segundos = max_segundos
+    
+    @property
+    def activos(self):
+        return (self.max_estados, self.max_transiciones, self.max_segundos) != (None, None, None)
+    
+    def revisar(self, estados, transiciones, inicio):
+        """Lanza LimiteExcedido si el AFD ya tiene demasiados estados o transiciones, o si se acabó el tiempo"""
+        if self.max_estados is not None and estados > self.max_estados:
+            raise LimiteExcedido('estados', self.max_estados, estados)
+        if self.max_transiciones is not None and transiciones > self.max_transiciones:
+            raise LimiteExcedido('transiciones', self.max_transiciones, transiciones)
+        if self.max_segundos is not None:
+            segundos = time.perf_counter() - inicio
+            if segundos > self.max_segundos:
+                raise LimiteExcedido('segundos', self.max_segundos, round(segundos, 4))
 
 class ConversorAFD:
-    def __init__(self, afn):
+    """
+    Construcción de subconjuntos. Con clases=True el alfabeto se divide primero
+    en clases de equivalencia (ParticionAlfabeto) y el AFD tiene una transición
+    por clase; se activa siempre que el AFN tenga transiciones con Rango (aunque
+    se pida clases=False), y siempre usa el algoritmo de máscaras de bits.
+    
+    Con internar=True cada conjunto se numera (0, 1, ...) al crearlo y el AFD
+    queda en tabla_afd, un arreglo plano de num_estados_afd * len(simbolos_afd)
+    destinos (-1 = sin transición), y en finales_ids. Al terminar se sueltan las
+    máscaras y el AFN, así que estados_afd y transiciones_afd quedan vacíos.
+    
+    Con estadisticas (instrumentacion.Estadisticas) se cuentan las clausuras,
+    los movimientos y los estados del AFD. Con máscaras de bits las clausuras
+    son las de cada estado del AFN (se calculan una vez) y cada movimiento es
+    un par (conjunto, símbolo) con transiciones.
+    
+    Con max_estados, max_transiciones o max_segundos, convertir() lanza
+    LimiteExcedido en cuanto el AFD descubierto pasa el límite (se revisa una
+    vez por estado procesado) y el conversor queda a medio llenar.
+    """
+    def __init__(self, afn, bitsets=False, clases=None, internar=False, estadisticas=None,
+                 max_estados=None, max_transiciones=None, max_segundos=None):
         self.afn = afn
+        self.compacto = isinstance(afn, AFNCompacto)
+        # Un Rango no es un símbolo suelto: sin partición no se podría recorrer
+        if not clases:
+            clases = any(isinstance(simbolo, Rango) for simbolo in afn.alfabeto)
+        self.particion = ParticionAlfabeto(afn.alfabeto) if clases else None
+        self.bitsets = bitsets or clases or internar
+        self.internar = internar
+        self.simbolos_afd = self._simbolos_ordenados()
         self.estados_afd = {}
         self.transiciones_afd = {}
         self.estado_inicial_afd = None
         self.estados_finales_afd = set()
+        self.tabla_afd = None
+        self.num_estados_afd = 0
+        self.finales_ids = set()
+        self.estadisticas = estadisticas
+        if estadisticas is not None:
+            self._instrumentar()
+        self.limites = Limites(max_estados, max_transiciones, max_segundos)
+    
+    def _instrumentar(self):
+        """Reemplaza en esta instancia convertir, epsilon_closure y move por versiones que cuentan"""
+        estadisticas = self.estadisticas
+        convertir = self.convertir
+        epsilon_closure = self.epsilon_closure
+        move = self.move
+        
+        def convertir_medido():
+            estadisticas.iniciar_conversion()
+            try:
+                return convertir()
+            finally:
+                estadisticas.terminar_conversion()
+        
+        def epsilon_closure_medida(estados):
+            closure = epsilon_closure(estados)
+            estadisticas.clausura(len(closure))
+            return closure
+        
+        def move_medido(estados, simbolo):
+            estadisticas.move()
+            return move(estados, simbolo)
+        
+        self.convertir = convertir_medido
+        self.epsilon_closure = epsilon_closure_medida
+        self.move = move_medido
+    
+    def _simbolos(self):
+        """Símbolos del AFD: las clases de la partición o el alfabeto del AFN"""
+        if self.particion is not None:
+            return range(self.particion.num_clases)
+        return self.afn.alfabeto
+    
+    def _simbolos_ordenados(self):
+        if self.particion is not None:
+            return list(range(self.particion.num_clases))
+        return sorted(self.afn.alfabeto, key=_limites)
+    
+    def _es_final(self, estado):
+        if self.compacto:
+            return self.afn.es_final(estado)
+        return estado.es_final or estado == self.afn.estado_final
     
     def epsilon_closure(self, estados):
         """Calcula la epsilon clausura de un conjunto de estados"""
+        if self.compacto:
+            return self.afn.epsilon_closure(estados)
+        
         closure = set(estados)
         pila = list(estados)
         
@@ -188,20 +691,112 @@ class ConversorAFD:
     
     def move(self, estados, simbolo):
         """Calcula el conjunto de estados alcanzables con un símbolo"""
+        if self.compacto:
+            return self.afn.move(estados, simbolo)
+        
         resultado = set()
         for estado in estados:
             if simbolo in estado.transiciones:
                 resultado.update(estado.transiciones[simbolo])
         return resultado
     
+    def _tablas_indexadas(self):
+        """
+        Numera los estados del AFN (0..n-1) y devuelve (nodos, indice_inicial,
+        sucesores epsilon por estado, destinos por símbolo y estado)
+        """
+        afn = self.afn
+        if self.compacto:
+            nodos = list(range(afn.num_estados))
+            epsilon = [afn.eps_destinos[afn.eps_desplazamientos[i]:afn.eps_desplazamientos[i + 1]]
+                       for i in nodos]
+            destinos = {simbolo: {} for simbolo in afn.simbolos}
+            for i in nodos:
+                for k in range(afn.desplazamientos[i], afn.desplazamientos[i + 1]):
+                    simbolo = afn.simbolos[afn.etiquetas[k]]
+                    destinos[simbolo].setdefault(i, []).append(afn.destinos[k])
+            return nodos, afn.estado_inicial, epsilon, self._por_clase(destinos)
+        
+        nodos = sorted(afn.estados, key=lambda x: x.id)
+        indice = {estado: i for i, estado in enumerate(nodos)}
+        epsilon = []
+        destinos = {simbolo: {} for simbolo in afn.alfabeto}
+        for i, estado in enumerate(nodos):
+            epsilon.append([indice[siguiente] for siguiente in estado.transiciones.get('ε', ())])
+            for simbolo, lista in estado.transiciones.items():
+                if simbolo != 'ε':
+                    destinos[simbolo][i] = [indice[siguiente] for siguiente in lista]
+        return nodos, indice[afn.estado_inicial], epsilon, self._por_clase(destinos)
+    
+    def _por_clase(self, destinos):
+        """Agrupa los destinos por clase de la partición (sin partición no cambia nada)"""
+        if self.particion is None:
+            return destinos
+        por_clase = {clase: {} for clase in range(self.particion.num_clases)}
+        for etiqueta, por_estado in destinos.items():
+            for clase in self.particion.clases_de[etiqueta]:
+                for i, lista in por_estado.items():
+                    por_clase[clase].setdefault(i, []).extend(lista)
+        return por_clase
+    
+    def _tablas_bitsets(self):
+        """
+        Precalcula la epsilon clausura de cada estado como máscara de bits y,
+        por símbolo, la clausura de los destinos de cada estado (move + clausura)
+        """
+        nodos, inicial, epsilon, destinos = self._tablas_indexadas()
+        
+        cierres = []
+        for i in range(len(nodos)):
+            mascara = 1 << i
+            pila = [i]
+            while pila:
+                estado = pila.pop()
+                for siguiente in epsilon[estado]:
+                    bit = 1 << siguiente
+                    if not mascara & bit:
+                        mascara |= bit
+                        pila.append(siguiente)
+            cierres.append(mascara)
+        if self.estadisticas is not None:
+            for mascara in cierres:
+                self.estadisticas.clausura(bin(mascara).count('1'))
+        
+        saltos = {}
+        con_simbolo = {}
+        for simbolo, por_estado in destinos.items():
+            saltos[simbolo] = {}
+            con_simbolo[simbolo] = 0
+            for i, lista in por_estado.items():
+                mascara = 0
+                for siguiente in lista:
+                    mascara |= cierres[siguiente]
+                saltos[simbolo][i] = mascara
+                con_simbolo[simbolo] |= 1 << i
+        
+        finales = 0
+        for i, estado in enumerate(nodos):
+            if self._es_final(estado):
+                finales |= 1 << i
+        
+        return nodos, cierres[inicial], saltos, con_simbolo, finales
+    
     def convertir(self):
         """Convierte AFN a AFD usando construcción de subconjuntos"""
+        if self.internar:
+            return self._convertir_internado()
+        if self.bitsets:
+            return self._convertir_bitsets()
+        
         # Estado inicial del AFD es la epsilon clausura del inicial del AFN
         inicial_closure = self.epsilon_closure([self.afn.estado_inicial])
         self.estado_inicial_afd = inicial_closure
         
-        estados_por_procesar = [inicial_closure]
+        estados_por_procesar = deque([inicial_closure])
         estados_procesados = set()
+        limitado = self.limites.activos
+        inicio = time.perf_counter()
+        num_transiciones = 0
         
         # Mapeo de conjuntos de estados a nombres
         contador_estados = 0
@@ -209,16 +804,18 @@ class ConversorAFD:
         contador_estados += 1
         
         while estados_por_procesar:
-            conjunto_actual = estados_por_procesar.pop(0)
+            conjunto_actual = estados_por_procesar.popleft()
             
             if conjunto_actual in estados_procesados:
                 continue
             
             estados_procesados.add(conjunto_actual)
+            if self.estadisticas is not None:
+                self.estadisticas.estado_afd(len(estados_por_procesar))
             
             # Verificar si es estado final
             for estado in conjunto_actual:
-                if estado.es_final or estado == self.afn.estado_final:
+                if self._es_final(estado):
                     self.estados_finales_afd.add(conjunto_actual)
                     break
             
@@ -237,9 +834,149 @@ class ConversorAFD:
                     if conjunto_actual not in self.transiciones_afd:
                         self.transiciones_afd[conjunto_actual] = {}
                     self.transiciones_afd[conjunto_actual][simbolo] = closure_siguiente
+                    num_transiciones += 1
+            
+            if limitado:
+                self.limites.revisar(contador_estados, num_transiciones, inicio)
+    
+    def _convertir_bitsets(self):
+        """
+        Construcción de subconjuntos con las clausuras precalculadas: cada conjunto
+        de estados es una máscara de bits y move + clausura es un OR de máscaras.
+        El resultado (nombres, orden y claves) es el mismo que el de convertir.
+        """
+        nodos, inicial, saltos, con_simbolo, finales = self._tablas_bitsets()
+        conjuntos = {}
+        
+        def conjunto(mascara):
+            if mascara not in conjuntos:
+                conjuntos[mascara] = frozenset(map(nodos.__getitem__, _bits(mascara)))
+            return conjuntos[mascara]
+        
+        self.estado_inicial_afd = conjunto(inicial)
+        nombres = {inicial: "q0"}
+        estados_por_procesar = deque([inicial])
+        transiciones = {}
+        finales_afd = []
+        estadisticas = self.estadisticas
+        limitado = self.limites.activos
+        inicio = time.perf_counter()
+        num_transiciones = 0
+        
+        while estados_por_procesar:
+            actual = estados_por_procesar.popleft()
+            if actual & finales:
+                finales_afd.append(actual)
+            if estadisticas is not None:
+                estadisticas.estado_afd(len(estados_por_procesar))
+            
+            for simbolo in self._simbolos():
+                candidatos = actual & con_simbolo[simbolo]
+                if not candidatos:
+                    continue
+                salto = saltos[simbolo]
+                siguiente = 0
+                for i in _bits(candidatos):
+                    siguiente |= salto[i]
+                
+                if siguiente not in nombres:
+                    nombres[siguiente] = f"q{len(nombres)}"
+                    estados_por_procesar.append(siguiente)
+                transiciones.setdefault(actual, {})[simbolo] = siguiente
+            if estadisticas is not None:
+                estadisticas.move(len(transiciones.get(actual, ())))
+            if limitado:
+                num_transiciones += len(transiciones.get(actual, ()))
+                self.limites.revisar(len(nombres), num_transiciones, inicio)
+        
+        for mascara, nombre in nombres.items():
+            self.estados_afd[conjunto(mascara)] = nombre
+        for mascara, por_simbolo in transiciones.items():
+            self.transiciones_afd[conjunto(mascara)] = {
+                simbolo: conjunto(destino) for simbolo, destino in por_simbolo.items()
+            }
+        self.estados_finales_afd.update(conjunto(mascara) for mascara in finales_afd)
+    
+    def _convertir_internado(self):
+        """
+        Construcción de subconjuntos con máscaras de bits que numera cada máscara
+        nueva en orden BFS; las filas de la tabla se agregan en ese mismo orden
+        """
+        nodos, inicial, saltos, con_simbolo, finales = self._tablas_bitsets()
+        simbolos = self.simbolos_afd
+        vacia = array('i', [-1]) * len(simbolos)
+        ids = {inicial: 0}
+        estados_por_procesar = deque([inicial])
+        tabla = array('i')
+        finales_ids = set()
+        estadisticas = self.estadisticas
+        limitado = self.limites.activos
+        inicio = time.perf_counter()
+        num_transiciones = 0
+        
+        while estados_por_procesar:
+            actual = estados_por_procesar.popleft()
+            if actual & finales:
+                finales_ids.add(ids[actual])
+            if estadisticas is not None:
+                estadisticas.estado_afd(len(estados_por_procesar))
+            fila = vacia[:]
+            for k, simbolo in enumerate(simbolos):
+                candidatos = actual & con_simbolo[simbolo]
+                if not candidatos:
+                    continue
+                salto = saltos[simbolo]
+                siguiente = 0
+                for i in _bits(candidatos):
+                    siguiente |= salto[i]
+                
+                destino = ids.get(siguiente)
+                if destino is None:
+                    destino = ids[siguiente] = len(ids)
+                    estados_por_procesar.append(siguiente)
+                fila[k] = destino
+            if estadisticas is not None:
+                estadisticas.move(len(fila) - fila.count(-1))
+            if limitado:
+                num_transiciones += len(fila) - fila.count(-1)
+                self.limites.revisar(len(ids), num_transiciones, inicio)
+            tabla.extend(fila)
+        
+        self.tabla_afd = tabla
+        self.num_estados_afd = len(ids)
+        self.finales_ids = finales_ids
+        # Las máscaras (ids) se descartan al salir; el AFN ya no hace falta
+        self.afn = None
+    
+    def a_afd(self):
+        """Devuelve el resultado de convertir() como AFD de estados enteros (q0 -> 0, q1 -> 1, ...)"""
+        if self.tabla_afd is not None:
+            simbolos = self.simbolos_afd
+            ancho = len(simbolos)
+            transiciones = []
+            for estado in range(self.num_estados_afd):
+                fila = self.tabla_afd[estado * ancho:(estado + 1) * ancho]
+                transiciones.append({simbolo: destino for simbolo, destino in zip(simbolos, fila) if destino >= 0})
+            return AFD(list(simbolos), transiciones, 0, set(self.finales_ids), self.particion)
+        
+        ids = {conjunto: int(nombre[1:]) for conjunto, nombre in self.estados_afd.items()}
+        transiciones = [None] * len(ids)
+        for conjunto, estado in ids.items():
+            transiciones[estado] = {
+                simbolo: ids[destino]
+                for simbolo, destino in self.transiciones_afd.get(conjunto, {}).items()
+            }
+        finales = {ids[conjunto] for conjunto in self.estados_finales_afd}
+        return AFD(self._simbolos_ordenados(), transiciones, ids[self.estado_inicial_afd], finales,
+                   self.particion)
     
     def mostrar_afd(self):
         print("\n=== AFD RESULTANTE ===")
+        if self.tabla_afd is not None:
+            # Sin los conjuntos de estados del AFN, se muestra la tabla numerada
+            self.a_afd().mostrar()
+            return
+        
         print(f"Estado inicial: {self.estados_afd[self.estado_inicial_afd]}")
         
         print("Estados finales:", end=" ")
@@ -248,16 +985,17 @@ class ConversorAFD:
         
         print("\nTabla de transiciones:")
         print("Estado\t", end="")
-        if self.afn.alfabeto:
-            for simbolo in sorted(self.afn.alfabeto):
-                print(f"{simbolo}\t", end="")
+        for simbolo in self._simbolos_ordenados():
+            if self.particion is not None:
+                simbolo = self.particion.descripcion(simbolo)
+            print(f"{simbolo}\t", end="")
         print()
         
         for conjunto_estado in sorted(self.estados_afd.keys(), key=lambda x: self.estados_afd[x]):
             nombre_estado = self.estados_afd[conjunto_estado]
             print(f"{nombre_estado}\t", end="")
             
-            for simbolo in sorted(self.afn.alfabeto):
+            for simbolo in self._simbolos_ordenados():
                 if conjunto_estado in self.transiciones_afd and simbolo in self.transiciones_afd[conjunto_estado]:
                     destino = self.transiciones_afd[conjunto_estado][simbolo]
                     print(f"{self.estados_afd[destino]}\t", end="")
@@ -265,10 +1003,8 @@ class ConversorAFD:
                     print("-\t", end="")
             print()
 
-def procesar_expresion_simple(expresion, constructor):
-    """Procesa expresiones regulares simples"""
-    print(f"\n=== Procesando: {expresion} ===")
-    
+def construir_expresion_simple(expresion, constructor):
+    """Construye con Thompson el AFN de una de las expresiones simples (a-f)"""
     if expresion == "(a|t)c":
         # Construir (a|t)
         afn_a = constructor.caracter('a')
@@ -347,6 +1083,16 @@ def procesar_expresion_simple(expresion, constructor):
         afn_final = constructor.concatenacion(afn_temp, afn_0_star)
     
     else:
+        return None
+    
+    return afn_final
+
+def procesar_expresion_simple(expresion, constructor):
+    """Procesa expresiones regulares simples"""
+    print(f"\n=== Procesando: {expresion} ===")
+    
+    afn_final = construir_expresion_simple(expresion, constructor)
+    if afn_final is None:
         print(f"Expresión {expresion} no implementada en este ejemplo")
         return None
     
@@ -360,13 +1106,8 @@ def procesar_expresion_simple(expresion, constructor):
     
     return afn_final
 
-def procesar_expresion_compleja_g(constructor):
-    """
-    Procesa: if\([ae]+\)\{[ei]+\}(\n(else\{[jl]+\}))?
-    Interpretando \ como escape: if([ae]+){[ei]+}(\n(else{[jl]+}))?
-    """
-    print(f"\n=== Procesando expresión g: if([ae]+){{[ei]+}}(\\n(else{{[jl]+}}))? ===")
-    
+def construir_expresion_compleja_g(constructor):
+    """Construye con Thompson el AFN de la expresión g"""
     # Parte 1: "if"
     afn_if = constructor.cadena("if")
     
@@ -429,6 +1170,17 @@ def procesar_expresion_compleja_g(constructor):
     # Concatenar parte obligatoria con opcional
     afn_final = constructor.concatenacion(afn_parte_obligatoria, afn_parte_opcional)
     
+    return afn_final
+
+def procesar_expresion_compleja_g(constructor):
+    """
+    Procesa: if\([ae]+\)\{[ei]+\}(\n(else\{[jl]+\}))?
+    Interpretando \ como escape: if([ae]+){[ei]+}(\n(else{[jl]+}))?
+    """
+    print(f"\n=== Procesando expresión g: if([ae]+){{[ei]+}}(\\n(else{{[jl]+}}))? ===")
+    
+    afn_final = construir_expresion_compleja_g(constructor)
+    
     print("\n--- AFN construido con Thompson ---")
     afn_final.mostrar()
     
@@ -439,12 +1191,8 @@ def procesar_expresion_compleja_g(constructor):
     
     return afn_final
 
-def procesar_expresion_compleja_h(constructor):
-    """
-    Procesa: [ae03]+@[ae03]+.(com|net|org)(.(gt|cr|co))?
-    """
-    print(f"\n=== Procesando expresión h: [ae03]+@[ae03]+.(com|net|org)(.(gt|cr|co))? ===")
-    
+def construir_expresion_compleja_h(constructor):
+    """Construye con Thompson el AFN de la expresión h"""
     # Parte 1: [ae03]+
     afn_usuario_class = constructor.clase_caracteres(['a', 'e', '0', '3'])
     afn_usuario = constructor.mas(afn_usuario_class)
@@ -492,6 +1240,16 @@ def procesar_expresion_compleja_h(constructor):
     # Concatenar todo
     afn_final = constructor.concatenacion(afn_parte_obligatoria, afn_parte_opcional)
     
+    return afn_final
+
+def procesar_expresion_compleja_h(constructor):
+    """
+    Procesa: [ae03]+@[ae03]+.(com|net|org)(.(gt|cr|co))?
+    """
+    print(f"\n=== Procesando expresión h: [ae03]+@[ae03]+.(com|net|org)(.(gt|cr|co))? ===")
+    
+    afn_final = construir_expresion_compleja_h(constructor)
+    
     print("\n--- AFN construido con Thompson ---")
     afn_final.mostrar()
     
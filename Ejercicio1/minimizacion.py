@@ -0,0 +1,201 @@
+from collections import deque
+
+from main import AFD, ConstructorThompson, ConversorAFD, construir_expresion_simple
+
+class MinimizadorAFD:
+    """
+    Minimiza un AFD con el algoritmo de Hopcroft (refinamiento de particiones
+    en O(n log n)). Acepta un AFD o un conversor ya convertido (ConversorAFD,
+    ConversorDerivadas: cualquiera con a_afd()). Si se pasan
+    etiquetas (una por estado, p. ej. los patrones que acepta), la partición
+    inicial agrupa por etiqueta en lugar de solo final / no final.
+    """
+    def __init__(self, afd, etiquetas=None):
+        if not isinstance(afd, AFD):
+            afd = afd.a_afd()
+        self.afd = afd
+        self.etiquetas = etiquetas
+        self.etiquetas_minimas = None
+        self.estados_antes = afd.num_estados
+        self.estados_despues = None
+    
+    def _alcanzables(self):
+        """Estados alcanzables desde el inicial, en orden BFS"""
+        transiciones = self.afd.transiciones
+        vistos = {self.afd.estado_inicial}
+        orden = [self.afd.estado_inicial]
+        cola = deque(orden)
+        while cola:
+            estado = cola.popleft()
+            for destino in transiciones[estado].values():
+                if destino not in vistos:
+                    vistos.add(destino)
+                    orden.append(destino)
+                    cola.append(destino)
+        return orden
+    
+    def minimizar(self):
+        """Devuelve el AFD mínimo equivalente (sin estado muerto)"""
+        afd = self.afd
+        alfabeto = afd.alfabeto
+        estados = self._alcanzables()
+        
+        # Renumerar los alcanzables y agregar un estado sumidero para completar el AFD
+        indice = {estado: i for i, estado in enumerate(estados)}
+        sumidero = len(estados)
+        n = sumidero + 1
+        
+        # Transiciones inversas: inversas[simbolo][destino] = orígenes
+        inversas = {simbolo: [[] for _ in range(n)] for simbolo in alfabeto}
+        for estado in estados:
+            origen = indice[estado]
+            por_simbolo = afd.transiciones[estado]
+            for simbolo in alfabeto:
+                destino = indice[por_simbolo[simbolo]] if simbolo in por_simbolo else sumidero
+                inversas[simbolo][destino].append(origen)
+        for simbolo in alfabeto:
+            inversas[simbolo][sumidero].append(sumidero)
+        
+        finales = {indice[e] for e in estados if e in afd.estados_finales}
+        if self.etiquetas is None:
+            no_finales = set(range(n)) - finales
+            bloques = [set(bloque) for bloque in (finales, no_finales) if bloque]
+        else:
+            # Las etiquetas son tuplas; el sumidero no acepta nada y lleva ()
+            por_etiqueta = {}
+            for estado in estados:
+                por_etiqueta.setdefault(self.etiquetas[estado], set()).add(indice[estado])
+            por_etiqueta.setdefault((), set()).add(sumidero)
+            bloques = list(por_etiqueta.values())
+        bloque_de = [0] * n
+        for b, bloque in enumerate(bloques):
+            for estado in bloque:
+                bloque_de[estado] = b
+        
+        # Todos los bloques iniciales son divisores salvo el más grande (con dos
+        # bloques, basta con el más pequeño)
+        mayor = max(range(len(bloques)), key=lambda b: len(bloques[b]))
+        pendientes = set(range(len(bloques))) - {mayor}
+        
+        while pendientes:
+            divisor = list(bloques[pendientes.pop()])
+            for simbolo in alfabeto:
+                inversa = inversas[simbolo]
+                # Agrupar por bloque los estados que llegan al divisor con este símbolo
+                tocados = {}
+                for destino in divisor:
+                    for origen in inversa[destino]:
+                        tocados.setdefault(bloque_de[origen], set()).add(origen)
+                
+                for b, dentro in tocados.items():
+                    if len(dentro) == len(bloques[b]):
+                        continue
+                    # Partir el bloque b en (dentro, resto)
+                    bloques[b] -= dentro
+                    nuevo = len(bloques)
+                    bloques.append(dentro)
+                    for estado in dentro:
+                        bloque_de[estado] = nuevo
+                    if b in pendientes:
+                        pendientes.add(nuevo)
+                    else:
+                        pendientes.add(nuevo if len(dentro) <= len(bloques[b]) else b)
+        
+        return self._construir(estados, indice, bloques, bloque_de, sumidero, finales)
+    
+    def _construir(self, estados, indice, bloques, bloque_de, sumidero, finales):
+        """Arma el AFD cociente numerando los bloques en orden BFS desde el inicial"""
+        afd = self.afd
+        muerto = bloque_de[sumidero]
+        representante = {}
+        for estado in estados:
+            representante.setdefault(bloque_de[indice[estado]], estado)
+        
+        inicial = bloque_de[indice[afd.estado_inicial]]
+        nuevo_id = {inicial: 0}
+        cola = deque([inicial])
+        transiciones = []
+        while cola:
+            bloque = cola.popleft()
+            por_simbolo = {}
+            for simbolo, destino in afd.transiciones[representante[bloque]].items():
+                destino = bloque_de[indice[destino]]
+                if destino == muerto:
+                    continue
+                if destino not in nuevo_id:
+                    nuevo_id[destino] = len(nuevo_id)
+                    cola.append(destino)
+                por_simbolo[simbolo] = nuevo_id[destino]
+            transiciones.append(por_simbolo)
+        
+        # Si el inicial es equivalente al sumidero, el lenguaje es vacío
+        finales_min = {nuevo_id[bloque_de[e]] for e in finales if bloque_de[e] in nuevo_id}
+        minimo = AFD(list(afd.alfabeto), transiciones, 0, finales_min, afd.particion)
+        self.estados_despues = minimo.num_estados
+        if self.etiquetas is not None:
+            self.etiquetas_minimas = [None] * minimo.num_estados
+            for bloque, nuevo in nuevo_id.items():
+                self.etiquetas_minimas[nuevo] = self.etiquetas[representante[bloque]]
+        return minimo
+    
+    def mostrar_resumen(self):
+        print(f"Estados antes de minimizar: {self.estados_antes}")
+        print(f"Estados después de minimizar: {self.estados_despues}")
+
+def minimizar(afd):
+    """Atajo: minimiza un AFD (o un conversor ya convertido) y devuelve el AFD mínimo"""
+    return MinimizadorAFD(afd).minimizar()
+
+def contraejemplo(afd1, afd2):
+    """
+    Recorre en BFS el producto de los dos AFD y devuelve la cadena más corta que
+    uno acepta y el otro no, o None si aceptan el mismo lenguaje. Los AFD pueden
+    tener alfabetos o particiones distintas: se prueba un caracter por cada
+    intervalo en que ninguno de los dos distingue caracteres.
+    """
+    cortes = set()
+    for afd in (afd1, afd2):
+        for desde, hasta, _ in afd.intervalos():
+            cortes.add(ord(desde))
+            cortes.add(ord(hasta) + 1)
+    representantes = {}
+    for codigo in sorted(cortes):
+        if codigo <= 0x10FFFF:
+            c = chr(codigo)
+            representantes.setdefault((afd1.simbolo(c), afd2.simbolo(c)), c)
+    
+    def siguiente(afd, estado, simbolo):
+        return afd.transiciones[estado].get(simbolo, -1) if estado >= 0 else -1
+    
+    inicial = (afd1.estado_inicial, afd2.estado_inicial)
+    camino = {inicial: ""}
+    cola = deque([inicial])
+    while cola:
+        par = cola.popleft()
+        e1, e2 = par
+        if afd1.es_final(e1) != afd2.es_final(e2):
+            return camino[par]
+        for (s1, s2), c in representantes.items():
+            destino = (siguiente(afd1, e1, s1), siguiente(afd2, e2, s2))
+            if destino != (-1, -1) and destino not in camino:
+                camino[destino] = camino[par] + c
+                cola.append(destino)
+    return None
+
+def equivalentes(afd1, afd2):
+    """Indica si los dos AFD aceptan exactamente el mismo lenguaje"""
+    return contraejemplo(afd1, afd2) is None
+
+def main():
+    print("=== MINIMIZACIÓN DE AFD (HOPCROFT) ===")
+    for expresion in ["(a|t)c", "(a|b)*", "(a*|b*)*", "((ε|a)|b*)*", "(a|b)*abb(a|b)*", "0?(1?)?0*"]:
+        print(f"\n=== {expresion} ===")
+        conversor = ConversorAFD(construir_expresion_simple(expresion, ConstructorThompson()))
+        conversor.convertir()
+        minimizador = MinimizadorAFD(conversor)
+        minimo = minimizador.minimizar()
+        minimizador.mostrar_resumen()
+        minimo.mostrar()
+
+if __name__ == "__main__":
+    main()
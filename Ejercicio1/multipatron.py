@@ -0,0 +1,110 @@
+from compilador import construir_afn, parsear
+from main import AFN, ConstructorThompson, ConversorAFD
+from minimizacion import MinimizadorAFD
+
+class MultiPatron:
+    """
+    Une N patrones en un solo AFD. Cada estado de aceptación lleva la tupla de IDs
+    (índices en la lista) de los patrones que acepta; el de menor ID es el de
+    mayor prioridad. Así una sola pasada clasifica la entrada contra todos.
+    """
+    def __init__(self, patrones):
+        self.patrones = list(patrones)
+        constructor = ConstructorThompson(incremental=True)
+        afns = [construir_afn(parsear(patron), constructor) for patron in self.patrones]
+        
+        # Nuevo estado inicial con epsilon hacia el inicial de cada patrón
+        inicial = constructor.nuevo_estado()
+        estados = {inicial}
+        alfabeto = set()
+        patron_de_final = {}
+        for i, afn in enumerate(afns):
+            inicial.agregar_transicion('ε', afn.estado_inicial)
+            estados |= afn.estados
+            alfabeto |= afn.alfabeto
+            patron_de_final[afn.estado_final] = i
+        self.afn = AFN(inicial, None, estados=estados, alfabeto=alfabeto)
+        
+        conversor = ConversorAFD(self.afn, bitsets=True, clases=True)
+        conversor.convertir()
+        afd = conversor.a_afd()
+        etiquetas = [()] * afd.num_estados
+        for conjunto, nombre in conversor.estados_afd.items():
+            etiquetas[int(nombre[1:])] = tuple(sorted(
+                patron_de_final[estado] for estado in conjunto if estado in patron_de_final))
+        
+        minimizador = MinimizadorAFD(afd, etiquetas)
+        self.afd = minimizador.minimizar()
+        self.etiquetas = minimizador.etiquetas_minimas
+    
+    @classmethod
+    def desde_archivo(cls, ruta):
+        """Lee un patrón por línea (se ignoran las líneas vacías)"""
+        with open(ruta, 'r', encoding='utf-8') as archivo:
+            return cls([linea.rstrip('\n') for linea in archivo if linea.strip()])
+    
+    def clasificar(self, cadena):
+        """Devuelve la tupla de IDs de los patrones que aceptan la cadena completa"""
+        transiciones = self.afd.transiciones
+        simbolo = self.afd.simbolo
+        estado = self.afd.estado_inicial
+        for c in cadena:
+            estado = transiciones[estado].get(simbolo(c), -1)
+            if estado < 0:
+                return ()
+        return self.etiquetas[estado]
+    
+    def prioritario(self, cadena):
+        """ID del patrón de mayor prioridad que acepta la cadena, o None"""
+        etiquetas = self.clasificar(cadena)
+        return etiquetas[0] if etiquetas else None
+    
+    def tokenizar(self, texto):
+        """
+        Divide el texto en tokens con la regla del lexema más largo (y, en empate,
+        el patrón de mayor prioridad). Devuelve tuplas (id, lexema, inicio); los
+        caracteres que no inician ningún token salen con id None.
+        """
+        transiciones = self.afd.transiciones
+        simbolo = self.afd.simbolo
+        tokens = []
+        inicio = 0
+        while inicio < len(texto):
+            estado = self.afd.estado_inicial
+            mejor_fin = -1
+            mejor_id = None
+            posicion = inicio
+            while posicion < len(texto):
+                estado = transiciones[estado].get(simbolo(texto[posicion]), -1)
+                if estado < 0:
+                    break
+                posicion += 1
+                if self.etiquetas[estado]:
+                    mejor_fin = posicion
+                    mejor_id = self.etiquetas[estado][0]
+            if mejor_fin < 0:
+                tokens.append((None, texto[inicio], inicio))
+                inicio += 1
+            else:
+                tokens.append((mejor_id, texto[inicio:mejor_fin], inicio))
+                inicio = mejor_fin
+        return tokens
+
+def main():
+    multi = MultiPatron.desde_archivo("expresiones.txt")
+    print("=== CLASIFICACIÓN CONTRA TODAS LAS EXPRESIONES A LA VEZ ===")
+    print(f"AFD combinado: {multi.afd.num_estados} estados para {len(multi.patrones)} patrones")
+    for cadena in ["ac", "abba", "", "0100", "if(a){e}", "ae@03.com.gt", "abbc"]:
+        ids = multi.clasificar(cadena)
+        nombres = ", ".join(multi.patrones[i] for i in ids) or "ninguno"
+        print(f"  {cadena!r}: {nombres}")
+    
+    print("\n=== TOKENIZACIÓN (LEXEMA MÁS LARGO) ===")
+    lexer = MultiPatron(["if", "else", "[a-z]+", "[0-9]+", " +", "[(){}]", "=="])
+    nombres = ["IF", "ELSE", "ID", "NUM", "ESPACIO", "SIMBOLO", "IGUAL"]
+    for id_patron, lexema, inicio in lexer.tokenizar("if (x == 10) {ifx} else {y}"):
+        nombre = nombres[id_patron] if id_patron is not None else "ERROR"
+        print(f"  {inicio:>3} {nombre:<8} {lexema!r}")
+
+if __name__ == "__main__":
+    main()
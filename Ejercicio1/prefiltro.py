@@ -0,0 +1,96 @@
+# Caracteres más frecuentes en texto común (aprox. en orden); un literal con
+# caracteres que no están aquí suele aparecer menos y genera menos candidatos
+FRECUENTES = " etaoinsrhldcumpfgbyvwkxjqz\n.,0123456789ETAOINSRHLDCUMPFGBYVWKXJQZ"
+
+def rareza(literal):
+    """Puntaje de un literal para buscarlo: más largo y con caracteres menos frecuentes es mejor"""
+    return (len(literal), sum(FRECUENTES.index(c) if c in FRECUENTES else len(FRECUENTES) for c in literal))
+
+class Prefiltro:
+    """
+    Filtro previo con los literales que toda coincidencia contiene. Para aceptar
+    una cadena completa basta con que falte uno para rechazarla sin recorrer el
+    AFD. En una búsqueda se buscan con str.find las apariciones del literal más
+    raro y alrededor de cada una se toma el tramo de caracteres que pueden ser
+    parte de una coincidencia (y, si el patrón tiene largo máximo, solo hasta
+    ese largo); el resto del texto se salta sin pasar por el autómata.
+    """
+    def __init__(self, literales, largo_maximo=None):
+        self.literales = list(literales)
+        self.literal = max(self.literales, key=rareza)
+        self.largo_maximo = largo_maximo
+        self.reiniciar_estadisticas()
+    
+    def reiniciar_estadisticas(self):
+        self.consultas = 0
+        self.descartes = 0
+        self.candidatos = 0
+        self.tramos = 0
+        self.revisados = 0
+        self.saltados = 0
+    
+    def puede_coincidir(self, cadena):
+        """False si a la cadena le falta algún literal obligatorio"""
+        self.consultas += 1
+        for literal in self.literales:
+            if literal not in cadena:
+                self.descartes += 1
+                return False
+        return True
+    
+    def tramos_candidatos(self, texto, inicio, fin, vivo):
+        """
+        Lista ordenada y sin solapes de tramos (desde, hasta) de texto[inicio:fin]
+        que pueden contener coincidencias; vivo(c) indica si el caracter c puede
+        estar dentro de una coincidencia.
+        """
+        self.consultas += 1
+        literal = self.literal
+        largo = len(literal)
+        tramos = []
+        k = texto.find(literal, inicio, fin)
+        while k >= 0:
+            self.candidatos += 1
+            desde = k
+            hasta = k + largo
+            izquierda = inicio if self.largo_maximo is None else max(inicio, hasta - self.largo_maximo)
+            derecha = fin if self.largo_maximo is None else min(fin, k + self.largo_maximo)
+            # No se vuelve a recorrer lo que ya está en el tramo anterior
+            if tramos:
+                izquierda = max(izquierda, tramos[-1][1])
+                hasta = max(hasta, tramos[-1][1])
+            while desde > izquierda and vivo(texto[desde - 1]):
+                desde -= 1
+            while hasta < derecha and vivo(texto[hasta]):
+                hasta += 1
+            if tramos and desde <= tramos[-1][1]:
+                tramos[-1] = (tramos[-1][0], hasta)
+            else:
+                tramos.append((desde, hasta))
+            # Sin largo máximo el tramo ya llega hasta un caracter que no puede coincidir
+            k = texto.find(literal, hasta if self.largo_maximo is None else k + 1, fin)
+        if not tramos:
+            self.descartes += 1
+        self.tramos += len(tramos)
+        revisados = sum(hasta - desde for desde, hasta in tramos)
+        self.revisados += revisados
+        self.saltados += fin - inicio - revisados
+        return tramos
+    
+    def estadisticas(self):
+        return {
+            'literales': self.literales,
+            'literal': self.literal,
+            'consultas': self.consultas,
+            'descartes': self.descartes,
+            'candidatos': self.candidatos,
+            'tramos': self.tramos,
+            'revisados': self.revisados,
+            'saltados': self.saltados,
+        }
+    
+    def mostrar(self):
+        print(f"Literales obligatorios: {self.literales}  (se busca {self.literal!r})")
+        print(f"Consultas: {self.consultas}  Descartadas sin autómata: {self.descartes}  "
+              f"Candidatos: {self.candidatos}  Tramos: {self.tramos}")
+        print(f"Caracteres revisados: {self.revisados}  Saltados: {self.saltados}")
@@ -0,0 +1,247 @@
+import codecs
+import mmap
+import os
+import random
+import tempfile
+import time
+from bisect import bisect_right
+
+from compilador import afd_de, compilar
+
+TAMANO_BLOQUE = 1 << 20
+
+class ResultadoReconocimiento:
+    """Resultado de recorrer un flujo con el AFD"""
+    def __init__(self, acepta, bytes_procesados, segundos, lineas=0, lineas_validas=0, lineas_invalidas=()):
+        self.acepta = acepta
+        self.bytes_procesados = bytes_procesados
+        self.segundos = segundos
+        self.lineas = lineas
+        self.lineas_validas = lineas_validas
+        self.lineas_invalidas = list(lineas_invalidas)
+    
+    @property
+    def mb_por_segundo(self):
+        if self.segundos <= 0:
+            return float('inf')
+        return self.bytes_procesados / (1024 * 1024) / self.segundos
+    
+    def mostrar(self):
+        print(f"Bytes procesados: {self.bytes_procesados}")
+        if self.lineas:
+            print(f"Líneas válidas: {self.lineas_validas} de {self.lineas}")
+            if self.lineas_invalidas:
+                print(f"Primeras líneas inválidas: {self.lineas_invalidas}")
+        else:
+            print(f"Resultado: {'acepta' if self.acepta else 'rechaza'}")
+        print(f"Tiempo: {self.segundos:.3f} s  ({self.mb_por_segundo:.1f} MB/s)")
+
+class ReconocedorFlujo:
+    """
+    Recorre bytes UTF-8 con un AFD por bloques, conservando el estado entre
+    bloques, sin cargar la entrada completa en memoria. Los bloques se
+    decodifican de forma incremental (un caracter puede quedar partido entre
+    dos bloques); una secuencia UTF-8 inválida lanza UnicodeDecodeError. Con
+    por_lineas=True valida cada línea por separado en lugar de la entrada
+    completa; las líneas pueden terminar en \n o en \r\n.
+    """
+    def __init__(self, afd, por_lineas=False, max_invalidas=10):
+        afd = afd_de(afd)
+        self.afd = afd
+        self.por_lineas = por_lineas
+        self.max_invalidas = max_invalidas
+        
+        # filas[estado][codigo] = destino para los caracteres hasta U+00FF. Se
+        # agrega un estado muerto explícito (absorbente) para que el ciclo
+        # interno no tenga que revisar -1
+        self.muerto = afd.num_estados
+        self.filas = [[self.muerto] * 256 for _ in range(afd.num_estados + 1)]
+        # Códigos de cada símbolo (un caracter o una clase de la partición del
+        # AFD); los intervalos por encima de U+00FF se buscan con bisect
+        codigos_de = {}
+        self.inicios_anchos = []
+        self.fines_anchos = []
+        self.simbolos_anchos = []
+        for desde, hasta, simbolo in afd.intervalos():
+            desde, hasta = ord(desde), ord(hasta)
+            codigos_de.setdefault(simbolo, []).extend(range(desde, min(hasta, 255) + 1))
+            if hasta > 255:
+                self.inicios_anchos.append(max(desde, 256))
+                self.fines_anchos.append(hasta)
+                self.simbolos_anchos.append(simbolo)
+        for estado, por_simbolo in enumerate(afd.transiciones):
+            fila = self.filas[estado]
+            for simbolo, destino in por_simbolo.items():
+                for codigo in codigos_de.get(simbolo, ()):
+                    fila[codigo] = destino
+        self.finales = bytearray(afd.num_estados + 1)
+        for estado in afd.estados_finales:
+            self.finales[estado] = 1
+        self.decodificador = codecs.getincrementaldecoder('utf-8')()
+        
+        self.reiniciar()
+    
+    def reiniciar(self):
+        self.estado = self.afd.estado_inicial
+        self.bytes_procesados = 0
+        self.lineas = 0
+        self.lineas_validas = 0
+        self.lineas_invalidas = []
+        self._linea_con_datos = False
+        self._retorno_pendiente = False
+        self.decodificador.reset()
+        self._inicio = time.perf_counter()
+    
+    def _paso_ancho(self, estado, codigo):
+        """Destino con un caracter por encima de U+00FF"""
+        i = bisect_right(self.inicios_anchos, codigo) - 1
+        if i < 0 or codigo > self.fines_anchos[i] or estado == self.muerto:
+            return self.muerto
+        return self.afd.transiciones[estado].get(self.simbolos_anchos[i], self.muerto)
+    
+    def _recorrer(self, estado, unidades):
+        """Estado al que se llega desde estado leyendo los bytes o el texto"""
+        if estado == self.muerto:
+            return estado
+        filas = self.filas
+        if isinstance(unidades, bytes):
+            for byte in unidades:
+                estado = filas[estado][byte]
+            return estado
+        for c in unidades:
+            codigo = ord(c)
+            estado = filas[estado][codigo] if codigo < 256 else self._paso_ancho(estado, codigo)
+        return estado
+    
+    def alimentar(self, bloque):
+        """Procesa el siguiente bloque de bytes"""
+        self.bytes_procesados += len(bloque)
+        texto = self.decodificador.decode(bloque)
+        try:
+            # Sin caracteres por encima de U+00FF cada código cabe en un byte
+            # y el recorrido usa directamente la tabla
+            unidades = texto.encode('latin-1')
+        except UnicodeEncodeError:
+            unidades = texto
+        if self.por_lineas:
+            self._alimentar_lineas(unidades)
+        else:
+            self.estado = self._recorrer(self.estado, unidades)
+    
+    def _alimentar_lineas(self, unidades):
+        if not unidades:
+            return
+        filas = self.filas
+        es_bytes = isinstance(unidades, bytes)
+        salto, retorno = (b'\n', b'\r') if es_bytes else ('\n', '\r')
+        # Un \r al final del bloque anterior solo es parte del fin de línea si
+        # este bloque empieza con \n; si no, es un caracter más de la línea
+        if self._retorno_pendiente:
+            self._retorno_pendiente = False
+            if not unidades.startswith(salto):
+                self.estado = self._recorrer(self.estado, retorno)
+        posicion = 0
+        while posicion < len(unidades):
+            fin = unidades.find(salto, posicion)
+            tramo = unidades[posicion:] if fin < 0 else unidades[posicion:fin]
+            # Fin de línea \r\n: el \r no se valida
+            if tramo.endswith(retorno):
+                tramo = tramo[:-1]
+                if fin < 0:
+                    self._retorno_pendiente = True
+                    self._linea_con_datos = True
+            if tramo:
+                self._linea_con_datos = True
+                if es_bytes:
+                    # Caso común, sin la llamada a _recorrer por línea
+                    estado = self.estado
+                    for byte in tramo:
+                        estado = filas[estado][byte]
+                    self.estado = estado
+                else:
+                    self.estado = self._recorrer(self.estado, tramo)
+            if fin < 0:
+                return
+            self._cerrar_linea()
+            posicion = fin + 1
+    
+    def _cerrar_linea(self):
+        self.lineas += 1
+        if self.finales[self.estado]:
+            self.lineas_validas += 1
+        elif len(self.lineas_invalidas) < self.max_invalidas:
+            self.lineas_invalidas.append(self.lineas)
+        self.estado = self.afd.estado_inicial
+        self._linea_con_datos = False
+    
+    def terminar(self):
+        """Cierra el flujo y devuelve el ResultadoReconocimiento"""
+        # Un caracter UTF-8 incompleto al final lanza UnicodeDecodeError
+        self.decodificador.decode(b'', final=True)
+        if self._retorno_pendiente:
+            # La última línea termina en \r sin \n: el \r es parte de ella
+            self._retorno_pendiente = False
+            self.estado = self._recorrer(self.estado, '\r')
+        if self.por_lineas and self._linea_con_datos:
+            self._cerrar_linea()
+        segundos = time.perf_counter() - self._inicio
+        if self.por_lineas:
+            acepta = self.lineas_validas == self.lineas
+        else:
+            acepta = self.finales[self.estado] == 1
+        return ResultadoReconocimiento(acepta, self.bytes_procesados, segundos,
+                                       self.lineas, self.lineas_validas, self.lineas_invalidas)
+    
+    def reconocer_bytes(self, datos, tam_bloque=TAMANO_BLOQUE):
+        """Reconoce un objeto bytes (o memoryview/mmap) por bloques"""
+        self.reiniciar()
+        for inicio in range(0, len(datos), tam_bloque):
+            self.alimentar(bytes(datos[inicio:inicio + tam_bloque]))
+        return self.terminar()
+    
+    def reconocer_archivo(self, archivo, tam_bloque=TAMANO_BLOQUE):
+        """Reconoce un archivo abierto en modo binario o una ruta"""
+        if isinstance(archivo, (str, os.PathLike)):
+            with open(archivo, 'rb') as abierto:
+                return self.reconocer_archivo(abierto, tam_bloque)
+        self.reiniciar()
+        while True:
+            bloque = archivo.read(tam_bloque)
+            if not bloque:
+                break
+            self.alimentar(bloque)
+        return self.terminar()
+    
+    def reconocer_mmap(self, ruta, tam_bloque=TAMANO_BLOQUE):
+        """Reconoce un archivo mapeado en memoria; el sistema carga solo las páginas que se leen"""
+        with open(ruta, 'rb') as archivo:
+            if os.fstat(archivo.fileno()).st_size == 0:
+                return self.reconocer_bytes(b'')
+            with mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+                return self.reconocer_bytes(mapa, tam_bloque)
+
+def main():
+    patron = "[ae03]+@[ae03]+.(com|net|org)(.(gt|cr|co))?"
+    print(f"=== Validación por líneas con la expresión h: {patron} ===")
+    reconocedor = ReconocedorFlujo(compilar(patron), por_lineas=True)
+    
+    generador = random.Random(0)
+    with tempfile.NamedTemporaryFile('wb', suffix='.log', delete=False) as archivo:
+        ruta = archivo.name
+        for i in range(200000):
+            usuario = "".join(generador.choice("ae03") for _ in range(generador.randint(1, 12)))
+            dominio = "".join(generador.choice("ae03") for _ in range(generador.randint(1, 8)))
+            pais = generador.choice(["", ".gt", ".cr", ".co"])
+            tld = "com" if i % 50 else "xyz"
+            archivo.write(f"{usuario}@{dominio}.{tld}{pais}\n".encode())
+    
+    try:
+        print("\n--- Archivo leído por bloques ---")
+        reconocedor.reconocer_archivo(ruta).mostrar()
+        print("\n--- Archivo mapeado con mmap ---")
+        reconocedor.reconocer_mmap(ruta).mostrar()
+    finally:
+        os.remove(ruta)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+from benchmarks import ARCHIVOS_EXPRESIONES, leer_expresiones, medir, medir_memoria
+from busqueda import Buscador
+from compilador import construir_afn, parsear
+from main import ConstructorThompson, ConversorAFD
+from minimizacion import minimizar
+from sin_epsilon import contar_aristas
+
+# Familias de patrones parametrizados (nombre -> (función n -> patrón, valores de n))
+FAMILIAS = {
+    'a_b_n': (lambda n: "(a|b)*a" + "(a|b)" * n, (4, 8, 12)),
+    'estrellas_anidadas': (lambda n: "(" * n + "a|b" + ")*" * n + "c", (5, 20, 80)),
+    'literal_largo': (lambda n: ("abcdefghij" * n)[:n], (100, 1000, 5000)),
+    'clase_ancha': (lambda n: f"[a-zA-Z0-9á-ú]{{1,{n}}}@[{chr(0x4e00)}-{chr(0x9fff)}]+", (4, 16, 64)),
+}
+
+# Informe por defecto (generado; no se versiona)
+RUTA_INFORME = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rendimiento.json")
+
+FASES = ('parser', 'thompson', 'convertir', 'minimizar', 'acepta', 'busqueda')
+
+def casos_expresiones(archivos=ARCHIVOS_EXPRESIONES):
+    """Casos (nombre, familia, n, patrón) de los archivos expresiones.txt; la familia es el archivo"""
+    casos = []
+    for archivo in archivos:
+        familia = os.path.normpath(archivo).replace(os.sep, '/')
+        casos += [(f"{familia}:{i}", familia, None, patron)
+                  for i, patron in enumerate(leer_expresiones((archivo,)), 1)]
+    return casos
+
+def casos_familias(familias=FAMILIAS):
+    return [(f"{nombre}:{n}", nombre, n, generar(n))
+            for nombre, (generar, valores) in familias.items() for n in valores]
+
+def contar_transiciones(afd):
+    return sum(len(por_simbolo) for por_simbolo in afd.transiciones)
+
+def entradas(afd, cantidad, largo_maximo, semilla=0):
+    """Cadenas aleatorias con un caracter por intervalo del alfabeto del AFD (y uno fuera de él)"""
+    caracteres = [desde for desde, _, _ in afd.intervalos()] + ["~"]
+    generador = random.Random(semilla)
+    return ["".join(generador.choice(caracteres) for _ in range(generador.randint(0, largo_maximo)))
+            for _ in range(cantidad)]
+
+def medir_caso(patron, repeticiones=3, cadenas=300, largo_maximo=60):
+    """
+    Tiempos (mejor de varias ejecuciones) y pico de memoria (una ejecución con
+    tracemalloc) de cada fase por separado, con el tamaño de cada autómata.
+    """
+    resultados = {}
+    
+    def fase(nombre, funcion):
+        segundos = medir(funcion, repeticiones)
+        resultado, _, pico = medir_memoria(funcion)
+        resultados[nombre] = {'segundos': segundos, 'pico_kb': round(pico, 1)}
+        return resultado
+    
+    def convertir():
+        conversor = ConversorAFD(afn, bitsets=True, clases=True, internar=True)
+        conversor.convertir()
+        return conversor
+    
+    ast = fase('parser', lambda: parsear(patron))
+    afn = fase('thompson', lambda: construir_afn(ast, ConstructorThompson(incremental=True)))
+    # convertir() suelta el AFN al terminar, así que sus aristas se cuentan antes
+    tamanos = {'afn': {'estados': len(afn.estados), 'aristas': contar_aristas(afn)}}
+    afd = fase('convertir', convertir).a_afd()
+    minimo = fase('minimizar', lambda: minimizar(afd))
+    tamanos['afd'] = {'estados': afd.num_estados, 'aristas': contar_transiciones(afd)}
+    tamanos['minimo'] = {'estados': minimo.num_estados, 'aristas': contar_transiciones(minimo)}
+    
+    cadenas = entradas(minimo, cadenas, largo_maximo)
+    aceptadas = fase('acepta', lambda: sum(map(minimo.acepta, cadenas)))
+    texto = " ".join(cadenas)
+    buscador = Buscador(ast)
+    coincidencias = fase('busqueda', lambda: sum(1 for _ in buscador.buscar_todas(texto)))
+    tamanos['entradas'] = {'cadenas': len(cadenas), 'aceptadas': aceptadas,
+                           'caracteres': len(texto), 'coincidencias': coincidencias}
+    return resultados, tamanos
+
+def ejecutar(casos=None, repeticiones=3):
+    """Corre todos los casos y devuelve el informe (un dict serializable a JSON)"""
+    if casos is None:
+        casos = casos_expresiones() + casos_familias()
+    informe = {
+        'version': 1,
+        'fecha': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'repeticiones': repeticiones,
+        'casos': [],
+    }
+    for nombre, familia, n, patron in casos:
+        caso = {'nombre': nombre, 'familia': familia, 'n': n, 'patron': patron}
+        try:
+            caso['fases'], caso['tamanos'] = medir_caso(patron, repeticiones)
+        except (ValueError, RecursionError) as error:
+            caso['error'] = str(error)
+        informe['casos'].append(caso)
+        print(f"{nombre:<36}" + (f"error: {caso['error']}" if 'error' in caso else
+                                 "  ".join(f"{fase} {caso['fases'][fase]['segundos']:.4f}" for fase in FASES)))
+    return informe
+
+def guardar(informe, ruta):
+    with open(ruta, 'w', encoding='utf-8') as salida:
+        json.dump(informe, salida, ensure_ascii=False, indent=2)
+
+def cargar(ruta):
+    with open(ruta, 'r', encoding='utf-8') as entrada:
+        return json.load(entrada)
+
+def comparar(anterior, actual, tolerancia=0.25, minimo_segundos=0.001):
+    """
+    Compara dos informes caso por caso. Es regresión una fase que tarda más de
+    (1 + tolerancia) veces lo de antes (si tarda al menos minimo_segundos, para
+    no contar el ruido de las fases muy cortas) o un autómata que cambió de
+    tamaño. Devuelve la lista de regresiones como textos.
+    """
+    previos = {caso['nombre']: caso for caso in anterior['casos']}
+    regresiones = []
+    for caso in actual['casos']:
+        previo = previos.get(caso['nombre'])
+        if previo is None or 'error' in caso or 'error' in previo:
+            continue
+        for fase, medida in caso['fases'].items():
+            antes = previo['fases'].get(fase)
+            if antes is None:
+                continue
+            proporcion = medida['segundos'] / antes['segundos'] if antes['segundos'] else float('inf')
+            if medida['segundos'] >= minimo_segundos and proporcion > 1 + tolerancia:
+                regresiones.append(f"{caso['nombre']} {fase}: {antes['segundos']:.4f} s -> "
+                                   f"{medida['segundos']:.4f} s (x{proporcion:.2f})")
+        for automata in ('afn', 'afd', 'minimo'):
+            if caso['tamanos'][automata] != previo['tamanos'].get(automata):
+                regresiones.append(f"{caso['nombre']} {automata}: {previo['tamanos'].get(automata)} -> "
+                                   f"{caso['tamanos'][automata]}")
+    return regresiones
+
+def main():
+    """
+    Uso: python rendimiento.py [salida.json] [anterior.json] [tolerancia]. Sin
+    salida, el informe se guarda como rendimiento.json junto a este script
+    """
+    ruta = sys.argv[1] if len(sys.argv) > 1 else RUTA_INFORME
+    informe = ejecutar()
+    guardar(informe, ruta)
+    print(f"Resultados guardados en {ruta}")
+    if len(sys.argv) > 2:
+        tolerancia = float(sys.argv[3]) if len(sys.argv) > 3 else 0.25
+        regresiones = comparar(cargar(sys.argv[2]), informe, tolerancia)
+        for regresion in regresiones:
+            print(f"REGRESIÓN {regresion}")
+        print(f"Regresiones respecto de {sys.argv[2]}: {len(regresiones)}")
+        sys.exit(1 if regresiones else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+from array import array
+
+from bisect import bisect_right
+
+from compilador import afd_de, compilar
+from main import AFD, ParticionAlfabeto
+
+# Formato binario de un AFD (little-endian, todo alineado a 4 bytes):
+#   cabecera:    magia b'AFD\x02', num_estados, num_columnas, num_intervalos,
+#                estado_inicial (uint32)
+#   intervalos:  num_intervalos ternas (desde, hasta, columna) de uint32 con los
+#                rangos de códigos Unicode de cada columna, ordenadas por desde
+#   tabla:       num_estados * num_columnas destinos (int32, -1 = sin transición),
+#                fila por estado y columna por símbolo (caracter o clase)
+#   aceptación:  mapa de bits de num_estados bits (bit e del byte e // 8)
+MAGIA = b'AFD\x02'
+CABECERA = struct.Struct('<4sIIII')
+
+def _en_little_endian(arreglo):
+    if sys.byteorder == 'big':
+        arreglo.byteswap()
+    return arreglo
+
+def serializar_afd(afd):
+    """Devuelve los bytes del AFD (acepta un AFD o un PatronCompilado)"""
+    afd = afd_de(afd)
+    simbolos = list(afd.alfabeto)
+    columna = {simbolo: k for k, simbolo in enumerate(simbolos)}
+    ancho = len(simbolos)
+    intervalos = array('I')
+    for desde, hasta, simbolo in afd.intervalos():
+        intervalos.extend((ord(desde), ord(hasta), columna[simbolo]))
+    
+    tabla = array('i', [-1]) * (afd.num_estados * ancho)
+    for estado, por_simbolo in enumerate(afd.transiciones):
+        fila = estado * ancho
+        for simbolo, destino in por_simbolo.items():
+            tabla[fila + columna[simbolo]] = destino
+    aceptacion = bytearray((afd.num_estados + 7) // 8)
+    for estado in afd.estados_finales:
+        aceptacion[estado >> 3] |= 1 << (estado & 7)
+    
+    return b''.join([
+        CABECERA.pack(MAGIA, afd.num_estados, ancho, len(intervalos) // 3, afd.estado_inicial),
+        _en_little_endian(intervalos).tobytes(),
+        _en_little_endian(tabla).tobytes(),
+        bytes(aceptacion),
+    ])
+
+def guardar_afd(afd, ruta):
+    with open(ruta, 'wb') as archivo:
+        archivo.write(serializar_afd(afd))
+
+class AFDMapeado:
+    """
+    AFD cargado desde el formato binario sin reconstruir objetos por estado: la
+    tabla y el mapa de aceptación son vistas (memoryview) sobre el buffer, que
+    puede ser un archivo mapeado con mmap. Solo los intervalos se pasan a listas;
+    la columna de cada caracter se busca con bisect y se guarda en un dict.
+    """
+    def __init__(self, buffer):
+        if sys.byteorder == 'big':
+            raise ValueError("AFDMapeado solo lee el formato en máquinas little-endian")
+        # Se valida antes de tomar vistas: si algo falla no queda ninguna
+        # exportada y el mmap se puede cerrar
+        if len(buffer) < CABECERA.size:
+            raise ValueError("Archivo de AFD truncado")
+        magia, self.num_estados, ancho, num_intervalos, self.estado_inicial = CABECERA.unpack_from(buffer)
+        if magia != MAGIA:
+            raise ValueError("No es un AFD serializado (magia incorrecta)")
+        inicio_tabla = CABECERA.size + 12 * num_intervalos
+        inicio_aceptacion = inicio_tabla + 4 * self.num_estados * ancho
+        if len(buffer) < inicio_aceptacion + (self.num_estados + 7) // 8:
+            raise ValueError("Archivo de AFD truncado")
+        
+        self._vista = memoryview(buffer)
+        ternas = self._vista[CABECERA.size:inicio_tabla].cast('I')
+        self.inicios = list(ternas[0::3])
+        self.fines = list(ternas[1::3])
+        self.columnas = list(ternas[2::3])
+        ternas.release()
+        self._columna_de = {}
+        self.ancho = ancho
+        self.tabla = self._vista[inicio_tabla:inicio_aceptacion].cast('i')
+        self.aceptacion = self._vista[inicio_aceptacion:inicio_aceptacion + (self.num_estados + 7) // 8]
+        self._mapa = None
+        self._archivo = None
+    
+    @classmethod
+    def abrir(cls, ruta):
+        """Mapea el archivo en memoria; el sistema lee solo las páginas que se usan"""
+        archivo = open(ruta, 'rb')
+        try:
+            mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            archivo.close()
+            raise ValueError("Archivo de AFD vacío")
+        try:
+            cargado = cls(mapa)
+        except Exception:
+            mapa.close()
+            archivo.close()
+            raise
+        cargado._mapa = mapa
+        cargado._archivo = archivo
+        return cargado
+    
+    def columna(self, c):
+        """Columna de la tabla para el caracter c, o -1 si no tiene transiciones"""
+        k = self._columna_de.get(c)
+        if k is None:
+            codigo = ord(c)
+            i = bisect_right(self.inicios, codigo) - 1
+            k = self.columnas[i] if i >= 0 and codigo <= self.fines[i] else -1
+            self._columna_de[c] = k
+        return k
+    
+    def siguiente(self, estado, simbolo):
+        """Devuelve el destino de la transición con el caracter o -1 si no existe"""
+        k = self.columna(simbolo)
+        if k < 0:
+            return -1
+        return self.tabla[estado * self.ancho + k]
+    
+    def es_final(self, estado):
+        return (self.aceptacion[estado >> 3] >> (estado & 7)) & 1 == 1
+    
+    def acepta(self, cadena):
+        tabla = self.tabla
+        columna_de = self._columna_de
+        ancho = self.ancho
+        estado = self.estado_inicial
+        for c in cadena:
+            k = columna_de.get(c)
+            if k is None:
+                k = self.columna(c)
+            if k < 0:
+                return False
+            estado = tabla[estado * ancho + k]
+            if estado < 0:
+                return False
+        return self.es_final(estado)
+    
+    def a_afd(self):
+        """Materializa un AFD normal cuyos símbolos son las columnas (con su partición)"""
+        transiciones = []
+        for estado in range(self.num_estados):
+            fila = self.tabla[estado * self.ancho:(estado + 1) * self.ancho]
+            transiciones.append({k: d for k, d in enumerate(fila) if d >= 0})
+        finales = {e for e in range(self.num_estados) if self.es_final(e)}
+        intervalos = [(chr(desde), chr(hasta), k) for desde, hasta, k in zip(self.inicios, self.fines, self.columnas)]
+        return AFD(list(range(self.ancho)), transiciones, self.estado_inicial, finales,
+                   ParticionAlfabeto.desde_intervalos(intervalos))
+    
+    def cerrar(self):
+        # Las vistas deben liberarse antes de cerrar el mmap
+        self.tabla.release()
+        self.aceptacion.release()
+        self._vista.release()
+        if self._mapa is not None:
+            self._mapa.close()
+            self._archivo.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.cerrar()
+
+def cargar_afd(ruta):
+    return AFDMapeado.abrir(ruta)
+
+def main():
+    patron = "[ae03]+@[ae03]+.(com|net|org)(.(gt|cr|co))?"
+    print(f"=== AFD serializado de la expresión h: {patron} ===")
+    compilado = compilar(patron)
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, "h.afd")
+        guardar_afd(compilado, ruta)
+        print(f"Archivo: {os.path.getsize(ruta)} bytes para {compilado.afd.num_estados} estados")
+        inicio = time.perf_counter()
+        with cargar_afd(ruta) as cargado:
+            carga = time.perf_counter() - inicio
+            print(f"Carga con mmap: {carga * 1000:.3f} ms")
+            for cadena in ["a0@e3.com", "ae@03.org.gt", "a@b.com"]:
+                print(f"  {cadena!r}: {'acepta' if cargado.acepta(cadena) else 'rechaza'}")
+
+if __name__ == "__main__":
+    main()
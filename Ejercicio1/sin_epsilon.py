@@ -0,0 +1,142 @@
+from collections import deque
+
+from compilador import construir_afn, parsear
+from main import AFN, ConstructorThompson, ConversorAFD, Estado
+
+def contar_aristas(afn):
+    """Número de transiciones del AFN (las epsilon incluidas)"""
+    return sum(len(destinos) for estado in afn.estados for destinos in estado.transiciones.values())
+
+class EliminadorEpsilon:
+    """
+    Quita las transiciones epsilon de un AFN de Thompson. Cada estado recibe las
+    transiciones con símbolo de su epsilon clausura y es final si la clausura
+    tiene un final; luego solo quedan los estados alcanzables (el inicial y los
+    destinos de transiciones con símbolo) y se unen los estados equivalentes
+    (bisimilares: ambos finales o ambos no, y con transiciones hacia los mismos
+    bloques). El resultado es un AFN con varios estados finales (marcados con
+    es_final, estado_final = None) que acepta el mismo lenguaje.
+    """
+    def __init__(self, afn):
+        self.afn = afn
+        self.estados_antes = len(afn.estados)
+        self.aristas_antes = contar_aristas(afn)
+        self.estados_despues = None
+        self.aristas_despues = None
+    
+    def _es_final(self, estado):
+        return estado.es_final or estado == self.afn.estado_final
+    
+    def _clausura(self, estado, cierres):
+        """Epsilon clausura de un estado (se guarda para no recalcularla)"""
+        if estado not in cierres:
+            clausura = {estado}
+            pila = [estado]
+            while pila:
+                actual = pila.pop()
+                for siguiente in actual.transiciones.get('ε', ()):
+                    if siguiente not in clausura:
+                        clausura.add(siguiente)
+                        pila.append(siguiente)
+            cierres[estado] = clausura
+        return cierres[estado]
+    
+    def _sin_epsilon(self):
+        """
+        Devuelve (estados alcanzables en orden BFS, finales, transiciones por
+        estado como dict símbolo -> conjunto de índices)
+        """
+        cierres = {}
+        indice = {self.afn.estado_inicial: 0}
+        orden = [self.afn.estado_inicial]
+        cola = deque(orden)
+        transiciones = []
+        finales = []
+        while cola:
+            estado = cola.popleft()
+            por_simbolo = {}
+            final = False
+            for alcanzado in self._clausura(estado, cierres):
+                final = final or self._es_final(alcanzado)
+                for simbolo, destinos in alcanzado.transiciones.items():
+                    if simbolo == 'ε':
+                        continue
+                    for destino in destinos:
+                        if destino not in indice:
+                            indice[destino] = len(orden)
+                            orden.append(destino)
+                            cola.append(destino)
+                        por_simbolo.setdefault(simbolo, set()).add(indice[destino])
+            transiciones.append(por_simbolo)
+            finales.append(final)
+        return orden, finales, transiciones
+    
+    def _bloques(self, finales, transiciones):
+        """Refina por firma (bloque, transiciones a bloques) hasta que no cambia"""
+        bloque_de = [1 if final else 0 for final in finales]
+        num_bloques = len(set(bloque_de))
+        while True:
+            firmas = {}
+            nuevos = []
+            for estado, por_simbolo in enumerate(transiciones):
+                firma = (bloque_de[estado], frozenset(
+                    (simbolo, frozenset(bloque_de[destino] for destino in destinos))
+                    for simbolo, destinos in por_simbolo.items()))
+                nuevos.append(firmas.setdefault(firma, len(firmas)))
+            bloque_de = nuevos
+            if len(firmas) == num_bloques:
+                return bloque_de
+            num_bloques = len(firmas)
+    
+    def eliminar(self):
+        """Devuelve el AFN sin transiciones epsilon, con estados alcanzables y sin equivalentes"""
+        orden, finales, transiciones = self._sin_epsilon()
+        bloque_de = self._bloques(finales, transiciones)
+        
+        # Un estado nuevo por bloque, numerados según su primer estado en orden BFS
+        nuevos = {}
+        for estado in range(len(orden)):
+            if bloque_de[estado] not in nuevos:
+                nuevos[bloque_de[estado]] = Estado(len(nuevos))
+        alfabeto = set()
+        hechos = set()
+        for estado, por_simbolo in enumerate(transiciones):
+            bloque = bloque_de[estado]
+            if bloque in hechos:
+                continue
+            hechos.add(bloque)
+            nuevo = nuevos[bloque]
+            nuevo.es_final = finales[estado]
+            for simbolo, destinos in por_simbolo.items():
+                alfabeto.add(simbolo)
+                for destino in sorted({bloque_de[destino] for destino in destinos}):
+                    nuevo.agregar_transicion(simbolo, nuevos[destino])
+        
+        resultado = AFN(nuevos[bloque_de[0]], None, estados=set(nuevos.values()), alfabeto=alfabeto)
+        self.estados_despues = len(resultado.estados)
+        self.aristas_despues = contar_aristas(resultado)
+        return resultado
+    
+    def mostrar_resumen(self):
+        print(f"Estados antes: {self.estados_antes}  Transiciones antes: {self.aristas_antes}")
+        print(f"Estados después: {self.estados_despues}  Transiciones después: {self.aristas_despues}")
+
+def eliminar_epsilon(afn):
+    """Atajo: devuelve el AFN equivalente sin transiciones epsilon"""
+    return EliminadorEpsilon(afn).eliminar()
+
+def main():
+    print("=== ELIMINACIÓN DE TRANSICIONES EPSILON ===")
+    for expresion in ["(a|t)c", "(a|b)*abb(a|b)*", "0?(1?)?0*", "[ae03]+@[ae03]+.(com|net|org)(.(gt|cr|co))?"]:
+        print(f"\n=== {expresion} ===")
+        eliminador = EliminadorEpsilon(construir_afn(parsear(expresion), ConstructorThompson()))
+        afn = eliminador.eliminar()
+        eliminador.mostrar_resumen()
+        conversor = ConversorAFD(afn)
+        conversor.convertir()
+        print(f"Estados del AFD por subconjuntos: {len(conversor.estados_afd)}")
+        if expresion == "(a|t)c":
+            afn.mostrar()
+
+if __name__ == "__main__":
+    main()
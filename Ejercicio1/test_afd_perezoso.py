@@ -0,0 +1,42 @@
+import random
+import re
+
+from afd_perezoso import AFDPerezoso
+from benchmarks import construir_a_b_n
+from compilador import construir_afn, parsear
+from main import ConstructorThompson
+
+def perezoso(patron, **opciones):
+    return AFDPerezoso(construir_afn(parsear(patron), ConstructorThompson(incremental=True)), **opciones)
+
+def test_aciertos_y_fallos():
+    automata = perezoso("(a|b)*abb")
+    assert automata.acepta("abb")
+    # inicial -a-> X -b-> Y -b-> Z: tres transiciones nuevas
+    assert (automata.aciertos, automata.fallos) == (0, 3)
+    assert automata.acepta("abb")
+    assert (automata.aciertos, automata.fallos) == (3, 3)
+    assert not automata.acepta("abc")
+    assert automata.estadisticas()["estados_en_cache"] == 4
+
+def test_filas_por_clase_y_no_por_caracter():
+    automata = perezoso("[a-z]+[0-9]")
+    cadena = "".join(chr(c) for c in range(ord('a'), ord('z') + 1)) + "7"
+    assert automata.acepta(cadena)
+    assert all(len(fila) <= automata.particion.num_clases for fila in automata.cache.values())
+    assert max(len(fila) for fila in automata.cache.values()) == 2
+    # Un caracter sin transiciones no agrega entradas
+    assert not automata.acepta("ab#")
+    assert not perezoso("(a|b)*abb").acepta("abx")
+
+def test_desalojos_y_respaldo_afn():
+    n = 12
+    automata = AFDPerezoso(construir_a_b_n(ConstructorThompson(incremental=True), n), max_estados=16, ventana=32)
+    generador = random.Random(0)
+    cadenas = ["".join(generador.choice("ab") for _ in range(200)) for _ in range(20)]
+    patron = f"(a|b)*a(a|b){{{n}}}"
+    for cadena in cadenas:
+        assert automata.acepta(cadena) == bool(re.fullmatch(patron, cadena))
+    assert automata.estadisticas()["estados_en_cache"] <= 16
+    assert automata.desalojos > 0
+    assert automata.respaldos_afn > 0
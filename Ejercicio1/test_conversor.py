@@ -0,0 +1,24 @@
+import re
+
+import pytest
+
+from compilador import construir_afn, parsear
+from main import ConstructorThompson, ConversorAFD
+
+@pytest.mark.parametrize('clases', [None, False, True])
+def test_rangos_fuerzan_la_particion(clases):
+    # [a-c] se etiqueta con un Rango y x con un caracter suelto
+    patron = "[a-c]+x"
+    afn = construir_afn(parsear(patron), ConstructorThompson(incremental=True))
+    conversor = ConversorAFD(afn, clases=clases)
+    assert conversor.particion is not None
+    conversor.convertir()
+    afd = conversor.a_afd()
+    for cadena in ["ax", "cbax", "x", "dx", "abc", ""]:
+        assert afd.acepta(cadena) == bool(re.fullmatch(patron, cadena)), cadena
+
+def test_sin_rangos_no_hay_particion():
+    afn = construir_afn(parsear("(a|b)*abb"), ConstructorThompson(incremental=True))
+    conversor = ConversorAFD(afn, clases=False)
+    assert conversor.particion is None
+    assert conversor.simbolos_afd == ['a', 'b']
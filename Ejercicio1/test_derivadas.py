@@ -0,0 +1,30 @@
+import re
+
+from compilador import compilar, parsear
+from derivadas import ConversorDerivadas
+from minimizacion import equivalentes
+
+def test_mismo_lenguaje_que_thompson():
+    for patron in ["(a|t)c", "(a|b)*abb(a|b)*", "0?(1?)?0*", "[0-9]{3}-[0-9]{2,4}", "(a?){2,3}b", ""]:
+        assert equivalentes(compilar(patron, motor='derivadas').afd, compilar(patron).afd), patron
+
+def test_literal_largo():
+    # La cadena de concatenaciones del AST no debe reasociarse con recursión
+    patron = "ab" * 2000
+    compilado = compilar(patron, motor='derivadas')
+    assert compilado.afd.num_estados == len(patron) + 1
+    assert compilado.acepta(patron)
+    assert not compilado.acepta(patron + "a")
+    assert not compilado.acepta(patron[:-1])
+
+def test_anidamiento_profundo_y_texto():
+    conversor = ConversorDerivadas(parsear("(a?)" * 1500 + "b"))
+    assert conversor.acepta("ab")
+    assert not conversor.acepta("abc")
+    assert conversor.terminos.texto(conversor.inicial).endswith("b")
+
+def test_acepta_perezoso_como_re():
+    patron = "[ae03]+@[ae03]+.(com|net|org)(.(gt|cr|co))?"
+    conversor = ConversorDerivadas(parsear(patron))
+    for cadena in ["ae@03.com", "0a@e3.org.gt", "x@y.com", "a@a.net.", ""]:
+        assert conversor.acepta(cadena) == bool(re.fullmatch(patron, cadena)), cadena
@@ -0,0 +1,47 @@
+import pytest
+
+from compilador import compilar
+from main import ConstructorThompson, ConversorAFD, LimiteExcedido
+
+# (a|b)*a(a|b){16}: el AFD completo tiene 2^17 estados
+EXPLOSIVO = "(a|b)*a" + "(a|b)" * 16
+
+@pytest.mark.parametrize('motor', ['thompson', 'directo', 'derivadas'])
+@pytest.mark.parametrize('limites, limite', [
+    ({'max_estados': 256}, 'estados'),
+    ({'max_transiciones': 300}, 'transiciones'),
+    ({'max_segundos': 0.01}, 'segundos'),
+])
+def test_limite_pasa_a_afd_perezoso(motor, limites, limite):
+    compilado = compilar(EXPLOSIVO, motor=motor, **limites)
+    assert compilado.limite is not None and compilado.limite.limite == limite
+    assert compilado.afd is None
+    assert compilado.acepta("a" + "b" * 16)
+    assert not compilado.acepta("b" * 17)
+
+@pytest.mark.parametrize('motor', ['thompson', 'directo', 'derivadas'])
+def test_sin_pasar_el_limite_hay_afd(motor):
+    compilado = compilar("(a|b)*abb", motor=motor, max_estados=100)
+    assert compilado.limite is None
+    assert compilado.afd.num_estados == 4
+
+def test_conversor_lanza_limite_excedido():
+    from compilador import construir_afn, parsear
+    afn = construir_afn(parsear(EXPLOSIVO), ConstructorThompson(incremental=True))
+    with pytest.raises(LimiteExcedido) as error:
+        ConversorAFD(afn, internar=True, max_estados=10).convertir()
+    assert error.value.limite == 'estados' and error.value.maximo == 10
+
+def test_consumidores_del_afd_rechazan_el_patron_sin_afd():
+    from afd_denso import AFDDenso
+    from reconocedor import ReconocedorFlujo
+    from serializacion import serializar_afd
+    compilado = compilar(EXPLOSIVO, max_estados=256)
+    for consumidor in (ReconocedorFlujo, AFDDenso, serializar_afd):
+        with pytest.raises(ValueError, match="límite de estados"):
+            consumidor(compilado)
+    # Con AFD completo siguen aceptando el patrón compilado
+    compilado = compilar("(a|b)*abb")
+    assert ReconocedorFlujo(compilado).afd is compilado.afd
+    assert AFDDenso(compilado).acepta("babb")
+    assert serializar_afd(compilado) == serializar_afd(compilado.afd)
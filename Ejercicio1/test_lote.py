@@ -0,0 +1,13 @@
+from lote import compilar_lote
+
+def test_errores_quedan_en_su_resultado():
+    resultados = compilar_lote(["(a|b)*abb", "a)", "[0-9]+"], procesos=1)
+    assert [resultado.ok for resultado in resultados] == [True, False, True]
+    assert resultados[1].error.startswith("ValueError")
+    assert resultados[2].acepta("2024")
+
+def test_error_inesperado_no_detiene_el_lote():
+    # Un límite mal dado hace fallar la comparación dentro de compilar()
+    resultados = compilar_lote(["(a|b)*abb", "ab"], procesos=2, tam_lote=1, max_estados="10")
+    assert len(resultados) == 2
+    assert all(resultado.error.startswith("TypeError") for resultado in resultados)
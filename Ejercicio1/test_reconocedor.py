@@ -0,0 +1,34 @@
+import pytest
+
+from compilador import compilar
+from reconocedor import ReconocedorFlujo
+
+def test_caracteres_no_ascii_en_utf8():
+    reconocedor = ReconocedorFlujo(compilar("[á-ú]+x"))
+    assert reconocedor.reconocer_bytes("éx".encode()).acepta
+    assert not reconocedor.reconocer_bytes("ex".encode()).acepta
+    # Cada caracter queda partido entre bloques de un byte
+    assert reconocedor.reconocer_bytes("úéx".encode(), tam_bloque=1).acepta
+
+def test_caracteres_por_encima_de_latin1():
+    reconocedor = ReconocedorFlujo(compilar("[一-龥]+@[a-z]+"))
+    assert reconocedor.reconocer_bytes("中文@abc".encode()).acepta
+    assert not reconocedor.reconocer_bytes("中文@ABC".encode()).acepta
+    assert not reconocedor.reconocer_bytes("ー@abc".encode()).acepta
+
+def test_por_lineas_con_utf8():
+    reconocedor = ReconocedorFlujo(compilar("[一-龥]+|ñ+"), por_lineas=True)
+    resultado = reconocedor.reconocer_bytes("中文\nññ\nn\n".encode(), tam_bloque=2)
+    assert (resultado.lineas, resultado.lineas_validas, resultado.lineas_invalidas) == (3, 2, [3])
+
+def test_utf8_invalido_lanza_error():
+    reconocedor = ReconocedorFlujo(compilar("[á-ú]+"))
+    for datos in (b"\xff", "é".encode()[:1]):
+        with pytest.raises(UnicodeDecodeError):
+            reconocedor.reconocer_bytes(datos)
+
+@pytest.mark.parametrize('tam_bloque', [1, 3, 1 << 16])
+def test_por_lineas_con_crlf(tam_bloque):
+    reconocedor = ReconocedorFlujo(compilar("ab"), por_lineas=True)
+    resultado = reconocedor.reconocer_bytes(b"ab\r\nab\r\na\rb\nab", tam_bloque=tam_bloque)
+    assert (resultado.lineas, resultado.lineas_validas, resultado.lineas_invalidas) == (4, 3, [3])
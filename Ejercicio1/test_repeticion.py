@@ -0,0 +1,16 @@
+import re
+
+import pytest
+
+from compilador import compilar
+
+PATRONES = ["(a|b){1,2}c", "[ae03]{5,30}@[ae03]+.(com|net|org)", "(0|1){10,20}1?", "a{3}", "(ab){2,}"]
+CADENAS = ["ac", "abc", "abac", "c", "ae03a@e.com", "ae0@e.com", "a" * 31 + "@e.net",
+           "0" * 10, "1" * 21, "1" * 22, "aaa", "aaaa", "abab", "ababab", "ab", ""]
+
+@pytest.mark.parametrize('motor', ['thompson', 'directo', 'derivadas', 'glushkov', 'contadores'])
+@pytest.mark.parametrize('patron', PATRONES)
+def test_repeticion_como_re(motor, patron):
+    compilado = compilar(patron, motor=motor)
+    for cadena in CADENAS:
+        assert compilado.acepta(cadena) == bool(re.fullmatch(patron, cadena)), cadena
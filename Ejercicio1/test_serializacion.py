@@ -0,0 +1,37 @@
+import mmap
+
+import pytest
+
+import serializacion
+from compilador import compilar
+from serializacion import AFDMapeado, guardar_afd, serializar_afd
+
+# Magia incorrecta, cabecera incompleta y tabla cortada
+CORRUPCIONES = [lambda datos: b"XXXX" + datos[4:], lambda datos: datos[:6], lambda datos: datos[:-3]]
+
+@pytest.mark.parametrize('corromper', CORRUPCIONES, ids=['magia', 'cabecera', 'tabla'])
+def test_archivo_corrupto_se_cierra(tmp_path, monkeypatch, corromper):
+    ruta = tmp_path / "corrupto.afd"
+    ruta.write_bytes(corromper(serializar_afd(compilar("(a|b)*abb"))))
+    abiertos = []
+    
+    def registrar(funcion):
+        def envoltura(*args, **kwargs):
+            abiertos.append(funcion(*args, **kwargs))
+            return abiertos[-1]
+        return envoltura
+    
+    monkeypatch.setattr(serializacion, 'open', registrar(open), raising=False)
+    monkeypatch.setattr(serializacion.mmap, 'mmap', registrar(mmap.mmap))
+    with pytest.raises(ValueError):
+        AFDMapeado.abrir(ruta)
+    assert len(abiertos) == 2
+    assert all(objeto.closed for objeto in abiertos)
+
+def test_ida_y_vuelta(tmp_path):
+    compilado = compilar("[ae03]+@[ae03]+.(com|net|org)")
+    ruta = tmp_path / "h.afd"
+    guardar_afd(compilado, ruta)
+    with AFDMapeado.abrir(ruta) as cargado:
+        for cadena in ["ae@03.com", "a@e.org", "a@e.xyz", ""]:
+            assert cargado.acepta(cadena) == compilado.acepta(cadena), cadena
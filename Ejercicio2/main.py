@@ -1,43 +1,125 @@
-def balancear(expresion):
-    stack = []
-    pares = {')': '(', ']': '[', '}': '{'}
-    apertura = set(pares.values())
-    cierre = set(pares.keys())
-    balanceado = True
+import re
+import sys
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
 
-    print(f"Expresión: {expresion}")
-    for i, caracter in enumerate(expresion):
-        if caracter in apertura:
-            stack.append(caracter)
-            print(f"  Paso {i}: push '{caracter}' → {stack}")
-        elif caracter in cierre:
+PARES = {')': '(', ']': '[', '}': '{'}
+CIERRE_DE = {apertura: cierre for cierre, apertura in PARES.items()}
+# Solo interesan estos caracteres: el resto se salta de una vez con la regex
+CORCHETES = re.compile(r'[()\[\]{}]')
+TAMANO_BLOQUE = 1 << 16
+
+# balanceado: True/False. Si no lo está, posicion_error es el desplazamiento del
+# primer error (la longitud total si faltan cierres al final), esperado es el
+# cierre que correspondía (None si la pila estaba vacía) y encontrado el caracter
+# leído (None si se terminó la entrada)
+ResultadoBalanceo = namedtuple('ResultadoBalanceo', 'balanceado posicion_error esperado encontrado')
+
+def _bloques(fuente, tam_bloque):
+    if isinstance(fuente, str):
+        yield fuente
+    elif hasattr(fuente, 'read'):
+        while True:
+            bloque = fuente.read(tam_bloque)
+            if not bloque:
+                return
+            yield bloque
+    else:
+        yield from fuente
+
+# Recorre un texto, un archivo abierto (por bloques) o un iterable de trozos en
+# O(n) sin guardar la entrada, hasta el primer error. Con trazar=True imprime cada
+# push/pop como balancear y, al final, la pila que haya quedado
+def balancear_flujo(fuente, trazar=False, tam_bloque=TAMANO_BLOQUE):
+    stack = []
+    desplazamiento = 0
+    error = None
+    for bloque in _bloques(fuente, tam_bloque):
+        for encontrado in CORCHETES.finditer(bloque):
+            caracter = encontrado.group()
+            i = desplazamiento + encontrado.start()
+            if caracter in CIERRE_DE:
+                stack.append(caracter)
+                if trazar:
+                    print(f"  Paso {i}: push '{caracter}' → {stack}")
+                continue
             if not stack:
-                print(f"  Paso {i}: ERROR – se encontró '{caracter}' pero la pila está vacía ")
-                balanceado = False
+                if trazar:
+                    print(f"  Paso {i}: ERROR – se encontró '{caracter}' pero la pila está vacía ")
+                error = ResultadoBalanceo(False, i, None, caracter)
                 break
             tope = stack.pop()
-            print(f"  Paso {i}: pop '{tope}' porque se encontró '{caracter}' → {stack}")
-            if pares[caracter] != tope:
-                print(f"  Paso {i}: ERROR – se esperaba '{pares[caracter]}', pero se encontró '{tope}' ")
-                balanceado = False
+            if trazar:
+                print(f"  Paso {i}: pop '{tope}' porque se encontró '{caracter}' → {stack}")
+            if PARES[caracter] != tope:
+                if trazar:
+                    print(f"  Paso {i}: ERROR – se esperaba '{PARES[caracter]}', pero se encontró '{tope}' ")
+                error = ResultadoBalanceo(False, i, CIERRE_DE[tope], caracter)
                 break
-
-    if stack:
+        if error is not None:
+            break
+        desplazamiento += len(bloque)
+    
+    if stack and trazar:
         print(f"  Al final, la pila no está vacía: {stack} ")
-        balanceado = False
-    if balanceado:
+    if error is not None:
+        return error
+    if stack:
+        return ResultadoBalanceo(False, desplazamiento, CIERRE_DE[stack[-1]], None)
+    return ResultadoBalanceo(True, None, None, None)
+
+def balancear(expresion):
+    print(f"Expresión: {expresion}")
+    if balancear_flujo(expresion, trazar=True).balanceado:
         print("  Resultado:  La expresión está bien balanceada.")
     else:
         print("  Resultado:  La expresión NO está balanceada.")
     print("-" * 60)
 
+# Valida muchas líneas en paralelo con un pool de procesos; los resultados
+# vuelven en el mismo orden que las líneas
+def balancear_lineas(lineas, procesos=None, tam_lote=256):
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        return list(pool.map(balancear_flujo, lineas, chunksize=tam_lote))
+
+# Las líneas en blanco se saltan, como en main()
+def _balancear_linea(linea):
+    if not linea.strip():
+        return None
+    return balancear_flujo(linea.rstrip("\n"))
+
+# Modo silencioso para archivos grandes: solo informa las líneas con error, a
+# medida que llegan del pool (en orden, por lotes de tam_lote líneas), sin
+# guardar los resultados. Devuelve (líneas balanceadas, líneas no vacías)
+def validar_archivo(ruta, procesos=None, tam_lote=256):
+    validas = total = 0
+    with open(ruta, "r", encoding="utf-8") as archivo, ProcessPoolExecutor(max_workers=procesos) as pool:
+        for numero, resultado in enumerate(pool.map(_balancear_linea, archivo, chunksize=tam_lote), 1):
+            if resultado is None:
+                continue
+            total += 1
+            if resultado.balanceado:
+                validas += 1
+            else:
+                print(f"Línea {numero}: posición {resultado.posicion_error}, "
+                      f"se esperaba {resultado.esperado!r}, se encontró {resultado.encontrado!r}")
+    print(f"{validas} de {total} líneas balanceadas")
+    return validas, total
+
 # Leer expresiones desde archivo
-try:
-    with open("expresiones.txt", "r", encoding="utf-8") as archivo:
-        lineas = archivo.readlines()
-        for linea in lineas:
-            expresion = linea.strip()
-            if expresion:
-                balancear(expresion)
-except FileNotFoundError:
-    print("No se encontró el archivo 'expresiones.txt'. Asegúrate de que esté en la misma carpeta que este script.")
+def main():
+    try:
+        with open("expresiones.txt", "r", encoding="utf-8") as archivo:
+            lineas = archivo.readlines()
+            for linea in lineas:
+                expresion = linea.strip()
+                if expresion:
+                    balancear(expresion)
+    except FileNotFoundError:
+        print("No se encontró el archivo 'expresiones.txt'. Asegúrate de que esté en la misma carpeta que este script.")
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        validar_archivo(sys.argv[1])
+    else:
+        main()
@@ -1,4 +1,6 @@
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
 
 # Precedencia y asociatividad
 precedence = {
@@ -9,76 +11,200 @@ precedence = {
     '|': 1
 }
 
-right_associative = {'*', '+', '?'}
+# Repetición acotada {m}, {m,} o {m,n}: operador unario como '*'. Si las
+# llaves no tienen esa forma, '{' es un caracter más
+REPETICION = re.compile(r'\{(\d+)(,(\d*))?\}')
+
+# Devuelve la posición donde termina la repetición que empieza en i (0 si no hay)
+def fin_repeticion(exp, i):
+    if exp[i] != '{':
+        return 0
+    encontrada = REPETICION.match(exp, i)
+    return encontrada.end() if encontrada else 0
+
+# Precedencia de un operador (las repeticiones tienen la de '*'). Los unarios son
+# postfijos: si uno sigue a otro, el de la pila ya se aplicó y debe salir primero
+# (a{2}* es (a{2})*, no (a*){2}), así que todo operador desapila a los de
+# precedencia mayor o igual
+def precedencia(op):
+    return precedence['*'] if op[0] == '{' else precedence[op]
 
 # Inserta concatenaciones explícitas con '.'
+# (se arma una lista y se une al final para que el costo sea lineal)
+# Una repetición {m,n} se copia entera y se trata como '*'
 def insert_concatenation(exp):
-    output = ""
-    for i in range(len(exp)):
-        c1 = exp[i]
-        output += c1
-        if i + 1 < len(exp):
-            c2 = exp[i + 1]
+    output = []
+    i = 0
+    while i < len(exp):
+        fin = fin_repeticion(exp, i)
+        c1 = '*' if fin else exp[i]
+        fin = fin or i + 1
+        output.append(exp[i:fin])
+        if fin < len(exp):
+            c2 = '*' if fin_repeticion(exp, fin) else exp[fin]
             if (
                 (c1 not in '(|' and c2 not in '|)*+?)') or
                 (c1 in ')*+?' and c2 not in '|)*+?)')
             ):
-                output += '.'
-    return output
+                output.append('.')
+        i = fin
+    return ''.join(output)
 
 # Verifica si un carácter es un operador
 def is_operator(c):
     return c in precedence
 
-# Algoritmo de Shunting Yard para regex
-def shunting_yard(regex):
+# Algoritmo de Shunting Yard para regex. Los pasos solo se registran con
+# trazar=True; si no, se devuelve una lista vacía y no se formatea nada
+def shunting_yard(regex, trazar=False):
     output = []
     stack = []
     steps = []
     i = 0
     while i < len(regex):
         c = regex[i]
+        fin = fin_repeticion(regex, i)
+        if fin:  # repetición {m,n}: se toma como un solo operador
+            c = regex[i:fin]
+            i = fin - 1
         if c == '\\':  # caracter escapado
             i += 1
             if i < len(regex):
                 output.append('\\' + regex[i])
-                steps.append(f"Añadir carácter escapado: \\{regex[i]}")
+                if trazar:
+                    steps.append(f"Añadir carácter escapado: \\{regex[i]}")
         elif c == '(':
             stack.append(c)
-            steps.append("Apilar paréntesis abierto: (")
+            if trazar:
+                steps.append("Apilar paréntesis abierto: (")
         elif c == ')':
             while stack and stack[-1] != '(':
                 op = stack.pop()
                 output.append(op)
-                steps.append(f"Desapilar y añadir operador: {op}")
+                if trazar:
+                    steps.append(f"Desapilar y añadir operador: {op}")
             if stack and stack[-1] == '(':
                 stack.pop()
-                steps.append("Eliminar paréntesis abierto")
-        elif is_operator(c):
+                if trazar:
+                    steps.append("Eliminar paréntesis abierto")
+        elif is_operator(c) or fin:
             while (
                 stack and stack[-1] != '(' and
-                (
-                    (c not in right_associative and precedence[c] <= precedence[stack[-1]]) or
-                    (c in right_associative and precedence[c] < precedence[stack[-1]])
-                )
+                precedencia(c) <= precedencia(stack[-1])
             ):
                 op = stack.pop()
                 output.append(op)
-                steps.append(f"Desapilar y añadir operador: {op}")
+                if trazar:
+                    steps.append(f"Desapilar y añadir operador: {op}")
             stack.append(c)
-            steps.append(f"Apilar operador: {c}")
+            if trazar:
+                steps.append(f"Apilar operador: {c}")
         else:
             output.append(c)
-            steps.append(f"Añadir operando: {c}")
+            if trazar:
+                steps.append(f"Añadir operando: {c}")
         i += 1
 
     while stack:
         op = stack.pop()
         output.append(op)
-        steps.append(f"Desapilar y añadir al final: {op}")
+        if trazar:
+            steps.append(f"Desapilar y añadir al final: {op}")
 
     return ''.join(output), steps
 
+# Tokens sin datos variables: se crean una sola vez y se comparten
+TOKENS_FIJOS = {c: ('grupo', c) for c in '()'}
+TOKENS_FIJOS.update({c: ('operador', c) for c in '*+?|'})
+_literales = {}
+
+# Genera los tokens (tipo, valor) de la expresión para que clases [..] y
+# caracteres escapados sean un solo operando. Tipos: 'literal', 'escapado',
+# 'clase', 'operador', 'repeticion' ({m,n}) y 'grupo' (paréntesis). Aquí '.' es un literal: la
+# concatenación se agrega después como token ('operador', '.').
+# Es lineal: cada caracter se recorre una vez, incluso con muchos '[' sin cerrar
+# (las posiciones ya recorridas por una búsqueda fallida de ']' se recuerdan).
+def iter_tokens(exp):
+    n = len(exp)
+    sin_cierre = set()
+    i = 0
+    while i < n:
+        c = exp[i]
+        if c == '\\' and i + 1 < n:
+            yield ('escapado', exp[i + 1])
+            i += 2
+            continue
+        if c == '{':
+            fin = fin_repeticion(exp, i)
+            if fin:
+                yield ('repeticion', exp[i:fin])
+                i = fin
+                continue
+        if c == '[':
+            j = i + 1
+            while j < n and exp[j] != ']' and j not in sin_cierre:
+                j += 2 if exp[j] == '\\' else 1
+            if j < n and j not in sin_cierre:
+                yield ('clase', exp[i + 1:j])
+                i = j + 1
+                continue
+            sin_cierre.update(range(i + 1, min(j, n)))
+        token = TOKENS_FIJOS.get(c)
+        if token is None:
+            token = _literales.get(c)
+            if token is None:
+                token = _literales[c] = ('literal', c)
+        yield token
+        i += 1
+
+def tokenize(exp):
+    return list(iter_tokens(exp))
+
+# Igual que insert_concatenation pero sobre tokens; acepta cualquier iterable
+# (por ejemplo iter_tokens) y genera el resultado sin armar listas intermedias
+CONCATENACION = ('operador', '.')
+
+def insert_concatenation_tokens(tokens):
+    anterior = None
+    for token in tokens:
+        if (
+            anterior is not None and
+            anterior not in (('grupo', '('), ('operador', '|')) and
+            token != ('grupo', ')') and
+            not (token[0] == 'operador' and token[1] in '|*+?') and
+            token[0] != 'repeticion'
+        ):
+            yield CONCATENACION
+        yield token
+        anterior = token
+
+# Shunting Yard sobre tokens: devuelve la lista de tokens en postfix
+def shunting_yard_tokens(tokens):
+    output = []
+    stack = []
+    for token in tokens:
+        tipo, c = token
+        if token == ('grupo', '('):
+            stack.append(token)
+        elif token == ('grupo', ')'):
+            while stack and stack[-1] != ('grupo', '('):
+                output.append(stack.pop())
+            if stack:
+                stack.pop()
+        elif tipo in ('operador', 'repeticion'):
+            while (
+                stack and stack[-1] != ('grupo', '(') and
+                precedencia(c) <= precedencia(stack[-1][1])
+            ):
+                output.append(stack.pop())
+            stack.append(token)
+        else:
+            output.append(token)
+
+    while stack:
+        output.append(stack.pop())
+    return output
+
 # Procesar archivo
 def procesar_archivo(nombre_archivo):
     with open(nombre_archivo, 'r') as archivo:
@@ -88,13 +214,30 @@ def procesar_archivo(nombre_archivo):
             print(f"\nExpresión {idx}: {expresion}")
             expresion_mod = insert_concatenation(expresion)
             print(f"Expresión con concatenación explícita: {expresion_mod}")
-            postfix, pasos = shunting_yard(expresion_mod)
+            postfix, pasos = shunting_yard(expresion_mod, trazar=True)
             print("Postfix:", postfix)
             print("Pasos del algoritmo:")
             for paso in pasos:
                 print("  -", paso)
 
-# Ejecutar con ejemplo
+# Postfix de una expresión sin registrar pasos (trabajo de cada proceso del lote)
+def postfix_de(expresion):
+    return shunting_yard(insert_concatenation(expresion))[0]
+
+# Procesa un archivo con muchas expresiones en un pool de procesos; los
+# resultados se imprimen en el orden del archivo
+def procesar_lote(nombre_archivo, procesos=None):
+    with open(nombre_archivo, 'r') as archivo:
+        expresiones = [linea.strip() for linea in archivo]
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        postfijos = pool.map(postfix_de, expresiones, chunksize=256)
+        for idx, (expresion, postfix) in enumerate(zip(expresiones, postfijos), 1):
+            print(f"Expresión {idx}: {expresion}  Postfix: {postfix}")
+
+# Ejecutar con ejemplo (o en lote: python main.py archivo [procesos])
 if __name__ == "__main__":
-    archivo = "expresiones.txt"  
-    procesar_archivo(archivo)
+    if len(sys.argv) > 1:
+        procesar_lote(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else None)
+    else:
+        archivo = "expresiones.txt"  
+        procesar_archivo(archivo)